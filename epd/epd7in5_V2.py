@@ -28,7 +28,9 @@
 #
 
 
+import asyncio
 import logging
+import time
 import epdconfig
 
 # Display resolution
@@ -42,58 +44,165 @@ GRAY4  = 0x00 #Blackest
 
 logger = logging.getLogger(__name__)
 
+# Byte-wise NOT as a translate table: the panel RAM wants 1 = white, the
+# packed buffers use 1 = black.
+_INVERT = bytes(0xFF - value for value in range(256))
+# translate() always returns a new object, so frames are inverted in chunks
+# this size to keep the transient copies small.
+_INVERT_CHUNK = 4096
+
+class RefreshHandle:
+    """Tracks a refresh started by one of the EPD *_async methods.
+
+    The refresh command (0x12) has already been sent; poll done(), block in
+    wait(), or await the handle from asyncio code.
+    """
+    def __init__(self, epd, settle_ms=100):
+        self.epd = epd
+        self._ready_at = time.monotonic() + settle_ms / 1000.0
+        self._done = False
+
+    def done(self):
+        if self._done:
+            return True
+        if time.monotonic() < self._ready_at:
+            return False
+        self.epd.send_command(0x71)
+        if self.epd.epdconfig.digital_read(self.epd.busy_pin) == 0:
+            return False
+        self.epd.epdconfig.delay_ms(20)
+        logger.debug("e-Paper busy release")
+        self._done = True
+        return True
+
+    # poll_interval=None keeps the original tight ReadBusy() loop; a value in
+    # seconds sleeps between polls so other threads get the CPU.
+    def wait(self, poll_interval=None):
+        if self._done:
+            return
+        remaining = self._ready_at - time.monotonic()
+        if remaining > 0:
+            self.epd.epdconfig.delay_ms(remaining * 1000)
+        if poll_interval is None:
+            self.epd.ReadBusy()
+            self._done = True
+            return
+        while not self.done():
+            time.sleep(poll_interval)
+
+    async def wait_async(self, poll_interval=0.02):
+        while not self.done():
+            await asyncio.sleep(poll_interval)
+
+    def __await__(self):
+        return self.wait_async().__await__()
+
 class EPD:
-    def __init__(self):
-        self.reset_pin = epdconfig.RST_PIN
-        self.dc_pin = epdconfig.DC_PIN
-        self.busy_pin = epdconfig.BUSY_PIN
-        self.cs_pin = epdconfig.CS_PIN
+    # backend: an epdconfig implementation (see epdconfig.create()); defaults
+    # to the auto-detected module-level one so a single panel works unchanged.
+    def __init__(self, backend=None):
+        self.epdconfig = backend if backend is not None else epdconfig.implementation
+        self.reset_pin = self.epdconfig.RST_PIN
+        self.dc_pin = self.epdconfig.DC_PIN
+        self.busy_pin = self.epdconfig.BUSY_PIN
+        self.cs_pin = self.epdconfig.CS_PIN
         self.width = EPD_WIDTH
         self.height = EPD_HEIGHT
         self.GRAY1  = GRAY1 #white
         self.GRAY2  = GRAY2
         self.GRAY3  = GRAY3 #gray
         self.GRAY4  = GRAY4 #Blackest
+        # Preallocated once so steady-state refreshes build no full-screen lists.
+        self.frame_bytes = (self.width + 7) // 8 * self.height
+        self._tx = bytearray(self.frame_bytes)
+        self._fill_white = b'\xff' * self.frame_bytes
+        self._fill_black = bytes(self.frame_bytes)
+        self.invalidate()
+
+    # Controller state, tracked so repeated init*() calls and the per-frame
+    # partial-mode setup only send the commands a transition needs:
+    #   mode            "full", "fast", "part" or "4gray" once that init*() has
+    #                   run (the controller is reset and powered on); None when
+    #                   unknown, asleep or after a reset
+    #   vcom            data last sent with VCOM/data interval (0x50)
+    #   partial_window  window last set with 0x90 while in partial mode (0x91)
+    # Call invalidate() after anything that may have reset the controller
+    # behind the driver's back; the next init*() then runs in full.
+    def invalidate(self):
+        self.mode = None
+        self.vcom = None
+        self.partial_window = None
+
+    def _in_mode(self, mode, vcom):
+        return self.mode == mode and self.partial_window is None and self.vcom == vcom
     
     # Hardware reset
     def reset(self):
-        epdconfig.digital_write(self.reset_pin, 1)
-        epdconfig.delay_ms(20) 
-        epdconfig.digital_write(self.reset_pin, 0)
-        epdconfig.delay_ms(2)
-        epdconfig.digital_write(self.reset_pin, 1)
-        epdconfig.delay_ms(20)   
+        self.invalidate()
+        self.epdconfig.digital_write(self.reset_pin, 1)
+        self.epdconfig.delay_ms(20) 
+        self.epdconfig.digital_write(self.reset_pin, 0)
+        self.epdconfig.delay_ms(2)
+        self.epdconfig.digital_write(self.reset_pin, 1)
+        self.epdconfig.delay_ms(20)   
 
     def send_command(self, command):
-        epdconfig.digital_write(self.dc_pin, 0)
-        epdconfig.digital_write(self.cs_pin, 0)
-        epdconfig.spi_writebyte([command])
-        epdconfig.digital_write(self.cs_pin, 1)
+        self.epdconfig.digital_write(self.dc_pin, 0)
+        self.epdconfig.digital_write(self.cs_pin, 0)
+        self.epdconfig.spi_writebyte([command])
+        self.epdconfig.digital_write(self.cs_pin, 1)
 
     def send_data(self, data):
-        epdconfig.digital_write(self.dc_pin, 1)
-        epdconfig.digital_write(self.cs_pin, 0)
-        epdconfig.spi_writebyte([data])
-        epdconfig.digital_write(self.cs_pin, 1)
+        self.epdconfig.digital_write(self.dc_pin, 1)
+        self.epdconfig.digital_write(self.cs_pin, 0)
+        self.epdconfig.spi_writebyte([data])
+        self.epdconfig.digital_write(self.cs_pin, 1)
 
     def send_data2(self, data):
-        epdconfig.digital_write(self.dc_pin, 1)
-        epdconfig.digital_write(self.cs_pin, 0)
-        epdconfig.SPI.writebytes2(data)
-        epdconfig.digital_write(self.cs_pin, 1)
+        self.epdconfig.digital_write(self.dc_pin, 1)
+        self.epdconfig.digital_write(self.cs_pin, 0)
+        self.epdconfig.spi_writebyte2(data)
+        self.epdconfig.digital_write(self.cs_pin, 1)
+
+    # Send the first `count` bytes of `data` inverted, padded to a full frame
+    # with 0xFF, through the preallocated transmit buffer. The data is copied
+    # in through memoryviews and inverted in place chunk by chunk, so no
+    # full-frame temporary is created.
+    def _send_inverted(self, data, count=None):
+        tx = self._tx
+        if count is None:
+            count = len(tx)
+        if count > len(tx) or len(data) < count:
+            raise ValueError("Frame data is %d bytes, need %d of at most %d"
+                             % (len(data), count, len(tx)))
+        view = memoryview(tx)
+        try:
+            view[:count] = memoryview(data)[:count]
+        except TypeError:
+            # Sequences of ints (e.g. a list from older callers).
+            view[:count] = bytes(data[:count])
+        for start in range(0, count, _INVERT_CHUNK):
+            end = min(start + _INVERT_CHUNK, count)
+            view[start:end] = tx[start:end].translate(_INVERT)
+        if count < len(tx):
+            view[count:] = memoryview(self._fill_white)[count:]
+        view.release()
+        self.send_data2(tx)
 
     def ReadBusy(self):
         logger.debug("e-Paper busy")
         self.send_command(0x71)
-        busy = epdconfig.digital_read(self.busy_pin)
+        busy = self.epdconfig.digital_read(self.busy_pin)
         while(busy == 0):
             self.send_command(0x71)
-            busy = epdconfig.digital_read(self.busy_pin)
-        epdconfig.delay_ms(20)
+            busy = self.epdconfig.digital_read(self.busy_pin)
+        self.epdconfig.delay_ms(20)
         logger.debug("e-Paper busy release")
         
     def init(self):
-        if (epdconfig.module_init() != 0):
+        if self._in_mode("full", (0x10, 0x07)):
+            return 0
+        if (self.epdconfig.module_init() != 0):
             return -1
         # EPD hardware init start
         self.reset()
@@ -111,7 +220,7 @@ class EPD:
         self.send_data(0x17)		#VDL=-15V
 
         self.send_command(0x04) #POWER ON
-        epdconfig.delay_ms(100)
+        self.epdconfig.delay_ms(100)
         self.ReadBusy()
 
         self.send_command(0X00)			#PANNEL SETTING
@@ -140,10 +249,13 @@ class EPD:
         self.send_data(0x22)
 
         # EPD hardware init end
+        self.mode, self.vcom = "full", (0x10, 0x07)
         return 0
     
     def init_fast(self):
-        if (epdconfig.module_init() != 0):
+        if self._in_mode("fast", (0x10, 0x07)):
+            return 0
+        if (self.epdconfig.module_init() != 0):
             return -1
         # EPD hardware init start
         self.reset()
@@ -162,7 +274,7 @@ class EPD:
         # self.send_data(0x03)
 
         self.send_command(0x04) #POWER ON
-        epdconfig.delay_ms(100) 
+        self.epdconfig.delay_ms(100) 
         self.ReadBusy()        #waiting for the electronic paper IC to release the idle signal
 
         #Enhanced display drive(Add 0x06 command)
@@ -178,10 +290,14 @@ class EPD:
         self.send_data(0x5A)
 
         # EPD hardware init end
+        self.mode, self.vcom = "fast", (0x10, 0x07)
         return 0
     
     def init_part(self):
-        if (epdconfig.module_init() != 0):
+        # Partial mode and its window are (re)applied by display_Partial itself.
+        if self.mode == "part":
+            return 0
+        if (self.epdconfig.module_init() != 0):
             return -1
         # EPD hardware init start
         self.reset()
@@ -190,7 +306,7 @@ class EPD:
         self.send_data(0x1F)   #KW-3f   KWR-2F	BWROTP 0f	BWOTP 1f
 
         self.send_command(0x04) #POWER ON
-        epdconfig.delay_ms(100) 
+        self.epdconfig.delay_ms(100) 
         self.ReadBusy()        #waiting for the electronic paper IC to release the idle signal
 
         self.send_command(0xE0)
@@ -199,11 +315,14 @@ class EPD:
         self.send_data(0x6E)
 
         # EPD hardware init end
+        self.mode = "part"
         return 0
     
     # The feature will only be available on screens sold after 24/10/23
     def init_4Gray(self):
-        if (epdconfig.module_init() != 0):
+        if self._in_mode("4gray", (0x10, 0x07)):
+            return 0
+        if (self.epdconfig.module_init() != 0):
             return -1
         # EPD hardware init start
         self.reset()
@@ -216,7 +335,7 @@ class EPD:
         self.send_data(0x07)
 
         self.send_command(0x04) #POWER ON
-        epdconfig.delay_ms(100) 
+        self.epdconfig.delay_ms(100) 
         self.ReadBusy()        #waiting for the electronic paper IC to release the idle signal
 
         #Enhanced display drive(Add 0x06 command)
@@ -232,27 +351,38 @@ class EPD:
         self.send_data(0x5F)
 
         # EPD hardware init end
+        self.mode, self.vcom = "4gray", (0x10, 0x07)
         return 0
 
-    def getbuffer(self, image):
+    # out: optional bytearray of frame_bytes to pack into instead of allocating
+    # a new buffer; it is returned either way.
+    def getbuffer(self, image, out=None):
         img = image
         imwidth, imheight = img.size
         if(imwidth == self.width and imheight == self.height):
-            img = img.convert('1')
+            if img.mode != '1':
+                img = img.convert('1')
         elif(imwidth == self.height and imheight == self.width):
-            # image has correct dimensions, but needs to be rotated
-            img = img.rotate(90, expand=True).convert('1')
+            # image has correct dimensions, but needs to be rotated; this resamples
+            # the whole screen, so Panel keeps a native-orientation copy instead
+            img = img.rotate(90, expand=True)
+            if img.mode != '1':
+                img = img.convert('1')
         else:
             logger.warning("Wrong image dimensions: must be " + str(self.width) + "x" + str(self.height))
             # return a blank buffer
-            return [0x00] * (int(self.width/8) * self.height)
+            if out is None:
+                return bytearray(self.frame_bytes)
+            out[:] = self._fill_black
+            return out
 
-        buf = bytearray(img.tobytes('raw'))
         # The bytes need to be inverted, because in the PIL world 0=black and 1=white, but
-        # in the e-paper world 0=white and 1=black.
-        for i in range(len(buf)):
-            buf[i] ^= 0xFF
-        return buf
+        # in the e-paper world 0=white and 1=black; the "1;I" packer does that in C.
+        packed = img.tobytes('raw', '1;I')
+        if out is None:
+            return bytearray(packed)
+        out[:] = packed
+        return out
     
     def getbuffer_4Gray(self, image):
         # logger.debug("bufsiz = ",int(self.width/8) * self.height)
@@ -290,37 +420,37 @@ class EPD:
                         buf[int((newx + (newy * self.width))/4)] = ((pixels[x, y-3]&0xc0) | (pixels[x, y-2]&0xc0)>>2 | (pixels[x, y-1]&0xc0)>>4 | (pixels[x, y]&0xc0)>>6) 
         return buf
 
+    def _refresh_async(self):
+        self.send_command(0x12)
+        return RefreshHandle(self, getattr(self.epdconfig, "REFRESH_SETTLE_MS", 100))
+
     def display(self, image):
-        if(self.width % 8 == 0):
-            Width = self.width // 8
-        else:
-            Width = self.width // 8 +1
-        Height = self.height
-        image1 = [0xFF] * int(self.width * self.height / 8)
-        for j in range(Height):
-                for i in range(Width):
-                    image1[i + j * Width] = ~image[i + j * Width]
+        self.display_async(image).wait()
+
+    def display_async(self, image):
         self.send_command(0x10)
-        self.send_data2(image1)
+        self._send_inverted(image)
 
         self.send_command(0x13)
         self.send_data2(image)
 
-        self.send_command(0x12)
-        epdconfig.delay_ms(100)
-        self.ReadBusy()
+        return self._refresh_async()
 
     def Clear(self):
+        self.Clear_async().wait()
+
+    def Clear_async(self):
         self.send_command(0x10)
-        self.send_data2([0xFF] * int(self.width * self.height / 8))
+        self.send_data2(self._fill_white)
         self.send_command(0x13)
-        self.send_data2([0x00] * int(self.width * self.height / 8))
+        self.send_data2(self._fill_black)
 
-        self.send_command(0x12)
-        epdconfig.delay_ms(100)
-        self.ReadBusy()
+        return self._refresh_async()
 
     def display_Partial(self, Image, Xstart, Ystart, Xend, Yend):
+        self.display_Partial_async(Image, Xstart, Ystart, Xend, Yend).wait()
+
+    def display_Partial_async(self, Image, Xstart, Ystart, Xend, Yend):
         if((Xstart % 8 + Xend % 8 == 8 & Xstart % 8 > Xend % 8) | Xstart % 8 + Xend % 8 == 0 | (Xend - Xstart)%8 == 0):
             Xstart = Xstart // 8 * 8
             Xend = Xend // 8 * 8
@@ -334,36 +464,43 @@ class EPD:
         Width = (Xend - Xstart) // 8
         Height = Yend - Ystart
 	
-        self.send_command(0x50)
-        self.send_data(0xA9)
-        self.send_data(0x07)
-
-        self.send_command(0x91)		#This command makes the display enter partial mode
-        self.send_command(0x90)		#resolution setting
-        self.send_data (Xstart//256)
-        self.send_data (Xstart%256)   #x-start    
-
-        self.send_data ((Xend-1)//256)		
-        self.send_data ((Xend-1)%256)  #x-end	
-
-        self.send_data (Ystart//256)  #
-        self.send_data (Ystart%256)   #y-start    
-
-        self.send_data ((Yend-1)//256)		
-        self.send_data ((Yend-1)%256)  #y-end
-        self.send_data (0x01)
-
-        image1 = [0xFF] * int(self.width * self.height / 8)
-        for j in range(Height):
-                for i in range(Width):
-                    image1[i + j * Width] = ~Image[i + j * Width]
+        # Mode commands persist until the next reset or sleep; only send them
+        # when they differ from what the controller already holds.
+        if self.vcom != (0xA9, 0x07):
+            self.send_command(0x50)
+            self.send_data(0xA9)
+            self.send_data(0x07)
+            self.vcom = (0xA9, 0x07)
+
+        window = (Xstart, Xend, Ystart, Yend)
+        if self.partial_window is None:
+            self.send_command(0x91)		#This command makes the display enter partial mode
+        if self.partial_window != window:
+            self.send_command(0x90)		#resolution setting
+            self.send_data (Xstart//256)
+            self.send_data (Xstart%256)   #x-start    
+
+            self.send_data ((Xend-1)//256)		
+            self.send_data ((Xend-1)%256)  #x-end	
+
+            self.send_data (Ystart//256)  #
+            self.send_data (Ystart%256)   #y-start    
+
+            self.send_data ((Yend-1)//256)		
+            self.send_data ((Yend-1)%256)  #y-end
+            self.send_data (0x01)
+            self.partial_window = window
 
         self.send_command(0x13)   #Write Black and White image to RAM
-        self.send_data2(image1)
+        self._send_inverted(Image, Width * Height)
 
-        self.send_command(0x12)
-        epdconfig.delay_ms(100)
-        self.ReadBusy()
+        return self._refresh_async()
+
+    # Load a frame that is already on the glass into the controller's old-data
+    # RAM, so the next partial refresh drives only the pixels that differ.
+    def restore_frame(self, Image):
+        self.send_command(0x10)
+        self._send_inverted(Image)
 
     def display_4Gray(self, image):
         self.send_command(0x10)
@@ -431,9 +568,22 @@ class EPD:
             self.send_data(temp3)
         
         self.send_command(0x12)
-        epdconfig.delay_ms(100)
+        self.epdconfig.delay_ms(100)
+        self.ReadBusy()
+
+    # Deep sleep between refreshes: unlike sleep() the SPI/GPIO module stays
+    # open so init_part() can wake the controller without a full init().
+    def deep_sleep(self):
+        self.send_command(0x50)
+        self.send_data(0XF7)
+
+        self.send_command(0x02) # POWER_OFF
         self.ReadBusy()
 
+        self.send_command(0x07) # DEEP_SLEEP
+        self.send_data(0XA5)
+        self.invalidate()
+
     def sleep(self):
         self.send_command(0x50)
         self.send_data(0XF7)
@@ -444,6 +594,7 @@ class EPD:
         self.send_command(0x07) # DEEP_SLEEP
         self.send_data(0XA5)
         
-        epdconfig.delay_ms(2000)
-        epdconfig.module_exit()
+        self.epdconfig.delay_ms(2000)
+        self.epdconfig.module_exit()
+        self.invalidate()
 ### END OF FILE ###
@@ -37,6 +37,17 @@ from ctypes import *
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SPI_SPEED_HZ = 4000000
+
+
+def spidev_bufsiz(default=4096):
+    # Largest single transfer the spidev driver accepts (module parameter).
+    try:
+        with open('/sys/module/spidev/parameters/bufsiz') as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return default
+
 
 class RaspberryPi:
     # Pin definition
@@ -48,18 +59,52 @@ class RaspberryPi:
     MOSI_PIN = 10
     SCLK_PIN = 11
 
-    def __init__(self):
+    # Several panels can be driven from one process by creating one instance
+    # per panel with its own SPI chip-select and control pins; pwr_pin=None
+    # leaves panel power to be switched externally (e.g. a shared rail).
+    def __init__(self, spi_bus=0, spi_device=0, rst_pin=None, dc_pin=None,
+                 busy_pin=None, pwr_pin=PWR_PIN, spi_speed_hz=DEFAULT_SPI_SPEED_HZ,
+                 spi_chunk_size=None):
         import spidev
-        import gpiozero
+
+        self.spi_bus = spi_bus
+        self.spi_device = spi_device
+        self.spi_speed_hz = int(spi_speed_hz)
+        self.spi_chunk_size = int(spi_chunk_size) if spi_chunk_size else spidev_bufsiz()
+        if rst_pin is not None:
+            self.RST_PIN = rst_pin
+        if dc_pin is not None:
+            self.DC_PIN = dc_pin
+        if busy_pin is not None:
+            self.BUSY_PIN = busy_pin
+        self.PWR_PIN = pwr_pin
         
         self.SPI = spidev.SpiDev()
+        self._open_gpio()
+        self.spi_open = False
+
+    def _open_gpio(self):
+        import gpiozero
+
         self.GPIO_RST_PIN    = gpiozero.LED(self.RST_PIN)
         self.GPIO_DC_PIN     = gpiozero.LED(self.DC_PIN)
         # self.GPIO_CS_PIN     = gpiozero.LED(self.CS_PIN)
-        self.GPIO_PWR_PIN    = gpiozero.LED(self.PWR_PIN)
+        self.GPIO_PWR_PIN    = gpiozero.LED(self.PWR_PIN) if self.PWR_PIN is not None else None
         self.GPIO_BUSY_PIN   = gpiozero.Button(self.BUSY_PIN, pull_up = False)
 
-        
+    def _lines_off(self):
+        self.GPIO_RST_PIN.off()
+        self.GPIO_DC_PIN.off()
+        if self.GPIO_PWR_PIN is not None:
+            self.GPIO_PWR_PIN.off()
+
+    def _close_gpio(self):
+        self.GPIO_RST_PIN.close()
+        self.GPIO_DC_PIN.close()
+        # self.GPIO_CS_PIN.close()
+        if self.GPIO_PWR_PIN is not None:
+            self.GPIO_PWR_PIN.close()
+        self.GPIO_BUSY_PIN.close()
 
     def digital_write(self, pin, value):
         if pin == self.RST_PIN:
@@ -77,7 +122,7 @@ class RaspberryPi:
         #         self.GPIO_CS_PIN.on()
         #     else:
         #         self.GPIO_CS_PIN.off()
-        elif pin == self.PWR_PIN:
+        elif pin == self.PWR_PIN and self.GPIO_PWR_PIN is not None:
             if value:
                 self.GPIO_PWR_PIN.on()
             else:
@@ -102,7 +147,25 @@ class RaspberryPi:
         self.SPI.writebytes(data)
 
     def spi_writebyte2(self, data):
-        self.SPI.writebytes2(data)
+        chunk = self.spi_chunk_size
+        if len(data) <= chunk:
+            self.SPI.writebytes2(data)
+            return
+        if isinstance(data, (bytes, bytearray)):
+            data = memoryview(data)
+        for start in range(0, len(data), chunk):
+            self.SPI.writebytes2(data[start:start + chunk])
+
+    def spi_readbytes(self, count):
+        return self.SPI.readbytes(count)
+
+    def configure_spi(self, speed_hz=None, chunk_size=None):
+        if speed_hz is not None:
+            self.spi_speed_hz = int(speed_hz)
+            if self.spi_open:
+                self.SPI.max_speed_hz = self.spi_speed_hz
+        if chunk_size is not None:
+            self.spi_chunk_size = int(chunk_size)
 
     def DEV_SPI_write(self, data):
         self.DEV_SPI.DEV_SPI_SendData(data)
@@ -114,7 +177,8 @@ class RaspberryPi:
         return self.DEV_SPI.DEV_SPI_ReadData()
 
     def module_init(self, cleanup=False):
-        self.GPIO_PWR_PIN.on()
+        if self.PWR_PIN is not None:
+            self.digital_write(self.PWR_PIN, 1)
         
         if cleanup:
             find_dirs = [
@@ -138,33 +202,207 @@ class RaspberryPi:
 
             self.DEV_SPI.DEV_Module_Init()
 
-        else:
-            # SPI device, bus = 0, device = 0
-            self.SPI.open(0, 0)
-            self.SPI.max_speed_hz = 4000000
+        elif not self.spi_open:
+            # SPI device, bus = 0, device = 0 unless configured otherwise.
+            # Opened once: every init*() calls module_init() and reopening
+            # would leak a file descriptor per wake.
+            self.SPI.open(self.spi_bus, self.spi_device)
+            self.SPI.max_speed_hz = self.spi_speed_hz
             self.SPI.mode = 0b00
+            self.spi_open = True
         return 0
 
     def module_exit(self, cleanup=False):
         logger.debug("spi end")
         self.SPI.close()
+        self.spi_open = False
 
-        self.GPIO_RST_PIN.off()
-        self.GPIO_DC_PIN.off()
-        self.GPIO_PWR_PIN.off()
+        self._lines_off()
         logger.debug("close 5V, Module enters 0 power consumption ...")
         
         if cleanup:
-            self.GPIO_RST_PIN.close()
-            self.GPIO_DC_PIN.close()
-            # self.GPIO_CS_PIN.close()
-            self.GPIO_PWR_PIN.close()
-            self.GPIO_BUSY_PIN.close()
+            self._close_gpio()
 
-        
+
+# Linux GPIO character device uAPI v2 (linux/gpio.h).
+GPIO_V2_LINES_MAX = 64
+GPIO_V2_LINE_FLAG_INPUT = 1 << 2
+GPIO_V2_LINE_FLAG_OUTPUT = 1 << 3
+GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN = 1 << 9
+
+
+class _GpioV2LineAttribute(Structure):
+    _fields_ = [("id", c_uint32), ("padding", c_uint32), ("value", c_uint64)]
+
+
+class _GpioV2LineConfigAttribute(Structure):
+    _fields_ = [("attr", _GpioV2LineAttribute), ("mask", c_uint64)]
+
+
+class _GpioV2LineConfig(Structure):
+    _fields_ = [
+        ("flags", c_uint64),
+        ("num_attrs", c_uint32),
+        ("padding", c_uint32 * 5),
+        ("attrs", _GpioV2LineConfigAttribute * 10),
+    ]
+
+
+class _GpioV2LineRequest(Structure):
+    _fields_ = [
+        ("offsets", c_uint32 * GPIO_V2_LINES_MAX),
+        ("consumer", c_char * 32),
+        ("config", _GpioV2LineConfig),
+        ("num_lines", c_uint32),
+        ("event_buffer_size", c_uint32),
+        ("padding", c_uint32 * 5),
+        ("fd", c_int32),
+    ]
+
+
+class _GpioV2LineValues(Structure):
+    _fields_ = [("bits", c_uint64), ("mask", c_uint64)]
+
+
+def _iowr(number, struct_type):
+    return (3 << 30) | (sizeof(struct_type) << 16) | (0xB4 << 8) | number
+
+
+GPIO_V2_GET_LINE_IOCTL = _iowr(0x07, _GpioV2LineRequest)
+GPIO_V2_LINE_GET_VALUES_IOCTL = _iowr(0x0E, _GpioV2LineValues)
+GPIO_V2_LINE_SET_VALUES_IOCTL = _iowr(0x0F, _GpioV2LineValues)
+
+
+class GpioLines:
+    # A set of lines requested once from /dev/gpiochipN and kept open; every
+    # write is a single ioctl on the request fd, and write_many() changes
+    # several lines in one call.
+    def __init__(self, chip_path, offsets, flags, consumer=b"paperdash"):
+        import fcntl
+
+        self._ioctl = fcntl.ioctl
+        request = _GpioV2LineRequest()
+        for index, offset in enumerate(offsets):
+            request.offsets[index] = offset
+        request.consumer = consumer
+        request.config.flags = flags
+        request.num_lines = len(offsets)
+
+        chip_fd = os.open(chip_path, os.O_RDWR | os.O_CLOEXEC)
+        try:
+            self._ioctl(chip_fd, GPIO_V2_GET_LINE_IOCTL, request)
+        finally:
+            os.close(chip_fd)
+        self.fd = request.fd
+        self.masks = {offset: 1 << index for index, offset in enumerate(offsets)}
+        self._values = _GpioV2LineValues()
+
+    def __contains__(self, offset):
+        return offset in self.masks
+
+    def write(self, offset, value):
+        mask = self.masks[offset]
+        values = self._values
+        values.mask = mask
+        values.bits = mask if value else 0
+        self._ioctl(self.fd, GPIO_V2_LINE_SET_VALUES_IOCTL, values)
+
+    def write_many(self, levels):
+        values = self._values
+        values.mask = 0
+        values.bits = 0
+        for offset, value in levels.items():
+            mask = self.masks[offset]
+            values.mask |= mask
+            if value:
+                values.bits |= mask
+        self._ioctl(self.fd, GPIO_V2_LINE_SET_VALUES_IOCTL, values)
+
+    def read(self, offset):
+        mask = self.masks[offset]
+        values = self._values
+        values.mask = mask
+        self._ioctl(self.fd, GPIO_V2_LINE_GET_VALUES_IOCTL, values)
+        return 1 if values.bits & mask else 0
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class RaspberryPiGpiochip(RaspberryPi):
+    # Same SPI handling as RaspberryPi, but GPIO goes straight to the kernel's
+    # GPIO character device instead of through gpiozero objects: no pin
+    # factory, and a DC toggle is one dict lookup and one ioctl. Pin numbers
+    # are line offsets on gpio_chip (BCM numbers on the Pi's main chip; use
+    # /dev/gpiochip4 on a Pi 5 with older kernels).
+    def __init__(self, gpio_chip="/dev/gpiochip0", **kwargs):
+        self.gpio_chip = gpio_chip
+        super().__init__(**kwargs)
+
+    def _open_gpio(self):
+        outputs = [self.RST_PIN, self.DC_PIN]
+        if self.PWR_PIN is not None:
+            outputs.append(self.PWR_PIN)
+        self.gpio_out = GpioLines(self.gpio_chip, outputs, GPIO_V2_LINE_FLAG_OUTPUT)
+        self.gpio_in = GpioLines(
+            self.gpio_chip,
+            [self.BUSY_PIN],
+            GPIO_V2_LINE_FLAG_INPUT | GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN,
+        )
+
+    def digital_write(self, pin, value):
+        if pin in self.gpio_out.masks:
+            self.gpio_out.write(pin, value)
+
+    def digital_read(self, pin):
+        if pin == self.BUSY_PIN:
+            return self.gpio_in.read(pin)
+        if pin in self.gpio_out.masks:
+            return self.gpio_out.read(pin)
+        return 0
+
+    def _lines_off(self):
+        self.gpio_out.write_many({pin: 0 for pin in self.gpio_out.masks})
+
+    def _close_gpio(self):
+        self.gpio_out.close()
+        self.gpio_in.close()
 
 
 
+class _PythonSoftwareSPI:
+    # Pure-Python stand-in for sysfs_software_spi.so with the same entry
+    # points: SPI mode 0, MSB first, bit-banged through Jetson.GPIO. Orders of
+    # magnitude slower than the C library, but keeps the panel usable when the
+    # library is not installed.
+    def __init__(self, gpio, mosi_pin, sclk_pin):
+        self.GPIO = gpio
+        self.mosi_pin = mosi_pin
+        self.sclk_pin = sclk_pin
+
+    def SYSFS_software_spi_begin(self):
+        self.GPIO.setup(self.mosi_pin, self.GPIO.OUT, initial=0)
+        self.GPIO.setup(self.sclk_pin, self.GPIO.OUT, initial=0)
+
+    def SYSFS_software_spi_end(self):
+        self.GPIO.cleanup([self.mosi_pin, self.sclk_pin])
+
+    def SYSFS_software_spi_transfer(self, value):
+        self.SYSFS_software_spi_transfer_n(bytes((value & 0xFF,)), 1)
+        return 0
+
+    def SYSFS_software_spi_transfer_n(self, data, length):
+        output = self.GPIO.output
+        mosi, sclk = self.mosi_pin, self.sclk_pin
+        for value in data[:length]:
+            for bit in (0x80, 0x40, 0x20, 0x10, 0x08, 0x04, 0x02, 0x01):
+                output(mosi, 1 if value & bit else 0)
+                output(sclk, 1)
+                output(sclk, 0)
+
+
 class JetsonNano:
     # Pin definition
     RST_PIN  = 17
@@ -172,25 +410,48 @@ class JetsonNano:
     CS_PIN   = 8
     BUSY_PIN = 24
     PWR_PIN  = 18
+    MOSI_PIN = 10
+    SCLK_PIN = 11
+
+    # Searched in order for sysfs_software_spi.so and the bulk shim.
+    LIBRARY_DIRS = [
+        os.path.dirname(os.path.realpath(__file__)),
+        '/usr/local/lib',
+        '/usr/lib',
+    ]
 
     def __init__(self):
         import ctypes
-        find_dirs = [
-            os.path.dirname(os.path.realpath(__file__)),
-            '/usr/local/lib',
-            '/usr/lib',
-        ]
+        find_dirs = self.LIBRARY_DIRS
+        import Jetson.GPIO
+        self.GPIO = Jetson.GPIO
+
         self.SPI = None
         for find_dir in find_dirs:
             so_filename = os.path.join(find_dir, 'sysfs_software_spi.so')
             if os.path.exists(so_filename):
-                self.SPI = ctypes.cdll.LoadLibrary(so_filename)
+                # RTLD_GLOBAL so the bulk shim can resolve the per-byte symbol.
+                self.SPI = ctypes.CDLL(so_filename, mode=ctypes.RTLD_GLOBAL)
                 break
-        if self.SPI is None:
-            raise RuntimeError('Cannot find sysfs_software_spi.so')
 
-        import Jetson.GPIO
-        self.GPIO = Jetson.GPIO
+        # Whole-buffer transfer: exported by the library itself if it has one,
+        # otherwise by the optional sysfs_software_spi_bulk.so shim.
+        self._transfer_n = None
+        if self.SPI is None:
+            logger.warning('Cannot find sysfs_software_spi.so, falling back to Python bit-banging')
+            self.SPI = _PythonSoftwareSPI(self.GPIO, self.MOSI_PIN, self.SCLK_PIN)
+            self._transfer_n = self.SPI.SYSFS_software_spi_transfer_n
+        elif hasattr(self.SPI, 'SYSFS_software_spi_transfer_n'):
+            self._transfer_n = self.SPI.SYSFS_software_spi_transfer_n
+        else:
+            for find_dir in find_dirs:
+                so_filename = os.path.join(find_dir, 'sysfs_software_spi_bulk.so')
+                if os.path.exists(so_filename):
+                    self._transfer_n = ctypes.CDLL(so_filename).SYSFS_software_spi_transfer_n
+                    break
+        if hasattr(self._transfer_n, 'argtypes'):
+            self._transfer_n.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
+            self._transfer_n.restype = None
 
     def digital_write(self, pin, value):
         self.GPIO.output(pin, value)
@@ -205,9 +466,22 @@ class JetsonNano:
         self.SPI.SYSFS_software_spi_transfer(data[0])
 
     def spi_writebyte2(self, data):
+        if self._transfer_n is not None and isinstance(data, (bytes, bytearray, memoryview)):
+            length = len(data)
+            if isinstance(data, bytearray) and length:
+                # Zero-copy: hand the library a pointer into the bytearray.
+                data = (c_ubyte * length).from_buffer(data)
+            elif not isinstance(data, bytes):
+                data = bytes(data)
+            self._transfer_n(data, length)
+            return
         for i in range(len(data)):
             self.SPI.SYSFS_software_spi_transfer(data[i])
 
+    def configure_spi(self, speed_hz=None, chunk_size=None):
+        # Software SPI runs at whatever speed the bit-bang library manages.
+        pass
+
     def module_init(self):
         self.GPIO.setmode(self.GPIO.BCM)
         self.GPIO.setwarnings(False)
@@ -243,10 +517,25 @@ class SunriseX3:
     PWR_PIN  = 18
     Flag     = 0
 
-    def __init__(self):
+    def __init__(self, spi_bus=2, spi_device=0, rst_pin=None, dc_pin=None,
+                 busy_pin=None, pwr_pin=PWR_PIN, spi_speed_hz=DEFAULT_SPI_SPEED_HZ,
+                 spi_chunk_size=None):
         import spidev
         import Hobot.GPIO
 
+        self.spi_bus = spi_bus
+        self.spi_device = spi_device
+        self.spi_speed_hz = int(spi_speed_hz)
+        self.spi_chunk_size = int(spi_chunk_size) if spi_chunk_size else spidev_bufsiz()
+        if rst_pin is not None:
+            self.RST_PIN = rst_pin
+        if dc_pin is not None:
+            self.DC_PIN = dc_pin
+        if busy_pin is not None:
+            self.BUSY_PIN = busy_pin
+        # As on RaspberryPi, None means the panel power is switched externally.
+        self.PWR_PIN = pwr_pin
+
         self.GPIO = Hobot.GPIO
         self.SPI = spidev.SpiDev()
 
@@ -265,7 +554,20 @@ class SunriseX3:
     def spi_writebyte2(self, data):
         # for i in range(len(data)):
         #     self.SPI.writebytes([data[i]])
-        self.SPI.xfer3(data)
+        chunk = self.spi_chunk_size
+        for start in range(0, len(data), chunk):
+            self.SPI.xfer3(data[start:start + chunk])
+
+    def spi_readbytes(self, count):
+        return self.SPI.readbytes(count)
+
+    def configure_spi(self, speed_hz=None, chunk_size=None):
+        if speed_hz is not None:
+            self.spi_speed_hz = int(speed_hz)
+            if self.Flag:
+                self.SPI.max_speed_hz = self.spi_speed_hz
+        if chunk_size is not None:
+            self.spi_chunk_size = int(chunk_size)
 
     def module_init(self):
         if self.Flag == 0:
@@ -275,14 +577,16 @@ class SunriseX3:
             self.GPIO.setup(self.RST_PIN, self.GPIO.OUT)
             self.GPIO.setup(self.DC_PIN, self.GPIO.OUT)
             self.GPIO.setup(self.CS_PIN, self.GPIO.OUT)
-            self.GPIO.setup(self.PWR_PIN, self.GPIO.OUT)
+            if self.PWR_PIN is not None:
+                self.GPIO.setup(self.PWR_PIN, self.GPIO.OUT)
             self.GPIO.setup(self.BUSY_PIN, self.GPIO.IN)
 
-            self.GPIO.output(self.PWR_PIN, 1)
+            if self.PWR_PIN is not None:
+                self.GPIO.output(self.PWR_PIN, 1)
         
-            # SPI device, bus = 0, device = 0
-            self.SPI.open(2, 0)
-            self.SPI.max_speed_hz = 4000000
+            # SPI device, bus = 2, device = 0 unless configured otherwise
+            self.SPI.open(self.spi_bus, self.spi_device)
+            self.SPI.max_speed_hz = self.spi_speed_hz
             self.SPI.mode = 0b00
             return 0
         else:
@@ -296,27 +600,175 @@ class SunriseX3:
         self.Flag = 0
         self.GPIO.output(self.RST_PIN, 0)
         self.GPIO.output(self.DC_PIN, 0)
-        self.GPIO.output(self.PWR_PIN, 0)
+        pins = [self.RST_PIN, self.DC_PIN, self.CS_PIN, self.BUSY_PIN]
+        if self.PWR_PIN is not None:
+            self.GPIO.output(self.PWR_PIN, 0)
+            pins.append(self.PWR_PIN)
+
+        self.GPIO.cleanup(pins)
+
+
+class Simulated:
+    # Hardware-free backend for simulation and soak tests: GPIO and SPI traffic
+    # is counted instead of driven, and BUSY always reads as idle.
+    RST_PIN  = 17
+    DC_PIN   = 25
+    CS_PIN   = 8
+    BUSY_PIN = 24
+    PWR_PIN  = 18
+
+    # Skip the settle delay before polling BUSY after a refresh command.
+    REFRESH_SETTLE_MS = 0
+
+    def __init__(self, **kwargs):
+        # Accepts the RaspberryPi keyword arguments so panel specs work unchanged.
+        self.spi_bytes = 0
+        self.commands = 0
+        self.refreshes = 0
+        self._dc = 0
 
-        self.GPIO.cleanup([self.RST_PIN, self.DC_PIN, self.CS_PIN, self.BUSY_PIN], self.PWR_PIN)
+    def digital_write(self, pin, value):
+        if pin == self.DC_PIN:
+            self._dc = value
+
+    def digital_read(self, pin):
+        return 1
+
+    def delay_ms(self, delaytime):
+        pass
+
+    def spi_writebyte(self, data):
+        self.spi_bytes += len(data)
+        if not self._dc:
+            self.commands += 1
+            if data[0] == 0x12:
+                self.refreshes += 1
+
+    def spi_writebyte2(self, data):
+        self.spi_bytes += len(data)
 
+    def spi_readbytes(self, count):
+        return [0] * count
 
-if sys.version_info[0] == 2:
-    process = subprocess.Popen("cat /proc/cpuinfo | grep Raspberry", shell=True, stdout=subprocess.PIPE)
-else:
-    process = subprocess.Popen("cat /proc/cpuinfo | grep Raspberry", shell=True, stdout=subprocess.PIPE, text=True)
-output, _ = process.communicate()
-if sys.version_info[0] == 2:
-    output = output.decode(sys.stdout.encoding)
+    def configure_spi(self, speed_hz=None, chunk_size=None):
+        pass
 
-if "Raspberry" in output:
-    implementation = RaspberryPi()
-elif os.path.exists('/sys/bus/platform/drivers/gpio-x3'):
-    implementation = SunriseX3()
-else:
-    implementation = JetsonNano()
+    def module_init(self):
+        return 0
 
-for func in [x for x in dir(implementation) if not x.startswith('_')]:
-    setattr(sys.modules[__name__], func, getattr(implementation, func))
+    def module_exit(self):
+        pass
+
+
+def _detect_backend():
+    backend = os.environ.get("EPD_BACKEND")
+    if backend == "simulated":
+        return Simulated
+    if backend == "gpiochip":
+        return RaspberryPiGpiochip
+
+    if sys.version_info[0] == 2:
+        process = subprocess.Popen("cat /proc/cpuinfo | grep Raspberry", shell=True, stdout=subprocess.PIPE)
+    else:
+        process = subprocess.Popen("cat /proc/cpuinfo | grep Raspberry", shell=True, stdout=subprocess.PIPE, text=True)
+    output, _ = process.communicate()
+    if sys.version_info[0] == 2:
+        output = output.decode(sys.stdout.encoding)
+
+    if "Raspberry" in output:
+        return RaspberryPi
+    if os.path.exists('/sys/bus/platform/drivers/gpio-x3'):
+        return SunriseX3
+    return JetsonNano
+
+
+# The board is probed and the default backend (which claims the default pins)
+# created on first use, not at import, so callers that pick their own backend
+# (simulation, per-panel specs) never touch the hardware of the default one.
+_backend_class = None
+_implementation = None
+
+# create() keyword arguments compared against an existing backend's settings.
+_MATCHED_SETTINGS = {
+    "spi_bus": "spi_bus",
+    "spi_device": "spi_device",
+    "rst_pin": "RST_PIN",
+    "dc_pin": "DC_PIN",
+    "busy_pin": "BUSY_PIN",
+    "pwr_pin": "PWR_PIN",
+    "gpio_chip": "gpio_chip",
+}
+
+
+def get_backend_class():
+    global _backend_class
+    if _backend_class is None:
+        _backend_class = _detect_backend()
+    return _backend_class
+
+
+def get_implementation():
+    """Return the default backend, creating it on first use."""
+    global _implementation
+    if _implementation is None:
+        _implementation = get_backend_class()()
+    return _implementation
+
+
+def _reusable(backend_class, kwargs):
+    # The default backend already holds its pins; hand it out again instead of
+    # requesting the same lines twice when a spec describes the same panel.
+    if _implementation is None or type(_implementation) is not backend_class:
+        return False
+    for key, value in kwargs.items():
+        if key in ("spi_speed_hz", "spi_chunk_size"):
+            continue
+        attribute = _MATCHED_SETTINGS.get(key)
+        if attribute is None or getattr(_implementation, attribute, None) != value:
+            return False
+    return True
+
+
+def create(**kwargs):
+    """Return a backend for the detected board, e.g. for a second panel.
+
+    Keyword arguments (spi_bus, spi_device, rst_pin, dc_pin, busy_pin,
+    pwr_pin, spi_speed_hz, spi_chunk_size) are passed to the backend; JetsonNano drives a single panel
+    through its software SPI library and accepts none. gpio="gpiochip" (with
+    an optional gpio_chip path) selects the GPIO character-device backend on
+    a Raspberry Pi, gpio="gpiozero" the default one. pwr_pin=None means the
+    panel has no power pin on every backend. If the default backend already
+    exists with the same bus and pins it is returned instead of a new one.
+    """
+    gpio = kwargs.pop("gpio", None)
+    if gpio == "gpiochip":
+        backend_class = RaspberryPiGpiochip
+    elif gpio == "gpiozero":
+        backend_class = RaspberryPi
+    elif gpio is not None:
+        raise ValueError('Unknown gpio backend %r' % gpio)
+    else:
+        backend_class = get_backend_class()
+        if kwargs and backend_class is JetsonNano:
+            raise RuntimeError('JetsonNano backend does not support multiple panels')
+    if _reusable(backend_class, kwargs):
+        _implementation.configure_spi(kwargs.get("spi_speed_hz"), kwargs.get("spi_chunk_size"))
+        return _implementation
+    return backend_class(**kwargs)
+
+
+def __getattr__(name):
+    # "implementation", "backend_class" and the legacy module-level functions
+    # (epdconfig.digital_write(...) etc.) resolve to the default backend.
+    if name == "implementation":
+        return get_implementation()
+    if name == "backend_class":
+        return get_backend_class()
+    if name.startswith('_'):
+        raise AttributeError(name)
+    try:
+        return getattr(get_implementation(), name)
+    except AttributeError:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name)) from None
 
 ### END OF FILE ###
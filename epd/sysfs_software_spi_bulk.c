@@ -0,0 +1,23 @@
+/*
+ * Bulk entry point for Waveshare's sysfs_software_spi.so (JetsonNano backend).
+ *
+ * The vendor library only exports a per-byte transfer, so sending a frame
+ * from Python costs one ctypes call per byte. This shim loops in C instead;
+ * epdconfig loads it after sysfs_software_spi.so (RTLD_GLOBAL), so the
+ * per-byte symbol below is resolved from the vendor library at load time.
+ *
+ * Build next to epdconfig.py (or in /usr/local/lib):
+ *
+ *     gcc -shared -fPIC -O2 -o sysfs_software_spi_bulk.so sysfs_software_spi_bulk.c
+ */
+
+#include <stdint.h>
+
+extern uint8_t SYSFS_software_spi_transfer(uint8_t value);
+
+void SYSFS_software_spi_transfer_n(const uint8_t *data, uint32_t len)
+{
+    for (uint32_t i = 0; i < len; i++) {
+        SYSFS_software_spi_transfer(data[i]);
+    }
+}
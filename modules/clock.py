@@ -1,8 +1,37 @@
 # modules/clock.py
 
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 
 def get_current_time():
     now = datetime.now()
     return now.strftime("%Y/%m/%d %H:%M:%S")
 
+
+class SystemClock:
+    """Wall-clock time; the default clock for the main loop."""
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+
+class SimulatedClock:
+    """Virtual time that jumps forward on sleep() instead of waiting."""
+
+    def __init__(self, start: datetime):
+        self._now = start
+
+    def now(self) -> datetime:
+        return self._now
+
+    def sleep(self, seconds: float) -> None:
+        self._now += timedelta(seconds=seconds)
+
+    def monotonic(self) -> float:
+        return self._now.timestamp()
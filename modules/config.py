@@ -1,22 +1,165 @@
 # modules/config.py
 
+import ctypes
+import ctypes.util
 import json
 import os
+import select
+import struct
+import time
 
 DEFAULT_CONFIG = {
     "weather_update_interval": 5,
     "stock_update_interval": 5,
     "logo_path": "assets/logo.bmp",
-    "targets_path": "assets/targets.json"
+    "targets_path": "assets/targets.json",
+    "warm_start": True,
+    "frame_cache_path": "cache/last_frame.bin",
+    "deep_sleep": False
 }
 
 CONFIG_PATH = os.path.join("assets", "config.json")
 
-def load_config():
+# inotify(7) constants; editors usually write a temp file and rename it over
+# the original, so the parent directory is watched rather than the file.
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _read_config(path):
+    with open(path, "r") as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError("config root must be an object")
+    return {**DEFAULT_CONFIG, **config}
+
+
+def load_config(path=CONFIG_PATH):
     try:
-        with open(CONFIG_PATH, "r") as f:
-            config = json.load(f)
-            return {**DEFAULT_CONFIG, **config}
+        return _read_config(path)
     except Exception:
-        return DEFAULT_CONFIG
+        return dict(DEFAULT_CONFIG)
+
+
+def diff_config(old, new):
+    """Return the set of top-level keys whose values differ between two configs."""
+
+    keys = set(old) | set(new)
+    return {key for key in keys if old.get(key) != new.get(key)}
+
+
+class ConfigWatcher:
+    """Watch the config file and report which keys changed.
+
+    Uses inotify when available so ``wait`` wakes up as soon as the file is
+    rewritten; other platforms fall back to comparing the modification time
+    once per ``wait`` call.
+    """
+
+    def __init__(self, path=CONFIG_PATH, config=None):
+        self.path = path
+        self.config = config if config is not None else load_config(path)
+        self._name = os.path.basename(path).encode()
+        self._mtime = self._current_mtime()
+        self._fd = self._open_inotify(os.path.dirname(os.path.abspath(path)))
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def _open_inotify(directory):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd < 0:
+                return None
+            mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+            if libc.inotify_add_watch(fd, directory.encode(), mask) < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (AttributeError, OSError, TypeError):
+            return None
+
+    def _drain_events(self):
+        touched = False
+        while True:
+            try:
+                data = os.read(self._fd, 4096)
+            except BlockingIOError:
+                return touched
+            if not data:
+                return touched
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if name == self._name:
+                    touched = True
+
+    def wait(self, timeout, wake_fd=None):
+        """Sleep up to ``timeout`` seconds and return the keys that changed.
+
+        Returns an empty set when nothing changed or the new file could not be
+        parsed; in that case the previous configuration is kept. A write to
+        ``wake_fd`` (the read end of a pipe) ends the wait early.
+        """
+
+        wake = [wake_fd] if wake_fd is not None else []
+        if self._fd is None:
+            if select.select(wake, [], [], timeout)[0]:
+                self._drain_wake(wake_fd)
+            mtime = self._current_mtime()
+            if mtime == self._mtime:
+                return set()
+            self._mtime = mtime
+            return self.reload()
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            readable, _, _ = select.select([self._fd] + wake, [], [], remaining)
+            if not readable:
+                return set()
+            if wake_fd in readable:
+                self._drain_wake(wake_fd)
+                if self._fd not in readable:
+                    return set()
+            if self._drain_events():
+                return self.reload()
+
+    @staticmethod
+    def _drain_wake(fd):
+        try:
+            while os.read(fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def reload(self):
+        try:
+            new_config = _read_config(self.path)
+        except Exception as exc:
+            print(f"[WARN] Ignoring config change, failed to parse '{self.path}': {exc}")
+            return set()
+
+        changed = diff_config(self.config, new_config)
+        self.config = new_config
+        return changed
 
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,165 @@
+"""Font lookup and precompiled 1-bit bitmap fonts for the layout widgets."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from PIL import FontFile, Image, ImageDraw, ImageFont
+
+DEFAULT_FONTS = {
+    "family": "DejaVuSansMono",
+    "path": None,  # explicit .ttf path; skips the directory search
+    "bitmap": False,  # precompile each size into a PIL bitmap font
+    "cache_dir": "cache/fonts",
+}
+
+FONT_DIRS = (
+    "assets/fonts",
+    os.path.expanduser("~/.local/share/fonts"),
+    os.path.expanduser("~/.fonts"),
+    "/usr/local/share/fonts",
+    "/usr/share/fonts",
+)
+
+FONT_EXTENSIONS = (".ttf", ".otf")
+
+# Bump when the compiled layout changes so stale caches are rebuilt.
+_BITMAP_VERSION = 2
+
+_LOADED: Dict[Tuple[str, int, bool], ImageFont.ImageFont] = {}
+_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def find_font(family: str) -> str:
+    """Return the path of the first ``<family>.ttf``/``.otf`` in ``FONT_DIRS``."""
+
+    wanted = {family + ext for ext in FONT_EXTENSIONS}
+    for directory in FONT_DIRS:
+        for root, _dirs, files in os.walk(directory):
+            for name in sorted(files):
+                if name in wanted:
+                    return os.path.join(root, name)
+    raise FileNotFoundError(f"Font '{family}' not found in {', '.join(FONT_DIRS)}")
+
+
+def _metrics_path(pil_path: str) -> str:
+    return os.path.splitext(pil_path)[0] + ".json"
+
+
+class _RasterisedFont(FontFile.FontFile):
+    """Latin-1 glyphs rendered once by FreeType with anti-aliasing off.
+
+    ``boxes`` keeps each glyph's advance and TrueType box, including the
+    boxes of blank glyphs, which the ``.pil`` format cannot hold.
+    """
+
+    def __init__(self, font: ImageFont.FreeTypeFont):
+        super().__init__()
+        self.boxes: Dict[int, Tuple[int, int, int, int, int]] = {}
+        for code in range(32, 256):
+            char = chr(code)
+            advance = round(font.getlength(char))
+            # Boxes are relative to the ascender line (the "la" anchor
+            # ImageDraw.text uses), so bitmap text lands where TrueType text did.
+            left, top, right, bottom = font.getbbox(char, anchor="la")
+            self.boxes[code] = (advance, left, top, right, bottom)
+            width, height = right - left, bottom - top
+            if width <= 0 or height <= 0:
+                glyph = Image.new("1", (1, 1), 0)
+                self.glyph[code] = ((advance, 0), (0, 0, 0, 0), (0, 0, 0, 0), glyph)
+                continue
+            glyph = Image.new("1", (width, height), 0)
+            draw = ImageDraw.Draw(glyph)
+            draw.fontmode = "1"
+            draw.text((-left, -top), char, font=font, fill=1, anchor="la")
+            self.glyph[code] = ((advance, 0), (left, top, right, bottom), (0, 0, width, height), glyph)
+
+
+def compile_bitmap_font(ttf_path: str, size: int, cache_dir: str) -> str:
+    """Rasterise ``ttf_path`` at ``size`` into a cached ``.pil``/``.pbm`` pair.
+
+    The cache is reused until the source font is modified.
+    """
+
+    family = os.path.splitext(os.path.basename(ttf_path))[0]
+    pil_path = os.path.join(cache_dir, f"{family}-{size}-v{_BITMAP_VERSION}.pil")
+    try:
+        # The metrics are written last, so they mark a complete cache entry.
+        if os.path.getmtime(_metrics_path(pil_path)) >= os.path.getmtime(ttf_path):
+            return pil_path
+    except OSError:
+        pass
+
+    os.makedirs(cache_dir, exist_ok=True)
+    rasterised = _RasterisedFont(ImageFont.truetype(ttf_path, size))
+    rasterised.save(pil_path)
+    with open(_metrics_path(pil_path), "w", encoding="utf-8") as metrics_file:
+        json.dump(rasterised.boxes, metrics_file)
+    print(f"[INFO] Compiled bitmap font {family} {size}px to '{pil_path}'")
+    return pil_path
+
+
+class BitmapFont(ImageFont.ImageFont):
+    """A compiled bitmap font that measures text like its TrueType source.
+
+    PIL's bitmap fonts report the full line height for every string, which
+    would move vertically centred text; the saved TrueType boxes give the
+    same ``getbbox``/``getsize``/``getlength`` as ``FreeTypeFont``.
+    """
+
+    def __init__(self, pil_path: str):
+        self._load_pilfont(pil_path)
+        with open(_metrics_path(pil_path), "r", encoding="utf-8") as metrics_file:
+            self._metrics = {int(code): tuple(box) for code, box in json.load(metrics_file).items()}
+
+    def getbbox(self, text: str, *args, **kwargs) -> Tuple[int, int, int, int]:
+        if not text:
+            return 0, 0, 0, 0
+        x = 0
+        left = top = right = bottom = None
+        for char in text:
+            metrics = self._metrics.get(ord(char))
+            if metrics is None:
+                continue  # not in the font; drawn as nothing
+            advance, glyph_left, glyph_top, glyph_right, glyph_bottom = metrics
+            left = x + glyph_left if left is None else min(left, x + glyph_left)
+            top = glyph_top if top is None else min(top, glyph_top)
+            right = x + glyph_right if right is None else max(right, x + glyph_right)
+            bottom = glyph_bottom if bottom is None else max(bottom, glyph_bottom)
+            x += advance
+        if left is None:
+            return 0, 0, 0, 0
+        return left, top, max(x, right), bottom
+
+    def getsize(self, text: str, *args, **kwargs) -> Tuple[int, int]:
+        return self.getbbox(text)[2:]
+
+    def getlength(self, text: str, *args, **kwargs) -> int:
+        return sum(self._metrics.get(ord(char), (0,))[0] for char in text)
+
+
+class FontCache:
+    """Loads fonts by point size per the "fonts" settings, shared across panels."""
+
+    def __init__(self, settings: Optional[dict] = None):
+        options = {**DEFAULT_FONTS, **(settings or {})}
+        self.path = options["path"] or find_font(options["family"])
+        self.bitmap = bool(options["bitmap"])
+        self.cache_dir = options["cache_dir"]
+
+    def load(self, size: int):
+        key = (self.path, size, self.bitmap)
+        with _LOCK:
+            font = _LOADED.get(key)
+            if font is None:
+                if self.bitmap:
+                    font = BitmapFont(compile_bitmap_font(self.path, size, self.cache_dir))
+                else:
+                    font = ImageFont.truetype(self.path, size)
+                _LOADED[key] = font
+        return font
@@ -0,0 +1,251 @@
+"""Append-only history of displayed frames stored as run-length XOR deltas.
+
+Each segment file starts with a header and a keyframe; every record after
+that holds the XOR of the frame against the previous one. Both keyframes and
+deltas use the same sparse encoding (keyframes are deltas against a blank
+frame), which suits packed 1-bit frames: white is zero and a clock tick only
+flips a few hundred bytes.
+
+Segment layout::
+
+    header  b"PDFL" width:u16 height:u16
+    record  kind:c ('K' or 'D') timestamp:f64 length:u32 payload
+
+Payload is a sequence of ``skip`` / ``count`` varints followed by ``count``
+literal bytes, where ``skip`` is the number of unchanged (zero) bytes before
+the literal run.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import struct
+import time
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+_MAGIC = b"PDFL"
+_FILE_HEADER = struct.Struct("<4sHH")
+_RECORD_HEADER = struct.Struct("<cdI")
+KEYFRAME = b"K"
+DELTA = b"D"
+
+# Non-zero runs, bridging gaps of up to four zero bytes that would cost more
+# as a new run header than as literals.
+_RUNS = re.compile(rb"[^\x00]+(?:\x00{1,4}[^\x00]+)*")
+
+_SEGMENT_NAME = re.compile(r"frames-(\d{8})_\d{8}-\d{6}\.log")
+
+DEFAULT_LOG = {
+    "directory": "cache/frames",
+    "max_bytes": 8 * 1024 * 1024,
+    "segment_bytes": 1024 * 1024,
+    "keyframe_interval": 360,
+}
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def xor_frames(a: bytes, b: bytes) -> bytes:
+    size = len(a)
+    return (int.from_bytes(a, "big") ^ int.from_bytes(b, "big")).to_bytes(size, "big")
+
+
+def encode_sparse(data: bytes) -> bytes:
+    """Encode ``data`` as zero-skip / literal runs."""
+
+    out = bytearray()
+    pos = 0
+    for match in _RUNS.finditer(data):
+        start, end = match.span()
+        out += _varint(start - pos)
+        out += _varint(end - start)
+        out += data[start:end]
+        pos = end
+    return bytes(out)
+
+
+def apply_sparse(frame: bytearray, payload: bytes) -> None:
+    """XOR the runs in ``payload`` into ``frame`` in place."""
+
+    pos = 0
+    offset = 0
+    while pos < len(payload):
+        skip, pos = _read_varint(payload, pos)
+        count, pos = _read_varint(payload, pos)
+        offset += skip
+        run = payload[pos:pos + count]
+        frame[offset:offset + count] = xor_frames(bytes(frame[offset:offset + count]), run)
+        pos += count
+        offset += count
+
+
+class FrameLog:
+    """Writes frames to rotating segment files within a bounded directory size."""
+
+    def __init__(self, width: int, height: int, settings: Optional[dict] = None):
+        options = {**DEFAULT_LOG, **(settings or {})}
+        self.width = width
+        self.height = height
+        self.directory = options["directory"]
+        self.max_bytes = int(options["max_bytes"])
+        self.segment_bytes = int(options["segment_bytes"])
+        self.keyframe_interval = max(1, int(options["keyframe_interval"]))
+        self._file = None
+        self._path: Optional[str] = None
+        self._since_keyframe = 0
+        # Last logged frame, allocated once and overwritten in place.
+        self._previous = bytearray(((width + 7) // 8) * height)
+        self._has_previous = False
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _open_segment(self, timestamp: float) -> None:
+        self.close()
+        # Segments are ordered by a creation sequence, not by the wall clock,
+        # which can step backwards (NTP on a Pi without an RTC).
+        segments = list_segments(self.directory)
+        sequence = _segment_sequence(segments[-1]) + 1 if segments else 1
+        stamp = datetime.fromtimestamp(timestamp).strftime("%Y%m%d-%H%M%S")
+        self._path = os.path.join(self.directory, f"frames-{sequence:08d}_{stamp}.log")
+        self._file = open(self._path, "ab")
+        self._file.write(_FILE_HEADER.pack(_MAGIC, self.width, self.height))
+        self._has_previous = False
+        self._prune()
+
+    def _prune(self) -> None:
+        segments = list_segments(self.directory)
+        sizes = [os.path.getsize(path) for path in segments]
+        total = sum(sizes)
+        for path, size in zip(segments, sizes):
+            if total <= self.max_bytes:
+                break
+            if path == self._path:
+                continue  # never delete the segment being written
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def append(self, frame: bytes, timestamp: Optional[float] = None) -> None:
+        timestamp = time.time() if timestamp is None else timestamp
+        try:
+            if self._file is None or self._file.tell() >= self.segment_bytes:
+                self._open_segment(timestamp)
+
+            if not self._has_previous or self._since_keyframe >= self.keyframe_interval:
+                kind, payload = KEYFRAME, encode_sparse(frame)
+                self._since_keyframe = 0
+            else:
+                kind, payload = DELTA, encode_sparse(xor_frames(frame, self._previous))
+                self._since_keyframe += 1
+
+            self._file.write(_RECORD_HEADER.pack(kind, timestamp, len(payload)))
+            self._file.write(payload)
+            self._file.flush()
+            self._previous[:] = frame
+            self._has_previous = True
+        except OSError as exc:
+            print(f"[WARN] Failed to append to frame log: {exc}")
+            self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._path = None
+
+
+def _segment_sequence(path: str) -> int:
+    """Creation sequence from ``frames-<seq>_<stamp>.log``; 0 for older timestamp-only names."""
+
+    match = _SEGMENT_NAME.fullmatch(os.path.basename(path))
+    return int(match.group(1)) if match else 0
+
+
+def _segment_order(path: str) -> Tuple[int, float, str]:
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = 0.0
+    return _segment_sequence(path), mtime, path
+
+
+def list_segments(directory: str) -> List[str]:
+    """Segment paths, oldest first, in the order they were created."""
+
+    try:
+        names = [name for name in os.listdir(directory) if name.startswith("frames-") and name.endswith(".log")]
+    except OSError:
+        return []
+    return sorted((os.path.join(directory, name) for name in names), key=_segment_order)
+
+
+def iter_records(path: str) -> Iterator[Tuple[bytes, float, int, int]]:
+    """Yield ``(kind, timestamp, payload_offset, payload_length)`` without reading payloads."""
+
+    with open(path, "rb") as log_file:
+        header = log_file.read(_FILE_HEADER.size)
+        if len(header) < _FILE_HEADER.size or header[:4] != _MAGIC:
+            return
+        while True:
+            raw = log_file.read(_RECORD_HEADER.size)
+            if len(raw) < _RECORD_HEADER.size:
+                return
+            kind, timestamp, length = _RECORD_HEADER.unpack(raw)
+            offset = log_file.tell()
+            log_file.seek(length, os.SEEK_CUR)
+            if log_file.tell() > os.fstat(log_file.fileno()).st_size:
+                return  # truncated by a crash mid-write
+            yield kind, timestamp, offset, length
+
+
+def read_dimensions(path: str) -> Tuple[int, int]:
+    with open(path, "rb") as log_file:
+        magic, width, height = _FILE_HEADER.unpack(log_file.read(_FILE_HEADER.size))
+    if magic != _MAGIC:
+        raise ValueError(f"'{path}' is not a frame log")
+    return width, height
+
+
+def reconstruct(path: str, index: int) -> Tuple[bytes, float]:
+    """Return the packed frame and timestamp of record ``index`` in segment ``path``.
+
+    Decoding starts from the closest keyframe at or before ``index``.
+    """
+
+    width, height = read_dimensions(path)
+    records = list(iter_records(path))
+    if not 0 <= index < len(records):
+        raise IndexError(f"Frame {index} out of range (segment has {len(records)})")
+
+    start = index
+    while start > 0 and records[start][0] != KEYFRAME:
+        start -= 1
+
+    frame = bytearray(((width + 7) // 8) * height)
+    with open(path, "rb") as log_file:
+        for kind, _timestamp, offset, length in records[start:index + 1]:
+            log_file.seek(offset)
+            apply_sparse(frame, log_file.read(length))
+    return bytes(frame), records[index][1]
@@ -0,0 +1,146 @@
+"""Optional HTTP server exposing the frames currently shown on each panel."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+DEFAULT_SERVER = {
+    "host": "0.0.0.0",
+    "port": 8080,
+}
+
+
+class FrameStore:
+    """Latest frame per panel with encodings cached per frame version.
+
+    ``publish`` only swaps a reference, so the render loop never waits on
+    clients; encodings are produced lazily by the first request for a version
+    and then shared by every other client polling that version.
+    """
+
+    def __init__(self):
+        # Versions restart at 1 with the process; the nonce keeps ETags from
+        # an earlier run from matching a different frame after a restart.
+        self.boot_id = os.urandom(4).hex()
+        self._lock = threading.Lock()
+        self._frames: Dict[str, Tuple[int, Image.Image, bytes]] = {}
+        self._encoded: Dict[Tuple[str, str], Tuple[int, bytes]] = {}
+
+    def publish(self, name: str, image: Image.Image, packed: bytes) -> None:
+        with self._lock:
+            version = self._frames[name][0] + 1 if name in self._frames else 1
+            # Snapshots: HTTP threads serve them after the pipeline has reused
+            # its image and buffer for the next frame.
+            self._frames[name] = (version, image.copy(), bytes(packed))
+
+    def names(self):
+        with self._lock:
+            return sorted(self._frames)
+
+    def get(self, name: str, fmt: str) -> Optional[Tuple[int, bytes, Tuple[int, int]]]:
+        """Return (version, payload, size) for ``fmt`` ("png" or "bin")."""
+
+        with self._lock:
+            frame = self._frames.get(name)
+            if frame is None:
+                return None
+            version, image, packed = frame
+            cached = self._encoded.get((name, fmt))
+            if cached is not None and cached[0] == version:
+                return version, cached[1], image.size
+
+        if fmt == "bin":
+            payload = packed
+        else:
+            output = io.BytesIO()
+            image.save(output, format="PNG", optimize=True)
+            payload = output.getvalue()
+
+        with self._lock:
+            self._encoded[(name, fmt)] = (version, payload)
+        return version, payload, image.size
+
+
+class _FrameRequestHandler(BaseHTTPRequestHandler):
+    store: FrameStore
+    default_panel: str
+
+    CONTENT_TYPES = {"png": "image/png", "bin": "application/octet-stream"}
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].strip("/")
+
+        if path in ("", "panels"):
+            body = json.dumps({"panels": self.store.names()}).encode("utf-8")
+            self._send(200, "application/json", body)
+            return
+
+        name, _, fmt = path.rpartition(".")
+        if name == "frame":
+            name = self.default_panel
+        if fmt not in self.CONTENT_TYPES or not name:
+            self._send(404, "text/plain", b"Not found\n")
+            return
+
+        result = self.store.get(name, fmt)
+        if result is None:
+            self._send(404, "text/plain", b"No frame yet\n")
+            return
+
+        version, payload, (width, height) = result
+        etag = f'"{name}-{self.store.boot_id}-{version}-{fmt}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "X-Frame-Version": str(version),
+            "X-Frame-Width": str(width),
+            "X-Frame-Height": str(height),
+        }
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, None, b"", headers)
+            return
+        self._send(200, self.CONTENT_TYPES[fmt], payload, headers)
+
+    def _send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_frame_server(settings: dict, default_panel: str = "default") -> FrameStore:
+    """Serve ``/frame.png``, ``/frame.bin`` and ``/<panel>.png|bin`` in a daemon thread.
+
+    ``.bin`` is the packed 1-bit buffer produced by ``EPD.getbuffer``
+    (row-major, MSB first, 1 = black); the driver inverts it on its way into
+    the panel RAM.
+    """
+
+    options = {**DEFAULT_SERVER, **(settings or {})}
+    store = FrameStore()
+    handler = type(
+        "FrameRequestHandler",
+        (_FrameRequestHandler,),
+        {"store": store, "default_panel": default_panel},
+    )
+    server = ThreadingHTTPServer((options["host"], int(options["port"])), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="frame-server", daemon=True)
+    thread.start()
+    print(f"[INFO] Frame server listening on {options['host']}:{options['port']}")
+    return store
@@ -0,0 +1,47 @@
+"""Persist the last packed framebuffer so restarts can skip a full clear."""
+
+from __future__ import annotations
+
+import os
+import struct
+from typing import Optional
+
+_HEADER = struct.Struct("<4sHH")
+_MAGIC = b"PDF1"
+
+
+def save_frame(path: str, frame: bytes, width: int, height: int) -> None:
+    """Atomically write ``frame`` with its panel dimensions to ``path``."""
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as frame_file:
+            frame_file.write(_HEADER.pack(_MAGIC, width, height))
+            frame_file.write(frame)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        print(f"[WARN] Failed to save frame to '{path}': {exc}")
+
+
+def load_frame(path: str, width: int, height: int) -> Optional[bytes]:
+    """Return the saved frame if it exists and matches the panel, else ``None``."""
+
+    try:
+        with open(path, "rb") as frame_file:
+            data = frame_file.read()
+    except OSError:
+        return None
+
+    if len(data) < _HEADER.size:
+        return None
+
+    magic, saved_width, saved_height = _HEADER.unpack_from(data)
+    frame = data[_HEADER.size:]
+    expected = ((width + 7) // 8) * height
+    if magic != _MAGIC or (saved_width, saved_height) != (width, height) or len(frame) != expected:
+        return None
+    return frame
@@ -0,0 +1,394 @@
+"""Overlays pushed by other processes over a Unix socket or shared memory.
+
+Each request is a ``HEADER`` followed, unless ``shm`` names a
+``multiprocessing.shared_memory`` block, by the packed 1-bit image (row-major,
+MSB first, 1 = black, rows padded to whole bytes; the frame server's ``.bin``
+format). The server answers ``OK`` or ``ERR <reason>`` on one line and keeps
+the connection open for further requests.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+from modules.layout import Box
+
+DEFAULT_INJECTION = {
+    "socket": "cache/paperdash.sock",
+    "mode": 0o660,  # socket file permissions
+    "max_overlays": 16,
+}
+
+MAGIC = b"PDOV"
+VERSION = 1
+
+# Operations.
+PUT = 1
+REMOVE = 2
+
+# Flags.
+TRANSPARENT = 0x01  # draw only the black pixels over the dashboard
+
+# magic, version, op, flags, priority, x, y, width, height, ttl (ms, 0 = until
+# removed), overlay id, panel ("" = every panel), shared memory name.
+HEADER = struct.Struct("<4sBBBhHHHHI16s16s32s")
+
+
+class ProtocolError(ValueError):
+    """A request whose payload cannot be skipped; the connection is dropped."""
+
+
+def packed_stride(width: int) -> int:
+    return (width + 7) // 8
+
+
+def pack_image(image: Image.Image) -> bytes:
+    """Pack ``image`` into the wire format (1 = black)."""
+
+    if image.mode != "1":
+        image = image.convert("1")
+    return image.tobytes("raw", "1;I")
+
+
+def _text(value: bytes) -> str:
+    return value.rstrip(b"\0").decode("utf-8")
+
+
+def _overlaps(a: Box, b: Box) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _covers(outer: Box, inner: Box) -> bool:
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+
+@dataclass
+class Overlay:
+    key: str
+    panel: str  # "" = every panel
+    box: Box
+    priority: int
+    image: Image.Image  # opaque overlays: the picture; transparent ones: the paste mask
+    transparent: bool
+    expires: Optional[float]  # store clock, None = until removed
+    sequence: int = 0
+
+
+class OverlayStore:
+    """Active overlays per panel plus the boxes that need recomposing.
+
+    ``put``/``remove`` run on the server thread and only record damage;
+    ``compose`` runs in ``Panel.update`` and folds the overlays into the
+    layout's dirty boxes, so injected frames take the normal partial-refresh
+    path. A write to ``wake_fd`` lets the main loop notice them right away.
+    """
+
+    def __init__(self, panel_sizes: Dict[str, Tuple[int, int]], clock=time.monotonic, max_overlays: int = 16):
+        self.panel_sizes = dict(panel_sizes)
+        self.clock = clock
+        self.max_overlays = max_overlays
+        self._lock = threading.Lock()
+        self._overlays: Dict[Tuple[str, str], Overlay] = {}
+        self._damage: Dict[str, List[Box]] = {name: [] for name in self.panel_sizes}
+        self._sequence = 0
+        self.wake_fd, self._wake_w = os.pipe()
+        os.set_blocking(self.wake_fd, False)
+        os.set_blocking(self._wake_w, False)
+
+    def _panels(self, panel: str) -> Iterable[str]:
+        return self.panel_sizes if not panel else (panel,)
+
+    def _damage_locked(self, overlay: Overlay) -> None:
+        for name in self._panels(overlay.panel):
+            self._damage[name].append(overlay.box)
+
+    def _wake(self) -> None:
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass  # a wake-up is already pending
+
+    def check(self, panel: str, box: Box) -> None:
+        """Raise ``ValueError`` unless ``box`` fits on ``panel`` (every panel for "")."""
+
+        if panel and panel not in self.panel_sizes:
+            raise ValueError(f"unknown panel '{panel}'")
+        for name in self._panels(panel):
+            width, height = self.panel_sizes[name]
+            x0, y0, x1, y1 = box
+            if x1 > width or y1 > height or x0 >= x1 or y0 >= y1:
+                raise ValueError(f"box {box} outside panel '{name}' ({width}x{height})")
+
+    def put(self, overlay: Overlay) -> None:
+        self.check(overlay.panel, overlay.box)
+        with self._lock:
+            key = (overlay.panel, overlay.key)
+            previous = self._overlays.pop(key, None)
+            if previous is None and len(self._overlays) >= self.max_overlays:
+                raise ValueError(f"too many overlays (max {self.max_overlays})")
+            if previous is not None:
+                self._damage_locked(previous)
+            self._sequence += 1
+            overlay.sequence = self._sequence
+            self._overlays[key] = overlay
+            self._damage_locked(overlay)
+        self._wake()
+
+    def remove(self, key: str, panel: str = "") -> bool:
+        with self._lock:
+            overlay = self._overlays.pop((panel, key), None)
+            if overlay is not None:
+                self._damage_locked(overlay)
+        if overlay is not None:
+            self._wake()
+        return overlay is not None
+
+    def _expire_locked(self) -> None:
+        now = self.clock()
+        for key, overlay in list(self._overlays.items()):
+            if overlay.expires is not None and overlay.expires <= now:
+                del self._overlays[key]
+                self._damage_locked(overlay)
+
+    def pending(self) -> bool:
+        """True when any panel has overlay changes (including expiries) to show."""
+
+        with self._lock:
+            self._expire_locked()
+            return any(self._damage.values())
+
+    def next_expiry(self) -> Optional[float]:
+        """Seconds until the next overlay expires, or ``None``."""
+
+        with self._lock:
+            deadlines = [overlay.expires for overlay in self._overlays.values() if overlay.expires is not None]
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - self.clock())
+
+    def compose(self, panel: str, image: Image.Image, layout, state) -> List[Box]:
+        """Render ``layout`` into ``image`` with this panel's overlays on top.
+
+        Returns the dirty boxes. Widgets under a damaged box are redrawn; widget
+        changes hidden under an opaque overlay are not reported as dirty.
+        """
+
+        with self._lock:
+            self._expire_locked()
+            damaged = self._damage[panel]
+            self._damage[panel] = []
+            active = sorted(
+                (overlay for overlay in self._overlays.values() if overlay.panel in ("", panel)),
+                key=lambda overlay: (overlay.priority, overlay.sequence),
+            )
+
+        for box in damaged:
+            image.paste(255, box)
+            layout.invalidate(box)
+        dirty = layout.render(image, state)
+        if not dirty and not damaged:
+            return []
+
+        for overlay in active:
+            if not any(_overlaps(overlay.box, box) for box in dirty + damaged):
+                continue
+            if overlay.transparent:
+                image.paste(0, overlay.box, overlay.image)
+            else:
+                image.paste(overlay.image, overlay.box[:2])
+
+        opaque = [overlay.box for overlay in active if not overlay.transparent]
+        visible = [box for box in dirty if not any(_covers(cover, box) for cover in opaque)]
+        return visible + damaged
+
+    def close(self) -> None:
+        os.close(self.wake_fd)
+        os.close(self._wake_w)
+
+
+def _attach_shared_memory(name: str):
+    from multiprocessing import shared_memory
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no ``track``
+        block = shared_memory.SharedMemory(name=name)
+        # Otherwise the resource tracker unlinks the client's block when we exit.
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(block._name, "shared_memory")
+        return block
+
+
+def _recv_into(connection: socket.socket, buffer) -> bool:
+    view = memoryview(buffer)
+    while view:
+        received = connection.recv_into(view)
+        if not received:
+            return False
+        view = view[received:]
+    return True
+
+
+class InjectionServer:
+    """Accepts overlay requests on a Unix socket in a daemon thread."""
+
+    def __init__(self, path: str, store: OverlayStore, mode: int = 0o660):
+        self.path = path
+        self.store = store
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            os.unlink(path)  # left over from an unclean exit
+        except FileNotFoundError:
+            pass
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(path)
+        os.chmod(path, mode)
+        self._socket.listen(4)
+        self._thread = threading.Thread(target=self._serve, name="injection-server", daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return  # closed
+            threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _handle(self, connection: socket.socket) -> None:
+        header = bytearray(HEADER.size)
+        with connection:
+            connection.settimeout(10)
+            try:
+                while _recv_into(connection, header):
+                    try:
+                        self._request(connection, header)
+                        reply = b"OK\n"
+                    except ProtocolError as exc:
+                        connection.sendall(f"ERR {exc}\n".encode("utf-8"))
+                        return  # out of sync with the client
+                    except (ValueError, OSError) as exc:
+                        reply = f"ERR {exc}\n".encode("utf-8")
+                    connection.sendall(reply)
+            except OSError:
+                pass
+
+    def _request(self, connection: socket.socket, header: bytearray) -> None:
+        magic, version, op, flags, priority, x, y, width, height, ttl_ms, key, panel, shm = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ProtocolError("bad header")
+        key, panel, shm = _text(key), _text(panel), _text(shm)
+
+        if op == REMOVE:
+            if not self.store.remove(key, panel):
+                raise ValueError(f"no overlay '{key}'")
+            return
+        if op != PUT:
+            raise ValueError(f"unknown op {op}")
+
+        box = (x, y, x + width, y + height)
+        try:
+            # Before anything is allocated for the payload: the header alone
+            # could otherwise claim a 65535x65535 image.
+            self.store.check(panel, box)
+        except ValueError as exc:
+            if shm:
+                raise
+            raise ProtocolError(exc) from None  # the unread payload follows
+
+        size = packed_stride(width) * height
+        # "1" yields the paste mask for transparent overlays, "1;I" the picture.
+        rawmode = "1" if flags & TRANSPARENT else "1;I"
+        if shm:
+            block = _attach_shared_memory(shm)
+            try:
+                if block.size < size:
+                    raise ValueError(f"shared memory '{shm}' holds {block.size} bytes, need {size}")
+                # Unpacked straight from the client's block; no intermediate bytes.
+                view = block.buf[:size]
+                picture = Image.frombuffer("1", (width, height), view, "raw", rawmode, 0, 1)
+                picture.load()
+                view.release()
+            finally:
+                block.close()
+        else:
+            payload = bytearray(size)
+            if not _recv_into(connection, payload):
+                raise OSError("connection closed mid-payload")
+            picture = Image.frombuffer("1", (width, height), payload, "raw", rawmode, 0, 1)
+
+        expires = self.store.clock() + ttl_ms / 1000 if ttl_ms else None
+        self.store.put(
+            Overlay(key, panel, box, priority, picture, bool(flags & TRANSPARENT), expires)
+        )
+
+    def close(self) -> None:
+        self._socket.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+def start_injection_server(settings: dict, panel_sizes: Dict[str, Tuple[int, int]], clock=time.monotonic):
+    """Start the overlay socket and return ``(store, server)``."""
+
+    options = {**DEFAULT_INJECTION, **(settings or {})}
+    store = OverlayStore(panel_sizes, clock, int(options["max_overlays"]))
+    server = InjectionServer(options["socket"], store, int(options["mode"]))
+    print(f"[INFO] Overlay injection listening on {options['socket']}")
+    return store, server
+
+
+def send_overlay(
+    path: str,
+    key: str,
+    image: Optional[Image.Image] = None,
+    position: Tuple[int, int] = (0, 0),
+    priority: int = 0,
+    ttl: float = 0,
+    panel: str = "",
+    transparent: bool = False,
+    shm: Optional[str] = None,
+    size: Optional[Tuple[int, int]] = None,
+    remove: bool = False,
+) -> None:
+    """Client helper: put (or ``remove``) overlay ``key`` on a running PaperDash.
+
+    Pass ``image`` to send the pixels over the socket, or ``shm`` and ``size``
+    when they are already packed into a shared memory block. Names longer
+    than their header field raise ``ValueError`` instead of being truncated.
+    """
+
+    names = []
+    for field, value, limit in (("key", key, 16), ("panel", panel, 16), ("shm", shm or "", 32)):
+        encoded = value.encode("utf-8")
+        if len(encoded) > limit:
+            raise ValueError(f"{field} '{value}' is longer than {limit} bytes")
+        names.append(encoded)
+
+    width, height = image.size if image is not None else (size or (0, 0))
+    flags = TRANSPARENT if transparent else 0
+    header = HEADER.pack(
+        MAGIC, VERSION, REMOVE if remove else PUT, flags, priority, position[0], position[1],
+        width, height, int(ttl * 1000), *names,
+    )
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+        connection.sendall(header)
+        if not remove and shm is None:
+            connection.sendall(pack_image(image))
+        reply = connection.makefile("rb").readline().decode("utf-8").strip()
+    if reply != "OK":
+        raise RuntimeError(reply or "connection closed")
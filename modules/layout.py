@@ -0,0 +1,339 @@
+"""Declarative layouts compiled once into fixed widget geometry.
+
+A layout is a list of widget specs, for example::
+
+    {"type": "text", "text": "{now:%H:%M}", "font": "large",
+     "box": [0, 60, 0, 50], "align": "center"}
+
+``box`` is ``[x, y, width, height]`` in pixels. Negative ``x``/``y`` count
+from the right/bottom edge, a width or height of zero or less extends to the
+edge minus that amount, and any value may be a percentage string such as
+``"50%"``. Boxes are resolved against the panel size once, so every widget
+knows its exact clip rect and only widgets whose content changed are redrawn.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageDraw
+
+Box = Tuple[int, int, int, int]
+
+_UNSET = object()
+
+DASHBOARD_LAYOUT = [
+    {
+        "type": "text",
+        "text": "Paper Dash - {ip} - {system_usage_text}",
+        "font": "small",
+        "box": [0, 20, 0, 28],
+        "align": "center",
+    },
+    {
+        "type": "text",
+        "text": "{now:%Y/%m/%d %H:%M}",
+        "font": "large",
+        "box": [0, 60, 0, 50],
+        "align": "center",
+    },
+    {
+        "type": "text",
+        "text": "{weather_text}",
+        "font": "medium",
+        "box": [0, 120, "50%", 40],
+        "align": "center",
+    },
+    {
+        "type": "image",
+        "source": "weather_image",
+        "box": [0, 160, "50%", -10],
+        "align": "center",
+        "valign": "bottom",
+    },
+    {
+        "type": "schedule",
+        "source": "schedule",
+        "font": "medium",
+        "box": ["50%", -370, -6, -10],
+        "row_height": 72,
+        "icon_size": [64, 64],
+        "icon_gap": 4,
+    },
+]
+
+BUILTIN_LAYOUTS = {
+    "dashboard": DASHBOARD_LAYOUT,
+}
+
+
+def _resolve(value, extent: int) -> int:
+    if isinstance(value, str) and value.endswith("%"):
+        return int(extent * float(value[:-1]) / 100)
+    return int(value)
+
+
+def resolve_box(spec: Sequence, size: Tuple[int, int]) -> Box:
+    """Turn a ``[x, y, width, height]`` spec into absolute ``(x0, y0, x1, y1)``."""
+
+    width, height = size
+    x, y, w, h = (_resolve(value, extent) for value, extent in zip(spec, (width, height, width, height)))
+    x0 = x if x >= 0 else width + x
+    y0 = y if y >= 0 else height + y
+    x1 = x0 + w if w > 0 else width + w
+    y1 = y0 + h if h > 0 else height + h
+    x0, x1 = max(0, min(x0, width)), max(0, min(x1, width))
+    y0, y1 = max(0, min(y0, height)), max(0, min(y1, height))
+    if x1 <= x0 or y1 <= y0:
+        raise ValueError(f"Layout box {list(spec)} is empty on a {width}x{height} panel")
+    return x0, y0, x1, y1
+
+
+def _aligned(available: int, used: int, mode: str) -> int:
+    if mode in ("center", "middle"):
+        return max(0, (available - used) // 2)
+    if mode in ("right", "bottom"):
+        return max(0, available - used)
+    return 0
+
+
+class Widget(ABC):
+    """A widget with a fixed clip rect and its own 1-bit canvas."""
+
+    def __init__(self, spec: dict, box: Box):
+        self.spec = spec
+        self.box = box
+        self.size = (box[2] - box[0], box[3] - box[1])
+        self.canvas = Image.new('1', self.size, 255)
+        self.draw = ImageDraw.Draw(self.canvas)
+        self.align = spec.get("align", "left")
+        self.valign = spec.get("valign", "top")
+        self._key = _UNSET
+
+    @abstractmethod
+    def content_key(self, state):
+        """Return a value that changes whenever the widget must be redrawn."""
+
+    def unchanged(self, key) -> bool:
+        return self._key is not _UNSET and key == self._key
+
+    @abstractmethod
+    def paint(self, key) -> None:
+        """Draw ``key`` onto the cleared widget canvas."""
+
+    def render(self, image: Image.Image, state, force: bool = False) -> Optional[Box]:
+        """Redraw into ``image`` if the content changed; return the dirty box."""
+
+        key = self.content_key(state)
+        if not force and self.unchanged(key):
+            return None
+        self.draw.rectangle((0, 0, self.size[0], self.size[1]), fill=255)
+        self.paint(key)
+        image.paste(self.canvas, self.box[:2])
+        self._key = key
+        return self.box
+
+
+class TextWidget(Widget):
+    def __init__(self, spec, box, font):
+        super().__init__(spec, box)
+        self.template = spec["text"]
+        self.font = font
+
+    def content_key(self, state):
+        return self.template.format(**vars(state))
+
+    def paint(self, text) -> None:
+        text_w, text_h = self.draw.textsize(text, font=self.font)
+        x = _aligned(self.size[0], text_w, self.align)
+        y = _aligned(self.size[1], text_h, self.valign)
+        self.draw.text((x, y), text, font=self.font, fill=0)
+
+
+class ImageWidget(Widget):
+    def __init__(self, spec, box):
+        super().__init__(spec, box)
+        self.source = spec["source"]
+
+    def content_key(self, state):
+        return getattr(state, self.source, None)
+
+    def paint(self, picture) -> None:
+        if picture is None:
+            return
+        x = _aligned(self.size[0], picture.size[0], self.align)
+        y = _aligned(self.size[1], picture.size[1], self.valign)
+        self.canvas.paste(picture, (x, y))
+
+    def unchanged(self, key) -> bool:
+        # Images are compared by identity; cached icons are shared objects.
+        return key is self._key
+
+
+class ScheduleWidget(Widget):
+    """Rows of ``(day, time, icon[, flag])`` text right-aligned against their icon.
+
+    A ``"next"`` flag draws the row's text inverted, ``"today"`` underlines it.
+    """
+
+    def __init__(self, spec, box, font, icon_loader):
+        super().__init__(spec, box)
+        self.source = spec.get("source", "schedule")
+        self.font = font
+        self.icon_loader = icon_loader
+        self.row_height = int(spec.get("row_height", 72))
+        self.icon_size = tuple(spec.get("icon_size", (64, 64)))
+        self.icon_gap = int(spec.get("icon_gap", 4))
+
+    def content_key(self, state):
+        return tuple(getattr(state, self.source, ()) or ())
+
+    def paint(self, rows) -> None:
+        width, height = self.size
+        icon_w, icon_h = self.icon_size
+        icon_x = width - icon_w
+        y_pos = max(0, height - self.row_height * len(rows))
+
+        for row in rows:
+            day, pickup_time, icon_name = row[:3]
+            flag = row[3] if len(row) > 3 else ""
+            text = f"{day}  {pickup_time}"
+            text_w, text_h = self.draw.textsize(text, font=self.font)
+            text_x = max(0, icon_x - self.icon_gap - text_w)
+            text_y = y_pos + (self.row_height - text_h) // 2
+            icon_y = y_pos + (self.row_height - icon_h) // 2
+
+            if flag == "next":
+                self.draw.rectangle(
+                    (text_x - 4, text_y - 2, text_x + text_w + 3, text_y + text_h + 3), fill=0
+                )
+                self.draw.text((text_x, text_y), text, font=self.font, fill=255)
+            else:
+                self.draw.text((text_x, text_y), text, font=self.font, fill=0)
+                if flag == "today":
+                    underline_y = text_y + text_h + 2
+                    self.draw.line((text_x, underline_y, text_x + text_w - 1, underline_y), fill=0, width=2)
+
+            icon_image = self.icon_loader(icon_name)
+            if icon_image:
+                self.canvas.paste(icon_image, (icon_x, icon_y))
+            else:
+                self.draw.rectangle(
+                    (icon_x, icon_y, icon_x + icon_w - 1, icon_y + icon_h - 1),
+                    outline=0,
+                    fill=255,
+                )
+
+            y_pos += self.row_height
+
+
+class GraphWidget(Widget):
+    """1-bit line graph of a stats history metric on a fixed 0-100 % scale."""
+
+    def __init__(self, spec, box):
+        super().__init__(spec, box)
+        self.source = spec.get("source", "stats_history")
+        self.metric = spec.get("metric", "cpu")
+        self.resolution = int(spec.get("resolution", 60))
+        self.border = bool(spec.get("border", True))
+
+    def content_key(self, state):
+        history = getattr(state, self.source, None)
+        if history is None:
+            return None
+        tier = history.tier_for(self.resolution)
+        # The tier version changes only when a bucket closes.
+        return tier.version, tier
+
+    def paint(self, key) -> None:
+        width, height = self.size
+        if self.border:
+            self.draw.rectangle((0, 0, width - 1, height - 1), outline=0)
+        if key is None:
+            return
+
+        inner_w, inner_h = width - 2, height - 2
+        values = key[1].tail(self.metric, inner_w)
+        if not values:
+            return
+        x0 = 1 + inner_w - len(values)
+        # NaN marks buckets without samples; the line breaks there.
+        runs = [[]]
+        for index, value in enumerate(values):
+            if value != value:
+                runs.append([])
+                continue
+            runs[-1].append((x0 + index, 1 + round((inner_h - 1) * (1 - max(0.0, min(value, 100.0)) / 100))))
+        for points in runs:
+            if len(points) == 1:
+                self.draw.point(points, fill=0)
+            elif points:
+                self.draw.line(points, fill=0)
+
+
+class CompiledLayout:
+    """Widgets with precomputed geometry for one panel size."""
+
+    def __init__(self, widgets: List[Widget], size: Tuple[int, int]):
+        self.widgets = widgets
+        self.size = size
+
+    def render(self, image: Image.Image, state, force: bool = False) -> List[Box]:
+        """Redraw changed widgets into ``image`` and return their dirty boxes."""
+
+        dirty = []
+        for widget in self.widgets:
+            box = widget.render(image, state, force)
+            if box is not None:
+                dirty.append(box)
+        return dirty
+
+    def invalidate(self, box: Box) -> None:
+        """Make widgets overlapping ``box`` redraw on the next ``render``."""
+
+        for widget in self.widgets:
+            x0, y0, x1, y1 = widget.box
+            if x0 < box[2] and box[0] < x1 and y0 < box[3] and box[1] < y1:
+                widget._key = _UNSET
+
+
+def compile_layout(
+    spec: Sequence[dict],
+    size: Tuple[int, int],
+    load_font: Callable,
+    icon_loader: Callable,
+) -> CompiledLayout:
+    """Resolve every widget's box and font once for a panel of ``size``.
+
+    ``load_font`` maps a font name or point size to a PIL font and
+    ``icon_loader`` maps a schedule icon name to a 1-bit image (or ``None``).
+    """
+
+    widgets: List[Widget] = []
+    for widget_spec in spec:
+        box = resolve_box(widget_spec["box"], size)
+        kind = widget_spec.get("type", "text")
+        if kind == "text":
+            widgets.append(TextWidget(widget_spec, box, load_font(widget_spec.get("font", "small"))))
+        elif kind == "image":
+            widgets.append(ImageWidget(widget_spec, box))
+        elif kind == "schedule":
+            font = load_font(widget_spec.get("font", "medium"))
+            widgets.append(ScheduleWidget(widget_spec, box, font, icon_loader))
+        elif kind == "graph":
+            widgets.append(GraphWidget(widget_spec, box))
+        else:
+            raise ValueError(f"Unknown widget type '{kind}'")
+    return CompiledLayout(widgets, size)
+
+
+def get_layout_spec(name, custom: Optional[Dict[str, list]] = None) -> list:
+    """Return a layout by name from config "layouts" or the built-ins."""
+
+    if isinstance(name, list):
+        return name
+    layouts = {**BUILTIN_LAYOUTS, **(custom or {})}
+    if name not in layouts:
+        raise ValueError(f"Unknown layout '{name}'")
+    return layouts[name]
@@ -0,0 +1,76 @@
+"""Drawing surfaces for panels mounted in portrait or upside down."""
+
+from __future__ import annotations
+
+from typing import Iterable, Tuple, Union
+
+from PIL import Image
+
+from modules.layout import Box
+
+# Degrees the drawing is rotated counter-clockwise to land on the panel's
+# native landscape RAM; 90 matches what EPD.getbuffer does for portrait images.
+_TRANSPOSE = {
+    90: Image.ROTATE_90,
+    180: Image.ROTATE_180,
+    270: Image.ROTATE_270,
+}
+
+_NAMES = {"landscape": 0, "portrait": 90, "landscape_flipped": 180, "portrait_flipped": 270}
+
+
+def parse_rotation(value: Union[int, str, None]) -> int:
+    """Accept 0/90/180/270 or a name such as ``"portrait"``."""
+
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        if value not in _NAMES:
+            raise ValueError(f"Unknown orientation '{value}' (expected one of {', '.join(_NAMES)})")
+        return _NAMES[value]
+    rotation = int(value) % 360
+    if rotation not in (0, 90, 180, 270):
+        raise ValueError(f"Orientation must be a multiple of 90 degrees, got {value}")
+    return rotation
+
+
+class OrientedCanvas:
+    """A layout-facing image mirrored into the panel's native landscape image.
+
+    Layouts draw on ``image`` at the mounted orientation (480x800 for a
+    portrait panel). ``sync`` rotates only the dirty boxes into ``native``,
+    which is what gets packed, so a portrait frame costs the same as a
+    landscape one instead of resampling the whole screen every minute.
+    """
+
+    def __init__(self, native_size: Tuple[int, int], rotation: int = 0):
+        self.rotation = rotation
+        native_width, native_height = native_size
+        if rotation in (90, 270):
+            self.size = (native_height, native_width)
+        else:
+            self.size = (native_width, native_height)
+        self.image = Image.new('1', self.size, 255)
+        # Without rotation the layout draws straight into the packed image.
+        self.native = Image.new('1', native_size, 255) if rotation else self.image
+
+    def native_box(self, box: Box) -> Box:
+        """Map a box on ``image`` to the matching box on ``native``."""
+
+        x0, y0, x1, y1 = box
+        width, height = self.size
+        if self.rotation == 90:
+            return (y0, width - x1, y1, width - x0)
+        if self.rotation == 180:
+            return (width - x1, height - y1, width - x0, height - y0)
+        if self.rotation == 270:
+            return (height - y1, x0, height - y0, x1)
+        return box
+
+    def sync(self, boxes: Iterable[Box]) -> None:
+        if not self.rotation:
+            return
+        method = _TRANSPOSE[self.rotation]
+        for box in boxes:
+            region = self.image.crop(box).transpose(method)
+            self.native.paste(region, self.native_box(box)[:2])
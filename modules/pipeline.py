@@ -0,0 +1,93 @@
+"""Double-buffered presentation so composing a frame overlaps the panel refresh."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, List, Optional
+
+
+class FramePipeline:
+    """Two packed framebuffers handed between the composer and a presenter thread.
+
+    One buffer is held by the presenter: it is being refreshed or is the frame
+    last shown on the panel. The other is the back buffer the composer encodes
+    into. ``submit`` returns immediately; if a frame is still waiting when the
+    next one is acquired, the waiting frame is taken back and overwritten, so
+    the panel always catches up to the newest content when BUSY releases.
+    """
+
+    def __init__(
+        self,
+        frame_size: int,
+        present: Callable[[bytearray, Any], None],
+        name: str = "panel",
+    ):
+        self._present = present
+        self._buffers: List[bytearray] = [bytearray(frame_size), bytearray(frame_size)]
+        self._held: Optional[bytearray] = None
+        self._pending: Optional[bytearray] = None
+        self._context: Any = None
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=f"present-{name}", daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self) -> bool:
+        with self._cond:
+            return self._busy or self._pending is not None
+
+    def acquire(self) -> bytearray:
+        """Return the back buffer to encode the next frame into."""
+
+        with self._cond:
+            if self._pending is not None:
+                # Coalesce: the waiting frame is superseded by the new one.
+                back, self._pending = self._pending, None
+                return back
+            for buffer in self._buffers:
+                if buffer is not self._held:
+                    return buffer
+        raise RuntimeError("no free framebuffer")
+
+    def submit(self, buffer: bytearray, context: Any = None) -> None:
+        """Queue ``buffer`` for presentation; ``context`` is passed to the presenter."""
+
+        with self._cond:
+            self._pending = buffer
+            self._context = context
+            self._cond.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._busy and self._pending is None, timeout
+            )
+
+    def close(self) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: not self._busy and self._pending is None)
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or self._closed)
+                if self._closed:
+                    return
+                buffer, self._pending = self._pending, None
+                context, self._context = self._context, None
+                self._held = buffer
+                self._busy = True
+
+            try:
+                self._present(buffer, context)
+            except Exception as exc:
+                print(f"[WARN] Presenting frame failed: {exc}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
@@ -0,0 +1,97 @@
+"""Deep-sleep the e-Paper controller between refreshes and wake it just in time."""
+
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+DEFAULT_POWER = {
+    # Extra seconds added to the measured wake latency before a deadline.
+    "wake_margin": 0.5,
+    # Rough panel power draw in mW used for the per-cycle energy estimate.
+    # Refresh and deep-sleep figures follow the Waveshare 7.5" V2 datasheet;
+    # the powered-idle figure varies per unit and should be measured.
+    "refresh_mw": 26.4,
+    "idle_mw": 5.0,
+    "sleep_mw": 0.017,
+}
+
+
+class DeepSleepController:
+    """Put the panel into deep sleep (0x07/0xA5) after each refresh.
+
+    ``wake`` reinitialises partial mode with ``init_part`` and reloads the last
+    frame into the controller, whose RAM is lost in deep sleep. The measured
+    wake latency feeds ``wake_lead`` so callers can wake ahead of a deadline.
+    """
+
+    def __init__(self, epd, settings: Optional[dict] = None):
+        options = {**DEFAULT_POWER, **(settings or {})}
+        self.epd = epd
+        self.wake_margin = float(options["wake_margin"])
+        self.refresh_mw = float(options["refresh_mw"])
+        self.idle_mw = float(options["idle_mw"])
+        self.sleep_mw = float(options["sleep_mw"])
+
+        self.asleep = False
+        self.wake_latency: Optional[float] = None
+        self._slept_at: Optional[float] = None
+        self._woke_at: Optional[float] = None
+        self._sleep_seconds = 0.0
+        self._refresh_seconds = 0.0
+
+    @property
+    def wake_lead(self) -> float:
+        """Seconds before a deadline at which ``wake`` should be called."""
+
+        latency = self.wake_latency if self.wake_latency is not None else 1.0
+        return latency + self.wake_margin
+
+    def sleep(self) -> None:
+        if self.asleep:
+            return
+        self.epd.deep_sleep()
+        self.asleep = True
+        self._slept_at = time.monotonic()
+        self._report()
+
+    def wake(self, frame: Optional[bytes]) -> None:
+        if not self.asleep:
+            return
+        started = time.monotonic()
+        if self._slept_at is not None:
+            self._sleep_seconds = started - self._slept_at
+
+        self.epd.init_part()
+        if frame is not None:
+            self.epd.restore_frame(frame)
+
+        finished = time.monotonic()
+        latency = finished - started
+        if self.wake_latency is None:
+            self.wake_latency = latency
+        else:
+            self.wake_latency = 0.8 * self.wake_latency + 0.2 * latency
+        self.asleep = False
+        self._woke_at = started
+        self._refresh_seconds = 0.0
+
+    def add_refresh(self, seconds: float) -> None:
+        """Account refresh time spent while awake in the current cycle."""
+
+        self._refresh_seconds += seconds
+
+    def _report(self) -> None:
+        if self._woke_at is None:
+            return
+        awake = max(0.0, self._slept_at - self._woke_at)
+        idle = max(0.0, awake - self._refresh_seconds)
+        energy_mj = (
+            self._refresh_seconds * self.refresh_mw
+            + idle * self.idle_mw
+            + self._sleep_seconds * self.sleep_mw
+        )
+        print(
+            f"[INFO] Power cycle: wake {self.wake_latency:.2f}s (lead {self.wake_lead:.2f}s), "
+            f"awake {awake:.1f}s, slept {self._sleep_seconds:.0f}s, ~{energy_mj:.1f} mJ"
+        )
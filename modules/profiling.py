@@ -0,0 +1,186 @@
+"""Opt-in cProfile and tracemalloc instrumentation for the refresh loop."""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import os
+import shutil
+import threading
+import tracemalloc
+from datetime import datetime
+from typing import Dict, Optional
+
+STAGES = ("cycle", "fetch", "render", "getbuffer", "present")
+
+DEFAULT_PROFILE = {
+    "cycles": 60,  # refresh cycles per profiling run
+    "stages": ["cycle"],
+    "snapshot_interval": 10,  # cycles between tracemalloc snapshots (0 disables)
+    "traceback_frames": 10,
+    "top": 25,  # allocation sites per diff report
+    "directory": "cache/profile",
+    "keep": 5,  # profiling runs kept on disk
+}
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off; every hook is a no-op."""
+
+    enabled = False
+
+    def stage(self, name: str):
+        return _NULL_CONTEXT
+
+    def end_cycle(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class Profiler:
+    """Profiles ``cycles`` refresh cycles, then writes reports and switches off.
+
+    Each selected stage gets its own ``cProfile.Profile`` that is enabled only
+    inside ``stage(name)`` blocks, so a report for ``getbuffer`` contains just
+    the packing work. A selected stage nested in another one on the same
+    thread pauses the outer profile, so ``cycle`` only covers what is not
+    reported by a nested stage. ``present`` runs on the pipeline's presenter
+    thread and is never part of ``cycle``. Every ``snapshot_interval`` cycles a
+    tracemalloc snapshot is diffed against the previous and the first one,
+    which makes steady per-cycle growth stand out.
+    """
+
+    enabled = True
+
+    def __init__(self, settings: Optional[dict] = None):
+        options = {**DEFAULT_PROFILE, **(settings or {})}
+        self.cycles = max(1, int(options["cycles"]))
+        stages = options["stages"]
+        self.stages = set(STAGES if stages == "all" else stages)
+        unknown = self.stages - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown profiling stages: {', '.join(sorted(unknown))}")
+        self.snapshot_interval = int(options["snapshot_interval"])
+        self.top = int(options["top"])
+        self.keep = max(1, int(options["keep"]))
+        self.directory = options["directory"]
+        self.run_directory = os.path.join(
+            self.directory, datetime.now().strftime("run-%Y%m%d-%H%M%S")
+        )
+        os.makedirs(self.run_directory, exist_ok=True)
+        self._prune()
+
+        self._profiles: Dict[str, cProfile.Profile] = {name: cProfile.Profile() for name in self.stages}
+        self._active = set()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cycle = 0
+        self._first = None
+        self._previous = None
+        if self.snapshot_interval > 0:
+            tracemalloc.start(int(options["traceback_frames"]))
+            self._first = self._previous = tracemalloc.take_snapshot()
+        print(f"[INFO] Profiling {self.cycles} cycles ({', '.join(sorted(self.stages))}) into {self.run_directory}")
+
+    def _claim(self, name: str) -> bool:
+        with self._lock:
+            # A profile can only be enabled once at a time (e.g. two panels
+            # rendering in parallel); the overlapping call goes unmeasured.
+            if name in self._active:
+                return False
+            self._active.add(name)
+        try:
+            self._profiles[name].enable()
+        except ValueError:
+            # Another profiler is already active on this interpreter.
+            with self._lock:
+                self._active.discard(name)
+            return False
+        return True
+
+    def _release(self, name: str) -> None:
+        self._profiles[name].disable()
+        with self._lock:
+            self._active.discard(name)
+
+    @contextlib.contextmanager
+    def _profiled(self, name: str):
+        # Only one profiler can run per thread, so a nested stage pauses the
+        # outer one: time spent in fetch/render/getbuffer lands in their own
+        # reports and is left out of "cycle" instead of being folded into it.
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        outer = stack[-1] if stack else None
+        if outer is not None:
+            self._release(outer)
+        stack.append(name if self._claim(name) else None)
+        try:
+            yield
+        finally:
+            if stack.pop() is not None:
+                self._release(name)
+            if outer is not None and not self._claim(outer):
+                # Could not resume the outer stage; stop recording it here.
+                stack[-1] = None
+
+    def stage(self, name: str):
+        if not self.enabled or name not in self.stages:
+            return _NULL_CONTEXT
+        return self._profiled(name)
+
+    def end_cycle(self) -> None:
+        if not self.enabled:
+            return
+        self._cycle += 1
+        if self.snapshot_interval > 0 and self._cycle % self.snapshot_interval == 0:
+            self._snapshot()
+        if self._cycle >= self.cycles:
+            self.close()
+
+    def _snapshot(self) -> None:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        path = os.path.join(self.run_directory, f"alloc-{self._cycle:05d}.txt")
+        with open(path, "w", encoding="utf-8") as report:
+            report.write(f"cycle {self._cycle}: traced {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n")
+            for title, baseline in (("since previous snapshot", self._previous), ("since start", self._first)):
+                report.write(f"\nTop {self.top} allocation changes {title}:\n")
+                for stat in snapshot.compare_to(baseline, "lineno")[:self.top]:
+                    report.write(f"{stat}\n")
+        self._previous = snapshot
+
+    def close(self) -> None:
+        """Write ``.prof`` files for every stage and stop profiling."""
+
+        if not self.enabled:
+            return
+        self.enabled = False
+        for name, profile in self._profiles.items():
+            profile.dump_stats(os.path.join(self.run_directory, f"{name}.prof"))
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._first = self._previous = None
+        print(f"[INFO] Profiling finished after {self._cycle} cycles; reports in {self.run_directory}")
+
+    def _prune(self) -> None:
+        runs = sorted(name for name in os.listdir(self.directory) if name.startswith("run-"))
+        for name in runs[:-self.keep]:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+
+def create_profiler(settings: Optional[dict]):
+    """Return a ``Profiler`` for the "profile" settings, or the no-op one."""
+
+    if settings is None:
+        return NULL_PROFILER
+    return Profiler(settings)
@@ -0,0 +1,191 @@
+"""Decide between partial, fast and full e-Paper refreshes to bound ghosting."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+PARTIAL = "partial"
+FAST = "fast"
+FULL = "full"
+
+DEFAULT_POLICY = {
+    # Number of horizontal bands the frame is split into for area accounting.
+    "regions": 8,
+    # Cumulative changed-area (in whole-region repaints) a band may accumulate
+    # through partial updates before it must be cleaned.
+    "region_budget": 6.0,
+    # Fraction of the budget after which cleanup happens opportunistically.
+    "soft_ratio": 0.5,
+    # Hard cap on consecutive partial updates regardless of area.
+    "max_partials": 240,
+    # Updates touching more than this fraction of the frame are cheaper to
+    # present with a fast refresh than to ghost with a partial one.
+    "large_change_ratio": 0.5,
+    # Local hours [start, end) considered quiet enough for a full refresh.
+    "quiet_hours": [2, 5],
+    # Seconds between scheduled updates, used to fit cleanups between ticks.
+    "tick_seconds": 60,
+}
+
+# Initial latency estimates in seconds; replaced by measurements over time.
+DEFAULT_LATENCY = {PARTIAL: 1.0, FAST: 2.0, FULL: 4.5}
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count("1")
+
+
+if hasattr(int, "bit_count"):  # Python 3.10+, without the bin() string
+    _popcount = int.bit_count
+
+
+class RefreshPolicy:
+    """Track ghosting debt per region and pick a refresh mode for each update.
+
+    Frames are the packed 1-bit buffers produced by ``EPD.getbuffer``. Each
+    partial update adds the fraction of every band that changed to that band's
+    debt; a fast or full refresh clears it. The last presented frame is kept
+    in a buffer allocated once, and unchanged bands are skipped with a
+    memoryview comparison, so a steady-state update copies no full frame.
+    """
+
+    def __init__(self, frame_size: int, row_bytes: int, settings: Optional[dict] = None):
+        options = {**DEFAULT_POLICY, **(settings or {})}
+        self.row_bytes = row_bytes
+        self.frame_size = frame_size
+        rows = frame_size // row_bytes
+        regions = max(1, min(int(options["regions"]), rows))
+        band_rows = -(-rows // regions)
+        self.bounds = [
+            (start * row_bytes, min(rows, start + band_rows) * row_bytes)
+            for start in range(0, rows, band_rows)
+        ]
+        self.region_budget = float(options["region_budget"])
+        self.soft_budget = self.region_budget * float(options["soft_ratio"])
+        self.max_partials = int(options["max_partials"])
+        self.large_change_ratio = float(options["large_change_ratio"])
+        self.quiet_hours = tuple(options["quiet_hours"])
+        self.tick_seconds = int(options["tick_seconds"])
+
+        self.debt: List[float] = [0.0] * len(self.bounds)
+        self.partial_count = 0
+        self.latency: Dict[str, float] = dict(DEFAULT_LATENCY)
+        self._previous = bytearray(frame_size)
+        self._previous_view = memoryview(self._previous)
+        self._has_previous = False
+        self._pending_changes: Optional[List[float]] = None
+        self._quiet_cleanup_day = None
+
+    @property
+    def displayed(self) -> Optional[bytearray]:
+        """The frame last presented on the panel (the policy's buffer; do not modify)."""
+
+        return self._previous if self._has_previous else None
+
+    @classmethod
+    def from_epd(cls, epd, settings: Optional[dict] = None) -> "RefreshPolicy":
+        row_bytes = (epd.width + 7) // 8
+        return cls(row_bytes * epd.height, row_bytes, settings)
+
+    def region_changes(self, frame: Sequence[int]) -> List[float]:
+        """Return the changed-pixel fraction of each band against the last frame."""
+
+        if not self._has_previous:
+            return [1.0] * len(self.bounds)
+
+        current = memoryview(frame)
+        previous = self._previous_view
+        changes = []
+        for start, end in self.bounds:
+            band, last = current[start:end], previous[start:end]
+            if band == last:
+                changes.append(0.0)
+                continue
+            # Only changed bands pay for the band-sized XOR.
+            diff = int.from_bytes(band, "big") ^ int.from_bytes(last, "big")
+            changes.append(_popcount(diff) / ((end - start) * 8))
+        return changes
+
+    def in_quiet_hours(self, now: datetime) -> bool:
+        start, end = self.quiet_hours
+        if start <= end:
+            return start <= now.hour < end
+        return now.hour >= start or now.hour < end
+
+    def _over_budget(self, extra: Sequence[float]) -> bool:
+        if self.partial_count + 1 >= self.max_partials:
+            return True
+        return any(debt + change >= self.region_budget for debt, change in zip(self.debt, extra))
+
+    def choose(self, frame: Sequence[int], now: datetime) -> str:
+        """Return the refresh mode to present ``frame`` with."""
+
+        changes = self.region_changes(frame)
+        self._pending_changes = changes
+        if not self._has_previous:
+            return FULL
+
+        changed_ratio = sum(
+            change * (end - start) for change, (start, end) in zip(changes, self.bounds)
+        ) / self.frame_size
+        if changed_ratio >= self.large_change_ratio:
+            return FAST
+
+        if self._over_budget(changes):
+            return FULL if self.in_quiet_hours(now) else FAST
+
+        return PARTIAL
+
+    def idle_action(self, now: datetime) -> Optional[str]:
+        """Return a cleanup refresh to run now between ticks, if one is worthwhile."""
+
+        if not self._has_previous or self.partial_count == 0:
+            return None
+
+        seconds_left = self.tick_seconds - (now.second % self.tick_seconds)
+        if self.in_quiet_hours(now):
+            # One full refresh per night wipes accumulated ghosting completely.
+            if self._quiet_cleanup_day != now.date() and seconds_left > self.latency[FULL] + 1:
+                return FULL
+            return None
+
+        if max(self.debt) >= self.soft_budget and seconds_left > self.latency[FAST] + 1:
+            return FAST
+        return None
+
+    def seed(self, frame: Sequence[int]) -> None:
+        """Treat ``frame`` as what the panel currently shows without resetting debt."""
+
+        self._store(frame)
+        self._pending_changes = None
+
+    def _store(self, frame: Sequence[int]) -> None:
+        if frame is not self._previous:
+            self._previous[:] = frame
+        self._has_previous = True
+
+    def record(
+        self,
+        mode: str,
+        frame: Sequence[int],
+        duration: Optional[float] = None,
+        now: Optional[datetime] = None,
+    ) -> None:
+        """Account for a refresh that has been presented on the panel."""
+
+        if mode == PARTIAL:
+            changes = self._pending_changes or self.region_changes(frame)
+            self.debt = [debt + change for debt, change in zip(self.debt, changes)]
+            self.partial_count += 1
+        else:
+            self.debt = [0.0] * len(self.bounds)
+            self.partial_count = 0
+            if mode == FULL and now is not None and self.in_quiet_hours(now):
+                self._quiet_cleanup_day = now.date()
+
+        if duration is not None:
+            self.latency[mode] = 0.8 * self.latency[mode] + 0.2 * duration
+
+        self._store(frame)
+        self._pending_changes = None
@@ -0,0 +1,154 @@
+"""Per-host circuit breakers with exponential backoff for upstream fetches."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_RESILIENCE = {
+    "failure_threshold": 1,  # consecutive failures before the breaker opens
+    "base_delay": 30.0,  # seconds open after the first trip
+    "max_delay": 1800.0,
+    "jitter": 0.2,  # +/- fraction applied to every delay
+    "timeout": 5.0,
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a request while the host's breaker is open."""
+
+
+class CircuitBreaker:
+    """Tracks consecutive failures for one upstream host.
+
+    After ``failure_threshold`` failures the breaker opens and rejects calls
+    for a backoff delay that doubles with every further failure. When the
+    delay expires a single caller is let through as a half-open probe; its
+    outcome either closes the breaker or reopens it with a longer delay.
+    """
+
+    def __init__(self, host: str, settings: Optional[dict] = None):
+        self.host = host
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.retry_at = 0.0
+        self.configure(settings)
+
+    def configure(self, settings: Optional[dict] = None) -> None:
+        options = {**DEFAULT_RESILIENCE, **(settings or {})}
+        self.failure_threshold = max(1, int(options["failure_threshold"]))
+        self.base_delay = float(options["base_delay"])
+        self.max_delay = float(options["max_delay"])
+        self.jitter = float(options["jitter"])
+        self.timeout = float(options["timeout"])
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        now = _clock() if now is None else now
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and now >= self.retry_at:
+                self.state = HALF_OPEN
+                return True
+            return False  # open, or a half-open probe is already in flight
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"[INFO] {self.host} reachable again, closing circuit")
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self, now: Optional[float] = None) -> None:
+        now = _clock() if now is None else now
+        with self._lock:
+            self.failures += 1
+            if self.state != HALF_OPEN and self.failures < self.failure_threshold:
+                return
+            trips = self.failures - self.failure_threshold
+            # Jitter before the cap, so max_delay is a hard ceiling.
+            delay = self.base_delay * (2 ** trips) * (1 + random.uniform(-self.jitter, self.jitter))
+            delay = min(self.max_delay, delay)
+            self.state = OPEN
+            self.retry_at = now + delay
+            print(f"[WARN] {self.host} unavailable, retrying in {delay:.0f}s")
+
+
+def _requests_get_json(url: str, **kwargs):
+    # Imported on first use so startup does not pay for loading requests.
+    import requests
+
+    response = requests.get(url, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_transport: Callable[..., Any] = _requests_get_json
+_clock: Callable[[], float] = time.monotonic
+_SETTINGS: Optional[dict] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def configure(settings: Optional[dict]) -> None:
+    """Apply the "resilience" config block to every current and future breaker."""
+
+    global _SETTINGS
+    with _REGISTRY_LOCK:
+        _SETTINGS = dict(settings) if settings else None
+        for breaker in _BREAKERS.values():
+            breaker.configure(_SETTINGS)
+
+
+def set_transport(
+    transport: Optional[Callable[..., Any]],
+    clock: Optional[Callable[[], float]] = None,
+) -> None:
+    """Replace the HTTP GET used by ``fetch_json``, e.g. with recorded fixtures.
+
+    ``transport(url, **kwargs)`` returns the decoded JSON or raises; ``clock``
+    returns seconds for the backoff timers. ``None`` restores the defaults
+    (requests and ``time.monotonic``).
+    """
+
+    global _transport, _clock
+    _transport = transport or _requests_get_json
+    _clock = clock or time.monotonic
+
+
+def breaker_for(url: str) -> CircuitBreaker:
+    host = urlsplit(url).hostname or url
+    with _REGISTRY_LOCK:
+        breaker = _BREAKERS.get(host)
+        if breaker is None:
+            breaker = _BREAKERS[host] = CircuitBreaker(host, _SETTINGS)
+        return breaker
+
+
+def fetch_json(url: str, **kwargs):
+    """GET ``url`` and decode JSON through the host's circuit breaker.
+
+    Raises ``CircuitOpenError`` immediately while the breaker is open, so
+    callers fall back to their last-known-good value without waiting on a
+    timeout. Any request or decoding error counts as a failure.
+    """
+
+    breaker = breaker_for(url)
+    if not breaker.allow():
+        raise CircuitOpenError(breaker.host)
+    kwargs.setdefault("timeout", breaker.timeout)
+    try:
+        data = _transport(url, **kwargs)
+    except Exception:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    return data
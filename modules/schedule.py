@@ -0,0 +1,342 @@
+"""Weekly pickup schedule loaded from the config or a local ICS file."""
+
+from __future__ import annotations
+
+import os
+from bisect import bisect_right
+from calendar import monthrange
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+
+DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# RRULE BYDAY codes in weekday() order.
+_ICS_DAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+# Row flags understood by ScheduleWidget.
+NEXT = "next"
+TODAY = "today"
+
+
+class ScheduleEntry(NamedTuple):
+    weekday: int  # 0 = Monday, as datetime.weekday()
+    minute: int  # minutes after midnight
+    icon: str
+    label: str = ""
+
+    @property
+    def key(self) -> int:
+        return self.weekday * MINUTES_PER_DAY + self.minute
+
+    @property
+    def day(self) -> str:
+        return DAYS[self.weekday]
+
+    @property
+    def time(self) -> str:
+        return f"{self.minute // 60:02d}:{self.minute % 60:02d}"
+
+
+def week_key(moment: datetime) -> int:
+    """Minutes since Monday 00:00 of ``moment``'s week."""
+
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+def parse_weekday(value) -> int:
+    if isinstance(value, int):
+        if not 0 <= value < 7:
+            raise ValueError(f"Weekday must be 0-6, got {value}")
+        return value
+    name = str(value).strip().lower()
+    for index, day in enumerate(DAYS):
+        if len(name) >= 2 and day.lower().startswith(name):
+            return index
+    raise ValueError(f"Unknown weekday '{value}'")
+
+
+def parse_entry(item) -> ScheduleEntry:
+    """Accept ``[day, "HH:MM", icon]`` or ``{"day", "time", "icon", "label"}``."""
+
+    if isinstance(item, dict):
+        day, clock, icon, label = item["day"], item["time"], item.get("icon", ""), item.get("label", "")
+    else:
+        day, clock, icon = item[:3]
+        label = item[3] if len(item) > 3 else ""
+    hours, minutes = (int(part) for part in str(clock).split(":"))
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"Invalid time '{clock}'")
+    return ScheduleEntry(parse_weekday(day), hours * 60 + minutes, icon, label)
+
+
+def _unfold(text: str) -> Iterable[str]:
+    """Yield logical ICS content lines (RFC 5545 folds continuation lines)."""
+
+    line = None
+    for raw in text.splitlines():
+        if raw[:1] in (" ", "\t") and line is not None:
+            line += raw[1:]
+            continue
+        if line is not None:
+            yield line
+        line = raw
+    if line is not None:
+        yield line
+
+
+def _parse_ics_time(value: str, params: dict) -> datetime:
+    """Return a naive local datetime for an ICS DATE or DATE-TIME value."""
+
+    if len(value) == 8:
+        return datetime.strptime(value, "%Y%m%d")
+    moment = datetime.strptime(value.rstrip("Z")[:15], "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        return moment.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    tzid = params.get("TZID")
+    if tzid and ZoneInfo is not None:
+        try:
+            return moment.replace(tzinfo=ZoneInfo(tzid)).astimezone().replace(tzinfo=None)
+        except Exception:
+            pass
+    return moment
+
+
+def _ics_events(text: str) -> Iterable[dict]:
+    event = None
+    for line in _unfold(text):
+        if line == "BEGIN:VEVENT":
+            event = {}
+            continue
+        if line == "END:VEVENT":
+            if event is not None:
+                yield event
+            event = None
+            continue
+        if event is None or ":" not in line:
+            continue
+        head, value = line.split(":", 1)
+        name, *raw_params = head.split(";")
+        params = dict(param.split("=", 1) for param in raw_params if "=" in param)
+        if name == "EXDATE":
+            event.setdefault(name, []).extend((part, params) for part in value.split(","))
+        else:
+            event[name] = (value, params)
+
+
+# RRULE parts load_ics understands, per frequency; rules using anything else
+# are skipped with a warning rather than shown on the wrong dates.
+_RRULE_PARTS = {
+    "DAILY": {"BYDAY"},
+    "WEEKLY": {"BYDAY", "WKST"},
+    "MONTHLY": {"BYMONTHDAY"},
+    "YEARLY": set(),
+}
+
+
+def _monday(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _rule_matches(rule: dict, start: date, day: date) -> bool:
+    """True when ``day`` is an occurrence of ``rule`` (ignoring COUNT/UNTIL)."""
+
+    if day < start:
+        return False
+    frequency = rule["FREQ"]
+    interval = max(1, int(rule.get("INTERVAL", 1)))
+    # Strip ordinal prefixes such as "1MO", which only matter monthly.
+    weekdays = {_ICS_DAYS.index(code[-2:]) for code in rule["BYDAY"].split(",")} if "BYDAY" in rule else None
+    if frequency == "DAILY":
+        return (day - start).days % interval == 0 and (weekdays is None or day.weekday() in weekdays)
+    if frequency == "WEEKLY":
+        weeks = (_monday(day) - _monday(start)).days // 7
+        return weeks % interval == 0 and day.weekday() in (weekdays or {start.weekday()})
+    if frequency == "MONTHLY":
+        months = (day.year - start.year) * 12 + day.month - start.month
+        if "BYMONTHDAY" not in rule:
+            return months % interval == 0 and day.day == start.day
+        # Negative days count back from the end of the month (-1 = last day).
+        length = monthrange(day.year, day.month)[1]
+        days = {value if value > 0 else length + value + 1 for value in map(int, rule["BYMONTHDAY"].split(","))}
+        return months % interval == 0 and day.day in days
+    return (day.year - start.year) % interval == 0 and (day.month, day.day) == (start.month, start.day)
+
+
+def _rule_dates(rule: dict, start: date, week_start: date, week_end: date) -> List[date]:
+    until = _parse_ics_time(rule["UNTIL"], {}).date() if "UNTIL" in rule else None
+    week = [week_start + timedelta(days=offset) for offset in range((week_end - week_start).days)]
+    if "COUNT" not in rule:
+        return [day for day in week if (until is None or day <= until) and _rule_matches(rule, start, day)]
+
+    # COUNT limits the whole series, so count the occurrences before this week.
+    remaining = int(rule["COUNT"])
+    day = start
+    while remaining > 0 and day < week_start:
+        if until is not None and day > until:
+            return []
+        if _rule_matches(rule, start, day):
+            remaining -= 1
+        day += timedelta(days=1)
+    dates = []
+    for day in week:
+        if remaining <= 0 or (until is not None and day > until):
+            break
+        if _rule_matches(rule, start, day):
+            dates.append(day)
+            remaining -= 1
+    return dates
+
+
+def load_ics(path: str, week_start: date) -> List[ScheduleEntry]:
+    """Entries of ``path`` that fall in the week starting on ``week_start``.
+
+    Daily, weekly, monthly (by day of month) and yearly ``RRULE``s with
+    ``INTERVAL``, ``COUNT``, ``UNTIL`` and ``EXDATE`` are supported, as are
+    one-off events; events with other recurrence rules are skipped with a
+    warning. The icon comes from ``X-PAPERDASH-ICON``, else the first
+    ``CATEGORIES`` value, else the lowercased ``SUMMARY``.
+    """
+
+    with open(path, "r", encoding="utf-8") as ics_file:
+        text = ics_file.read()
+
+    week_end = week_start + timedelta(days=7)
+    entries = []
+    for event in _ics_events(text):
+        if "DTSTART" not in event:
+            continue
+        start = _parse_ics_time(*event["DTSTART"])
+        summary = event.get("SUMMARY", ("", {}))[0]
+        icon = (
+            event.get("X-PAPERDASH-ICON", ("", {}))[0]
+            or event.get("CATEGORIES", ("", {}))[0].split(",")[0]
+            or summary
+        ).strip().lower()
+        excluded = {_parse_ics_time(value, params).date() for value, params in event.get("EXDATE", ())}
+
+        rule = dict(part.split("=", 1) for part in event.get("RRULE", ("", {}))[0].split(";") if "=" in part)
+        if rule:
+            frequency = rule.get("FREQ")
+            extra = set(rule) - {"FREQ", "INTERVAL", "COUNT", "UNTIL"} - _RRULE_PARTS.get(frequency, set())
+            if frequency not in _RRULE_PARTS or extra:
+                unsupported = ", ".join(sorted(extra)) or f"FREQ={frequency}"
+                print(f"[WARN] Skipping '{summary}' in '{path}': unsupported RRULE ({unsupported})")
+                continue
+            dates = _rule_dates(rule, start.date(), week_start, week_end)
+        else:
+            dates = [start.date()] if week_start <= start.date() < week_end else []
+
+        for day in dates:
+            if day not in excluded:
+                entries.append(ScheduleEntry(day.weekday(), start.hour * 60 + start.minute, icon, summary))
+    return entries
+
+
+class ScheduleIndex:
+    """Entries sorted by minute of the week, searched with ``bisect``."""
+
+    def __init__(self, entries: Iterable[ScheduleEntry]):
+        self.entries = sorted(entries, key=lambda entry: entry.key)
+        self.keys = [entry.key for entry in self.entries]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def next_position(self, key: int) -> Optional[int]:
+        """Position of the first entry after ``key``, wrapping into next week."""
+
+        if not self.entries:
+            return None
+        return bisect_right(self.keys, key) % len(self.entries)
+
+    def current_position(self, key: int) -> Optional[int]:
+        """Position of the last entry at or before ``key``, wrapping into last week."""
+
+        if not self.entries:
+            return None
+        return (bisect_right(self.keys, key) - 1) % len(self.entries)
+
+
+class ScheduleProvider:
+    """Builds the ``schedule`` rows for ScheduleWidget.
+
+    ``settings`` is the "schedule" config value: a list of entries, or an
+    object with ``entries`` and/or ``ics`` (path to a local calendar file).
+    Without settings ``default`` is used.
+
+    ``rows(now)`` returns the same tuple until the day changes, the next entry
+    passes or the ICS file is modified, so the widget only redraws then.
+    """
+
+    def __init__(self, settings=None, default: Iterable = ()):
+        if settings is None:
+            settings = {"entries": list(default)}
+        elif not isinstance(settings, dict):
+            settings = {"entries": settings}
+        self._entries = [parse_entry(item) for item in settings.get("entries") or ()]
+        self.ics_path = settings.get("ics")
+        self.index = ScheduleIndex(self._entries)
+        self._week: Optional[date] = None
+        self._mtime: Optional[float] = None
+        self._version = None
+        self._rows: Tuple = ()
+        self.next_entry: Optional[ScheduleEntry] = None
+
+    def _source_mtime(self) -> Optional[float]:
+        if not self.ics_path:
+            return None
+        try:
+            return os.path.getmtime(self.ics_path)
+        except OSError:
+            return None
+
+    def _reload(self, week: date, mtime: Optional[float]) -> None:
+        entries = list(self._entries)
+        if self.ics_path:
+            try:
+                entries += load_ics(self.ics_path, week)
+            except Exception as exc:
+                print(f"[WARN] Failed to load schedule from '{self.ics_path}': {exc}")
+        self.index = ScheduleIndex(entries)
+        self._week = week
+        self._mtime = mtime
+
+    def current(self, now: datetime) -> Optional[ScheduleEntry]:
+        self.rows(now)
+        position = self.index.current_position(week_key(now))
+        return None if position is None else self.index.entries[position]
+
+    def rows(self, now: datetime) -> Tuple:
+        """``(day, time, icon, flag)`` rows, flagging today's and the next entry."""
+
+        week = now.date() - timedelta(days=now.weekday())
+        if self.ics_path:
+            # One-off ICS events depend on the week, so rebuild on a new week too.
+            mtime = self._source_mtime()
+            if mtime != self._mtime or week != self._week:
+                self._reload(week, mtime)
+
+        following = self.index.next_position(week_key(now))
+        version = (now.date(), following, self._mtime)
+        if version != self._version:
+            self._version = version
+            self.next_entry = None if following is None else self.index.entries[following]
+            weekday = now.weekday()
+            self._rows = tuple(
+                (
+                    entry.day,
+                    entry.time,
+                    entry.icon,
+                    NEXT if position == following else TODAY if entry.weekday == weekday else "",
+                )
+                for position, entry in enumerate(self.index.entries)
+            )
+        return self._rows
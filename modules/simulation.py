@@ -0,0 +1,136 @@
+"""Time-accelerated simulation of the main loop against a mocked panel."""
+
+from __future__ import annotations
+
+import json
+import os
+import resource
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import cycle
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+from modules.clock import SimulatedClock
+
+# Used when no fixture file is given or it has no "system" samples.
+DEFAULT_SYSTEM_SAMPLE = (12.0, 35.0, 48.0)
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or ``None`` off Linux."""
+
+    try:
+        with open("/proc/self/statm", "r") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class FixtureTransport:
+    """Serves recorded JSON responses per host, cycling through them in order.
+
+    Hosts without fixtures raise ``ConnectionError``, which exercises the
+    circuit breakers and last-known-good fallbacks.
+    """
+
+    def __init__(self, responses: dict):
+        self._responses = {host: cycle(entries) for host, entries in responses.items() if entries}
+        self.requests = 0
+
+    def __call__(self, url: str, **kwargs):
+        self.requests += 1
+        host = urlsplit(url).hostname
+        entries = self._responses.get(host)
+        if entries is None:
+            raise ConnectionError(f"No fixture for {host}")
+        return next(entries)
+
+
+class Simulation:
+    """Drives ``paperdash.main`` through ``hours`` of virtual time.
+
+    The fixture file is JSON with optional keys ``responses`` (host name to a
+    list of recorded API responses), ``system`` (a list of
+    ``[cpu, mem, drive]`` samples) and ``ip``. All files the loop would write
+    go to a temporary directory.
+    """
+
+    def __init__(self, hours: float, fixtures_path: Optional[str] = None, start: Optional[datetime] = None):
+        fixtures = {}
+        if fixtures_path:
+            with open(fixtures_path, "r", encoding="utf-8") as fixtures_file:
+                fixtures = json.load(fixtures_file)
+
+        start = start or datetime.now().replace(second=0, microsecond=0)
+        self.clock = SimulatedClock(start)
+        self.start = start
+        self.end = start + timedelta(hours=hours)
+        self.transport = FixtureTransport(fixtures.get("responses", {}))
+        self._system = cycle([tuple(sample) for sample in fixtures.get("system") or [DEFAULT_SYSTEM_SAMPLE]])
+        self._ip = fixtures.get("ip", "192.0.2.10")
+        self.workdir = tempfile.mkdtemp(prefix="paperdash-sim-")
+        self._started = time.perf_counter()
+        # RSS after the first loop iteration, once startup, the first full
+        # render and the font caches are done; growth is measured from here.
+        self._baseline_rss: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        return self.clock.now() < self.end
+
+    def checkpoint(self) -> None:
+        """Call at the end of every loop iteration."""
+
+        if self._baseline_rss is None:
+            self._baseline_rss = current_rss()
+
+    def system_usage(self) -> Tuple[float, float, float]:
+        return next(self._system)
+
+    def ip_address(self) -> str:
+        return self._ip
+
+    def prepare_config(self, config: dict) -> dict:
+        """Return ``config`` with every output path moved into the work directory."""
+
+        config = dict(config)
+        config["frame_cache_path"] = os.path.join(self.workdir, "last_frame.bin")
+        config["frame_server"] = None
+        config["injection"] = None
+        if config.get("frame_log") is not None:
+            config["frame_log"] = {**config["frame_log"], "directory": os.path.join(self.workdir, "frames")}
+        if config.get("stats_history") is not None:
+            config["stats_history"] = {
+                **config["stats_history"],
+                "path": os.path.join(self.workdir, "stats_history.bin"),
+            }
+        return config
+
+    def report(self, panels) -> None:
+        elapsed = time.perf_counter() - self._started
+        simulated = (self.clock.now() - self.start).total_seconds()
+        print(
+            f"[INFO] Simulated {simulated / 3600:.1f} h in {elapsed:.1f} s "
+            f"({simulated / max(elapsed, 1e-9):.0f}x), {self.transport.requests} upstream requests"
+        )
+        end_rss = current_rss()
+        if self._baseline_rss is not None and end_rss is not None:
+            mib = 1024 * 1024
+            print(
+                f"[INFO]   RSS {self._baseline_rss / mib:.1f} MiB after the first cycle, "
+                f"{end_rss / mib:.1f} MiB at the end ({(end_rss - self._baseline_rss) / mib:+.1f} MiB)"
+            )
+        else:
+            # ru_maxrss is in KiB on Linux; includes startup and imports.
+            peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            print(f"[INFO]   Peak RSS {peak_kib / 1024:.1f} MiB (whole process)")
+        for panel in panels:
+            backend = panel.epd.epdconfig
+            print(
+                f"[INFO]   {panel.name}: {getattr(backend, 'refreshes', 0)} frames, "
+                f"{getattr(backend, 'spi_bytes', 0) / 1024 / 1024:.1f} MiB over SPI, "
+                f"{getattr(backend, 'commands', 0)} commands"
+            )
+        print(f"[INFO] Simulation output kept in {self.workdir}")
@@ -0,0 +1,183 @@
+"""Fixed-size time-series store for CPU, memory and drive usage samples."""
+
+from __future__ import annotations
+
+import math
+import os
+import struct
+import time
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+METRICS = ("cpu", "mem", "drive")
+
+# (bucket seconds, number of buckets): 1 min for 24 h and 15 min for 30 days.
+DEFAULT_TIERS = ((60, 1440), (900, 2880))
+
+_MAGIC = b"PDSH"
+_FILE_HEADER = struct.Struct("<4sB")
+_TIER_HEADER = struct.Struct("<IIIIdfffI")
+
+
+class Tier:
+    """Ring buffers of bucket means at one resolution.
+
+    Samples are folded into a running sum for the current bucket; when a
+    sample lands in a later bucket the mean is appended, so every tier is kept
+    up to date incrementally without revisiting older samples. Buckets skipped
+    without samples (downtime, a stalled loop) are appended as NaN so the
+    ring stays aligned with wall-clock time.
+    """
+
+    def __init__(self, resolution: int, capacity: int):
+        self.resolution = int(resolution)
+        self.capacity = int(capacity)
+        self.values = {metric: array("f", bytes(4 * self.capacity)) for metric in METRICS}
+        self.head = 0  # next slot to write
+        self.count = 0
+        self.version = 0
+        self._bucket: Optional[int] = None
+        self._bucket_start = 0.0
+        self._sums = [0.0, 0.0, 0.0]
+        self._samples = 0
+
+    def add(self, timestamp: float, sample: Sequence[float]) -> bool:
+        """Fold ``sample`` in; return True when a finished bucket was appended."""
+
+        bucket = int(timestamp // self.resolution)
+        flushed = False
+        if self._bucket is not None and bucket != self._bucket and self._samples:
+            self._flush()
+            flushed = True
+        if self._bucket is not None and bucket > self._bucket + 1:
+            self._skip(bucket - self._bucket - 1)
+            flushed = True
+        if bucket != self._bucket:
+            self._bucket = bucket
+            self._bucket_start = bucket * self.resolution
+            self._sums = [0.0, 0.0, 0.0]
+            self._samples = 0
+        for index, value in enumerate(sample):
+            self._sums[index] += value
+        self._samples += 1
+        return flushed
+
+    def _flush(self) -> None:
+        for index, metric in enumerate(METRICS):
+            self.values[metric][self.head] = self._sums[index] / self._samples
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.version += 1
+
+    def _skip(self, buckets: int) -> None:
+        for _ in range(min(buckets, self.capacity)):
+            for metric in METRICS:
+                self.values[metric][self.head] = math.nan
+            self.head = (self.head + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+        self.version += 1
+
+    def series(self, metric: str) -> List[float]:
+        """Return finished bucket means for ``metric``, oldest first (NaN for gaps)."""
+
+        return self.tail(metric, self.count)
+
+    def tail(self, metric: str, count: int) -> List[float]:
+        """Return up to ``count`` most recent bucket means, oldest first."""
+
+        count = min(count, self.count)
+        values = self.values[metric]
+        start = (self.head - count) % self.capacity
+        if start + count <= self.capacity:
+            return values[start:start + count].tolist()
+        return values[start:].tolist() + values[:self.head].tolist()
+
+    def _pack(self) -> bytes:
+        header = _TIER_HEADER.pack(
+            self.resolution,
+            self.capacity,
+            self.head,
+            self.count,
+            self._bucket_start if self._bucket is not None else -1.0,
+            *self._sums,
+            self._samples,
+        )
+        return header + b"".join(self.values[metric].tobytes() for metric in METRICS)
+
+    def _unpack(self, data: memoryview, offset: int) -> int:
+        (resolution, capacity, head, count, bucket_start,
+         cpu, mem, drive, samples) = _TIER_HEADER.unpack_from(data, offset)
+        offset += _TIER_HEADER.size
+        size = 4 * capacity
+        if (resolution, capacity) == (self.resolution, self.capacity):
+            for metric in METRICS:
+                self.values[metric] = array("f", bytes(data[offset:offset + size]))
+                offset += size
+            self.head, self.count = head, count
+            if bucket_start >= 0:
+                self._bucket = int(bucket_start // resolution)
+                self._bucket_start = bucket_start
+                self._sums = [cpu, mem, drive]
+                self._samples = samples
+        else:
+            offset += 3 * size  # tier layout changed in config; start it fresh
+        return offset
+
+
+class StatsHistory:
+    """Multi-resolution history persisted as a small binary file."""
+
+    def __init__(self, path: Optional[str] = None, tiers: Sequence[Tuple[int, int]] = DEFAULT_TIERS):
+        self.path = path
+        # Finest first, so the last tier is the coarsest one that triggers saves.
+        self.tiers = [Tier(resolution, capacity) for resolution, capacity in sorted(tiers)]
+        self._dirty = False
+        if path:
+            self.load()
+
+    def add(self, sample: Sequence[float], timestamp: Optional[float] = None) -> None:
+        timestamp = time.time() if timestamp is None else timestamp
+        flushed = [tier.add(timestamp, sample) for tier in self.tiers]
+        self._dirty = True
+        # Persist whenever the coarsest tier closes a bucket.
+        if flushed[-1]:
+            self.save()
+
+    def tier_for(self, resolution: int) -> Tier:
+        for tier in self.tiers:
+            if tier.resolution == resolution:
+                return tier
+        raise KeyError(f"No tier with {resolution}s resolution")
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as history_file:
+                history_file.write(_FILE_HEADER.pack(_MAGIC, len(self.tiers)))
+                for tier in self.tiers:
+                    history_file.write(tier._pack())
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as exc:
+            print(f"[WARN] Failed to save stats history to '{self.path}': {exc}")
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "rb") as history_file:
+                data = memoryview(history_file.read())
+        except OSError:
+            return
+        try:
+            magic, tier_count = _FILE_HEADER.unpack_from(data)
+            if magic != _MAGIC:
+                return
+            offset = _FILE_HEADER.size
+            for tier in self.tiers[:tier_count]:
+                offset = tier._unpack(data, offset)
+        except (struct.error, ValueError) as exc:
+            print(f"[WARN] Ignoring unreadable stats history '{self.path}': {exc}")
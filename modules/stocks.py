@@ -1,6 +1,6 @@
 # modules/stocks.py
 
-import requests
+from modules.resilience import fetch_json
 
 _last_known = {}
 
@@ -10,9 +10,9 @@ HEADERS = {
 
 def get_stock_summary(symbol):
     try:
+        # Once Yahoo's circuit is open every symbol falls back immediately.
         url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval=1m&range=1d"
-        response = requests.get(url, headers=HEADERS, timeout=5)
-        result = response.json()
+        result = fetch_json(url, headers=HEADERS)
 
         if result["chart"]["error"] or not result["chart"]["result"]:
             raise Exception("Yahoo returned error or empty result")
@@ -1,12 +1,18 @@
 """Utilities for retrieving weather information and categorising icons."""
 
-import requests
+from modules.resilience import fetch_json
 
 LAT = 25.0585178
 LON = 121.6532539
 
+API_URL = "https://api.open-meteo.com/v1/forecast"
+TIMEZONE = "Asia/Taipei"
+
 FALLBACK_SUMMARY = "--°C | RH --%"
 
+# Last successful result per location name, served while the API is down.
+_last_known = {}
+
 WEATHER_TEXT_MAP = {
     0: "Clear",
     1: "Mostly clr",
@@ -40,33 +46,79 @@ WEATHER_CATEGORY_MAP = {
 }
 
 
-def get_weather_summary():
-    """Return a tuple with display text and icon category for the current weather."""
+def _parse_current(data):
+    """Return ``(text, category)``, or ``None`` when fields are missing.
+
+    Codes without an icon still produce the temperature text with category
+    ``"unknown"``; only an incomplete response counts as a failure.
+    """
+
+    current = data.get("current", {}) if isinstance(data, dict) else {}
+    temp = current.get("temperature_2m")
+    rh = current.get("relative_humidity_2m")
+    code = current.get("weathercode")
+
+    if temp is None or rh is None or code is None:
+        return None
+
+    summary = f"{temp:.1f}°C | RH {rh}%"
+    category = weather_code_to_category(code)
+    return summary, category
+
+
+def _location_name(location, index):
+    if isinstance(location, dict):
+        return location.get("name", f"location{index}")
+    return f"location{index}"
+
+
+def _coordinates(location):
+    if isinstance(location, dict):
+        return location["lat"], location["lon"]
+    return location[0], location[1]
+
+
+def get_weather_summaries(locations):
+    """Return ``{name: (display text, icon category)}`` for every location.
+
+    ``locations`` holds dicts with ``name``, ``lat`` and ``lon`` (or plain
+    ``(lat, lon)`` pairs). All of them are fetched with one Open-Meteo request
+    using comma-separated coordinate lists.
+    """
+
+    names = [_location_name(location, index) for index, location in enumerate(locations)]
+    results = {name: _last_known.get(name, (FALLBACK_SUMMARY, "unknown")) for name in names}
+    if not names:
+        return results
 
     try:
+        coordinates = [_coordinates(location) for location in locations]
         url = (
-            f"https://api.open-meteo.com/v1/forecast?"
-            f"latitude={LAT}&longitude={LON}"
+            f"{API_URL}?"
+            f"latitude={','.join(str(lat) for lat, _ in coordinates)}"
+            f"&longitude={','.join(str(lon) for _, lon in coordinates)}"
             f"&current=temperature_2m,relative_humidity_2m,weathercode"
-            f"&timezone=Asia/Taipei"
+            f"&timezone={TIMEZONE}"
         )
-        response = requests.get(url, timeout=5)
-        data = response.json()
+        data = fetch_json(url)
 
-        current = data.get("current", {})
-        temp = current.get("temperature_2m")
-        rh = current.get("relative_humidity_2m")
-        code = current.get("weathercode")
+        # A single location comes back as one object, several as a list.
+        entries = data if isinstance(data, list) else [data]
+        for name, entry in zip(names, entries):
+            summary = _parse_current(entry)
+            if summary is not None:
+                _last_known[name] = summary
+                results[name] = summary
+        return results
 
-        if temp is None or rh is None or code is None:
-            return FALLBACK_SUMMARY, "unknown"
+    except Exception:
+        return results
 
-        summary = f"{temp:.1f}°C | RH {rh}%"
-        category = weather_code_to_category(code)
-        return summary, category
 
-    except Exception:
-        return FALLBACK_SUMMARY, "unknown"
+def get_weather_summary():
+    """Return a tuple with display text and icon category for the current weather."""
+
+    return next(iter(get_weather_summaries([(LAT, LON)]).values()))
 
 
 def weather_code_to_text(code):
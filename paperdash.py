@@ -1,22 +1,45 @@
 # paperdash.py
 
+import argparse
+import os
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 
 sys.path.append('./epd')
+import epdconfig
 from epd7in5_V2 import EPD
 
-from modules.config import load_config
+from modules.clock import SystemClock
+from modules.config import ConfigWatcher, load_config
+from modules.frame_log import FrameLog
+from modules.frame_server import start_frame_server
+from modules.injection import start_injection_server
+from modules.fonts import FontCache
+from modules.frame_store import load_frame, save_frame
+from modules.layout import compile_layout, get_layout_spec
 from modules.network import get_ip_address
-from modules.weather import get_weather_summary
+from modules.orientation import OrientedCanvas, parse_rotation
+from modules.pipeline import FramePipeline
+from modules.power import DeepSleepController
+from modules.profiling import NULL_PROFILER, STAGES, create_profiler
+from modules.refresh_policy import FULL, PARTIAL, RefreshPolicy
+from modules.schedule import ScheduleProvider
+from modules.simulation import Simulation
+from modules import resilience
+from modules.weather import get_weather_summaries, get_weather_summary
+from modules.stats_history import DEFAULT_TIERS, StatsHistory
 from modules.system_stats import get_system_usage
 
-# Fixed pickup schedule for Monday through Friday with icon descriptors
+# Built-in pickup schedule for Monday through Friday, used when the config has
+# no "schedule" entries or ICS file.
 SCHEDULE = [
     ("Monday", "17:00", "rollerblade"),
     ("Tuesday", "17:00", "magic"),
@@ -34,10 +57,6 @@ ICON_FILES = {
 }
 
 ICON_SIZE = (64, 64)  # width, height in pixels for the schedule bitmaps
-ROW_HEIGHT = 72
-SCHEDULE_RIGHT_MARGIN = 6
-SCHEDULE_BOTTOM_MARGIN = 10
-ICON_TEXT_GAP = 4  # tightened spacing between the time text and icon
 
 
 _ICON_CACHE: Dict[str, Optional[Image.Image]] = {}
@@ -59,6 +78,21 @@ WEATHER_ICON_FILES = {
 
 _WEATHER_ICON_CACHE: Dict[str, Optional[Image.Image]] = {}
 
+# Config keys mapped to the collectors/widgets they affect, so a hot reload
+# only reschedules and redraws what actually depends on the changed value.
+CONFIG_DEPENDENCIES = {
+    "weather_update_interval": {"weather", "system"},
+    "locations": {"weather", "weather_fetch"},
+    "logo_path": {"logo"},
+    "resilience": {"resilience"},
+    "schedule": {"schedule"},
+}
+
+LOOP_INTERVAL = 10  # seconds between clock checks
+BUSY_POLL_INTERVAL = 0.02  # seconds between BUSY checks while a refresh runs
+
+FONT_SIZES = {"small": 18, "medium": 32, "large": 40}
+
 
 def load_icon(name: str) -> Optional[Image.Image]:
     path = ICON_FILES.get(name)
@@ -102,131 +136,480 @@ def load_weather_icon(category: str) -> Optional[Image.Image]:
 
     return _WEATHER_ICON_CACHE[path]
 
-def main():
-    config = load_config()
-    weather_interval = config["weather_update_interval"]
-    logo_path = config["logo_path"]
-
-    epd = EPD()
-    epd.init()
-    epd.Clear()
-    time.sleep(2)
-    epd.init_part()
-
-    width, height = epd.width, epd.height
-    PARTIAL_REGION = (0, 0, width, height)
-
-    image = Image.new('1', (width, height), 255)
-    draw = ImageDraw.Draw(image)
-
-    font_small  = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf', 18)
-    font_medium = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf', 32)
-    font_large  = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf', 40)
-
-    last_minute = ""
-    last_weather_update = ""
-    last_system_update = ""
-    weather_text = "--°C | RH --%"
-    system_usage_text = "CPU --% - MEM --% - DRIVE --%"
 
+def load_logo(path: str) -> Optional[Image.Image]:
     try:
-        logo = Image.open(logo_path)
+        logo = Image.open(path)
         if logo.mode != '1':
             logo = logo.convert('1')
+        return logo
     except Exception as e:
         print("[WARN] Failed to load logo:", e)
-        logo = None
+        return None
 
-    weather_image: Optional[Image.Image] = logo
 
-    try:
-        while True:
-            now_full = datetime.now()
-            now_str = now_full.strftime('%Y/%m/%d %H:%M')
-            current_minute = now_full.strftime('%Y%m%d%H%M')
-
-            if int(now_full.minute) % weather_interval == 0 and current_minute != last_weather_update:
-                weather_text, weather_category = get_weather_summary()
-                weather_candidate = load_weather_icon(weather_category)
-                weather_image = weather_candidate if weather_candidate else logo
-                last_weather_update = current_minute
-
-            if int(now_full.minute) % weather_interval == 0 and current_minute != last_system_update:
-                cpu_percent, memory_percent, drive_percent = get_system_usage()
-                system_usage_text = (
-                    f"CPU {cpu_percent:.0f}% - MEM {memory_percent:.0f}% - DRIVE {drive_percent:.0f}%"
-                )
-                last_system_update = current_minute
-
-            if current_minute != last_minute:
-                draw.rectangle(PARTIAL_REGION, fill=255)
-
-                ip = get_ip_address()
-                top_label = f"Paper Dash - {ip} - {system_usage_text}"
-
-                top_label_w, _ = draw.textsize(top_label, font=font_small)
-                time_w, time_h = draw.textsize(now_str, font=font_large)
-                weather_w, _  = draw.textsize(weather_text, font=font_medium)
-
-                # Top content
-                draw.text(((width - top_label_w) // 2, 20), top_label, font=font_small, fill=0)
-                time_x = (width - time_w) // 2
-                time_y = 60
-                draw.text((time_x, time_y), now_str, font=font_large, fill=0)
-                left_region_width = width // 2
-                weather_x = max(0, (left_region_width - weather_w) // 2)
-                draw.text((weather_x, 120), weather_text, font=font_medium, fill=0)
-
-                # Logo
-                if weather_image:
-                    weather_wi, weather_hi = weather_image.size
-                    left_region_width = width // 2
-                    weather_icon_x = max(0, (left_region_width - weather_wi) // 2)
-                    image.paste(weather_image, (weather_icon_x, height - weather_hi - 10))
-
-                # Schedule section
-                schedule_height = ROW_HEIGHT * len(SCHEDULE)
-                y_pos = height - schedule_height - SCHEDULE_BOTTOM_MARGIN
-                icon_x = width - ICON_SIZE[0] - SCHEDULE_RIGHT_MARGIN
-
-                for day, pickup_time, icon_name in SCHEDULE:
-                    text = f"{day}  {pickup_time}"
-                    text_w, text_h = draw.textsize(text, font=font_medium)
-                    text_x = max(10, icon_x - ICON_TEXT_GAP - text_w)
-                    text_y = y_pos + (ROW_HEIGHT - text_h) // 2
-                    icon_y = y_pos + (ROW_HEIGHT - ICON_SIZE[1]) // 2
-
-                    draw.text((text_x, text_y), text, font=font_medium, fill=0)
-
-                    icon_image = load_icon(icon_name)
-                    if icon_image:
-                        image.paste(icon_image, (icon_x, icon_y))
-                    else:
-                        draw.rectangle(
-                            (
-                                icon_x,
-                                icon_y,
-                                icon_x + ICON_SIZE[0],
-                                icon_y + ICON_SIZE[1],
-                            ),
-                            outline=0,
-                            fill=255,
-                        )
+def present_frame(epd, buffer, mode: str, region) -> float:
+    """Send ``buffer`` to the panel with the given refresh mode and return its duration."""
 
-                    y_pos += ROW_HEIGHT
+    started = time.monotonic()
+    if mode == PARTIAL:
+        handle = epd.display_Partial_async(buffer, *region)
+    else:
+        if mode == FULL:
+            epd.init()
+        else:
+            epd.init_fast()
+        handle = epd.display_async(buffer)
+    # Sleep between BUSY polls instead of spinning in ReadBusy(), so the
+    # collectors and other panels keep running during the waveform.
+    handle.wait(BUSY_POLL_INTERVAL)
+    if mode != PARTIAL:
+        epd.init_part()
+    return time.monotonic() - started
+
+
+def seconds_until_next_minute(now: datetime) -> float:
+    return 60 - now.second - now.microsecond / 1_000_000
+
+
+@dataclass
+class DashboardState:
+    """Data collected once per tick and shared by every panel's layout."""
+
+    now: datetime
+    ip: str = "No IP"
+    weather_text: str = "--°C | RH --%"
+    weather_category: str = "unknown"
+    weather_image: Optional[Image.Image] = None
+    # Display text per configured location name, e.g. "{weather_locations[office]}".
+    weather_locations: Dict[str, str] = field(default_factory=dict)
+    system_usage_text: str = "CPU --% - MEM --% - DRIVE --%"
+    schedule: tuple = tuple(SCHEDULE)
+    # "Tuesday 17:00" for the next schedule entry, e.g. "Next: {schedule_next}".
+    schedule_next: str = ""
+    stats_history: Optional[StatsHistory] = None
+
+
+def make_font_loader(settings=None):
+    """Return a loader mapping a font name from FONT_SIZES or a point size to a font."""
+
+    fonts = FontCache(settings)
+
+    def load_font(name):
+        return fonts.load(int(FONT_SIZES.get(name, name)))
+
+    return load_font
+
+
+def panel_frame_path(base: str, name: str) -> str:
+    if name == "default":
+        return base
+    root, ext = os.path.splitext(base)
+    return f"{root}-{name}{ext}"
+
+
+class Panel:
+    """One e-Paper display with its own driver, refresh policy and frame cache."""
+
+    # Replaced by main() when profiling is enabled.
+    profiler = NULL_PROFILER
+
+    def __init__(self, name: str, epd, config, layout: str = "dashboard", orientation=0):
+        self.name = name
+        self.epd = epd
+        self.width, self.height = epd.width, epd.height
+        self.region = (0, 0, self.width, self.height)
+        # Layouts target the mounted orientation (480x800 in portrait); dirty
+        # boxes are rotated into the native landscape image before packing.
+        self.canvas = OrientedCanvas((self.width, self.height), parse_rotation(orientation))
+        self.image = self.canvas.image
+        # Geometry is resolved once here; per frame only changed widgets redraw.
+        self.layout = compile_layout(
+            get_layout_spec(layout, config.get("layouts")),
+            self.canvas.size,
+            make_font_loader(config.get("fonts")),
+            load_icon,
+        )
+        self.frame_path = panel_frame_path(config["frame_cache_path"], name)
+        self.frame_log = None
+        if config.get("frame_log") is not None:
+            log_settings = dict(config["frame_log"])
+            if name != "default":
+                log_settings["directory"] = os.path.join(
+                    log_settings.get("directory", "cache/frames"), name
+                )
+            self.frame_log = FrameLog(self.width, self.height, log_settings)
+        self.policy = RefreshPolicy.from_epd(epd, config.get("refresh_policy"))
+        self.power = DeepSleepController(epd, config.get("power")) if config["deep_sleep"] else None
+        # Composition and encoding run on the caller's thread while the
+        # pipeline's presenter thread drives SPI and waits out ReadBusy().
+        self.pipeline = FramePipeline(self.policy.frame_size, self._present_submitted, name)
+        # Serialises all controller access between the loop and the presenter.
+        self._hw_lock = threading.Lock()
+        # Set when the HTTP frame server is enabled.
+        self.frame_store = None
+        # Set when overlay injection is enabled.
+        self.overlays = None
+
+    def start(self, warm_start: bool) -> None:
+        restored = load_frame(self.frame_path, self.width, self.height) if warm_start else None
+
+        if restored is None:
+            self.epd.init()
+            self.epd.Clear()
+            self.epd.epdconfig.delay_ms(2000)
+            self.epd.init_part()
+            # The panel is blank after Clear(); the packed buffer for white is all zero.
+            self.policy.record(FULL, bytes(self.policy.frame_size))
+        else:
+            # The glass still shows the last frame; tell the controller about it so
+            # the first update is an ordinary partial refresh of what changed.
+            print(f"[INFO] Warm start ({self.name}): restoring last displayed frame.")
+            self.epd.init_part()
+            self.epd.restore_frame(restored)
+            self.policy.seed(restored)
+
+    def _present(self, buffer, mode: Optional[str], now: datetime) -> None:
+        with self._hw_lock:
+            if mode is None:
+                mode = self.policy.choose(buffer, now)
+            if self.power:
+                self.power.wake(self.policy.displayed)
+            try:
+                duration = present_frame(self.epd, buffer, mode, self.region)
+            except Exception:
+                # The controller may be mid-sequence; re-run the full init next time.
+                self.epd.invalidate()
+                raise
+            self.policy.record(mode, buffer, duration, now)
+            if self.power:
+                self.power.add_refresh(duration)
+                self.power.sleep()
+
+    def _present_submitted(self, buffer: bytearray, now: datetime) -> None:
+        with self.profiler.stage("present"):
+            self._present(buffer, None, now)
+        save_frame(self.frame_path, buffer, self.width, self.height)
+        if self.frame_log is not None:
+            self.frame_log.append(buffer, now.timestamp())
+
+    def update(self, state: DashboardState) -> None:
+        """Compose and encode a new frame, then hand it to the presenter thread."""
+
+        with self.profiler.stage("render"):
+            if self.overlays is not None:
+                dirty = self.overlays.compose(self.name, self.image, self.layout, state)
+            else:
+                dirty = self.layout.render(self.image, state)
+        if not dirty:
+            return
+        self.canvas.sync(dirty)
+        back = self.pipeline.acquire()
+        with self.profiler.stage("getbuffer"):
+            self.epd.getbuffer(self.canvas.native, back)
+        if self.frame_store is not None:
+            self.frame_store.publish(self.name, self.image, back)
+        self.pipeline.submit(back, state.now)
+
+    def idle(self, now: datetime) -> None:
+        if self.pipeline.busy:
+            return
+        cleanup = self.policy.idle_action(now)
+        if cleanup:
+            print(f"[INFO] Running {cleanup} refresh on {self.name} to clear ghosting.")
+            self._present(self.policy.displayed, cleanup, now)
+
+    def wait_budget(self, now: datetime) -> float:
+        """Return how long the loop may sleep before this panel needs attention."""
+
+        until_tick = seconds_until_next_minute(now)
+        if self.power and self.power.asleep:
+            # Wake just ahead of the next minute tick, by the measured lead.
+            until_wake = until_tick - self.power.wake_lead
+            if until_wake > 0:
+                return until_wake
+            with self._hw_lock:
+                self.power.wake(self.policy.displayed)
+        return until_tick
+
+    def shutdown(self) -> None:
+        self.pipeline.close()
+        with self._hw_lock:
+            if self.power and self.power.asleep:
+                # Already in deep sleep; only release the SPI/GPIO module.
+                self.epd.epdconfig.module_exit()
+            else:
+                self.epd.sleep()
+        if self.frame_log is not None:
+            self.frame_log.close()
+
+
+def build_panels(config, backend_factory=None):
+    """Create panels from the optional "panels" list, or the single default one.
+
+    ``backend_factory`` replaces ``epdconfig.create`` for every panel, e.g.
+    with the simulated backend.
+    """
+
+    spi = config.get("spi") or {}
+    specs = config.get("panels")
+    if not specs:
+        epd = EPD(backend_factory()) if backend_factory else EPD()
+        epd.epdconfig.configure_spi(spi.get("speed_hz"), spi.get("chunk_size"))
+        return [Panel("default", epd, config, config.get("layout", "dashboard"), config.get("orientation"))]
+
+    panels = []
+    for index, spec in enumerate(specs):
+        spec = dict(spec)
+        name = spec.pop("name", f"panel{index}")
+        layout = spec.pop("layout", "dashboard")
+        orientation = spec.pop("orientation", config.get("orientation"))
+        if backend_factory:
+            epd = EPD(backend_factory(**spec))
+        elif spec:
+            epd = EPD(epdconfig.create(**spec))
+        else:
+            epd = EPD()
+        # Per-panel spi_speed_hz/spi_chunk_size win over the global "spi" block.
+        epd.epdconfig.configure_spi(
+            None if "spi_speed_hz" in spec else spi.get("speed_hz"),
+            None if "spi_chunk_size" in spec else spi.get("chunk_size"),
+        )
+        panels.append(Panel(name, epd, config, layout, orientation))
+    return panels
+
+
+def for_each_panel(executor, panels, method, *args) -> None:
+    """Call ``method`` on every panel, in parallel when there is more than one.
+
+    Each panel spends most of an update blocked on SPI and ReadBusy(), so
+    threads keep one slow waveform from stalling the other panels.
+    """
+
+    if executor is None:
+        for panel in panels:
+            getattr(panel, method)(*args)
+        return
+
+    futures = [executor.submit(getattr(panel, method), *args) for panel in panels]
+    for panel, future in zip(panels, futures):
+        try:
+            future.result()
+        except Exception as exc:
+            print(f"[WARN] Panel '{panel.name}' {method} failed: {exc}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Drive the PaperDash e-Paper dashboard.")
+    parser.add_argument(
+        "--profile",
+        type=int,
+        metavar="CYCLES",
+        help="Profile this many refresh cycles with cProfile and tracemalloc (overrides \"profile\" in config.json)",
+    )
+    parser.add_argument(
+        "--profile-stages",
+        nargs="+",
+        choices=STAGES + ("all",),
+        metavar="STAGE",
+        help=f"Stages to profile: {', '.join(STAGES)} or all (default: cycle)",
+    )
+    parser.add_argument(
+        "--simulate",
+        type=float,
+        metavar="HOURS",
+        help="Run this many hours of virtual time as fast as possible against a simulated panel",
+    )
+    parser.add_argument("--fixtures", help="JSON file of recorded API responses and system samples for --simulate")
+    parser.add_argument(
+        "--start",
+        type=datetime.fromisoformat,
+        help="Virtual start time for --simulate (default: the current minute)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = load_config()
+    simulation = None
+    clock = SystemClock()
+    collect_system = get_system_usage
+    collect_ip = get_ip_address
+    backend_factory = None
+    if args.simulate is not None:
+        simulation = Simulation(args.simulate, args.fixtures, args.start)
+        config = simulation.prepare_config(config)
+        clock = simulation.clock
+        collect_system = simulation.system_usage
+        collect_ip = simulation.ip_address
+        backend_factory = epdconfig.Simulated
+        resilience.set_transport(simulation.transport, clock.monotonic)
+    watcher = ConfigWatcher(config=config) if simulation is None else None
+    profile_settings = config.get("profile")
+    if args.profile is not None or args.profile_stages:
+        profile_settings = dict(profile_settings or {})
+        if args.profile is not None:
+            profile_settings["cycles"] = args.profile
+        if args.profile_stages:
+            profile_settings["stages"] = "all" if "all" in args.profile_stages else args.profile_stages
+    profiler = create_profiler(profile_settings)
+    Panel.profiler = profiler
+    weather_interval = config["weather_update_interval"]
+    locations = config.get("locations")
+    logo_path = config["logo_path"]
+    resilience.configure(config.get("resilience"))
+    schedule = ScheduleProvider(config.get("schedule"), SCHEDULE)
+
+    panels = build_panels(config, backend_factory)
+    if config.get("frame_server") is not None:
+        frame_store = start_frame_server(config["frame_server"], panels[0].name)
+        for panel in panels:
+            panel.frame_store = frame_store
+    overlays = injection_server = None
+    if config.get("injection") is not None:
+        overlays, injection_server = start_injection_server(
+            config["injection"], {panel.name: panel.canvas.size for panel in panels}, clock.monotonic
+        )
+        for panel in panels:
+            panel.overlays = overlays
+    executor = ThreadPoolExecutor(max_workers=len(panels)) if len(panels) > 1 else None
+    for_each_panel(executor, panels, "start", config["warm_start"])
 
-                epd.display_Partial(epd.getbuffer(image), *PARTIAL_REGION)
-                last_minute = current_minute
+    last_minute = ""
+    last_weather_update = ""
+    last_system_update = ""
+    # Set when the data to fetch changed, to fetch now instead of at the next interval.
+    weather_stale = False
+
+    logo = load_logo(logo_path)
+    state = DashboardState(now=clock.now(), weather_image=logo)
+    history_settings = config.get("stats_history")
+    if history_settings is not None:
+        state.stats_history = StatsHistory(
+            history_settings.get("path", "cache/stats_history.bin"),
+            history_settings.get("tiers", DEFAULT_TIERS),
+        )
 
-            time.sleep(10)
+    try:
+        while simulation is None or simulation.running:
+            refreshed = False
+            with profiler.stage("cycle"):
+                now_full = clock.now()
+                current_minute = now_full.strftime('%Y%m%d%H%M')
+
+                weather_due = int(now_full.minute) % weather_interval == 0 and current_minute != last_weather_update
+                if weather_due or weather_stale:
+                    with profiler.stage("fetch"):
+                        if locations:
+                            # One request covers every location; the first drives the main widgets.
+                            summaries = get_weather_summaries(locations)
+                            state.weather_locations = {name: text for name, (text, _) in summaries.items()}
+                            state.weather_text, state.weather_category = next(iter(summaries.values()))
+                        else:
+                            state.weather_text, state.weather_category = get_weather_summary()
+                    weather_candidate = load_weather_icon(state.weather_category)
+                    state.weather_image = weather_candidate if weather_candidate else logo
+                    last_weather_update = current_minute
+                    weather_stale = False
+
+                header_due = int(now_full.minute) % weather_interval == 0
+                # With a history configured, sample every minute to feed its finest tier.
+                history_due = state.stats_history is not None
+                if (header_due or history_due) and current_minute != last_system_update:
+                    cpu_percent, memory_percent, drive_percent = collect_system()
+                    if history_due:
+                        state.stats_history.add(
+                            (cpu_percent, memory_percent, drive_percent), now_full.timestamp()
+                        )
+                    if header_due:
+                        state.system_usage_text = (
+                            f"CPU {cpu_percent:.0f}% - MEM {memory_percent:.0f}% - DRIVE {drive_percent:.0f}%"
+                        )
+                    last_system_update = current_minute
+
+                if current_minute != last_minute:
+                    state.now = now_full
+                    state.ip = collect_ip()
+                    # The same tuple comes back until the day changes, an entry
+                    # passes or the ICS file changes, so the widget stays clean.
+                    state.schedule = schedule.rows(now_full)
+                    upcoming = schedule.next_entry
+                    state.schedule_next = f"{upcoming.day} {upcoming.time}" if upcoming else ""
+                    for_each_panel(executor, panels, "update", state)
+                    last_minute = current_minute
+                    refreshed = True
+                elif overlays is not None and overlays.pending():
+                    # Injected overlays (or their expiry) show without waiting for the minute tick.
+                    for_each_panel(executor, panels, "update", state)
+                else:
+                    for_each_panel(executor, panels, "idle", now_full)
+            if refreshed:
+                profiler.end_cycle()
+
+            now = clock.now()
+            timeout = min([LOOP_INTERVAL] + [panel.wait_budget(now) for panel in panels if panel.power])
+            expiry = overlays.next_expiry() if overlays is not None else None
+            if expiry is not None:
+                timeout = min(timeout, expiry)
+            if simulation is not None:
+                # Let the presenters finish first; otherwise virtual time races
+                # ahead of them and frames get coalesced.
+                for panel in panels:
+                    panel.pipeline.wait_idle()
+                simulation.checkpoint()
+                clock.sleep(max(0.05, timeout))
+                continue
+            changed = watcher.wait(max(0.05, timeout), overlays.wake_fd if overlays is not None else None)
+            if changed:
+                config = watcher.config
+                affected = set()
+                for key in changed:
+                    affected |= CONFIG_DEPENDENCIES.get(key, set())
+                print(f"[INFO] Config reloaded, changed: {', '.join(sorted(changed))}")
+                unapplied = sorted(key for key in changed if key not in CONFIG_DEPENDENCIES)
+                if unapplied:
+                    print(f"[WARN] Restart PaperDash to apply: {', '.join(unapplied)}")
+
+                if "weather" in affected:
+                    # The next fetch is derived from the interval on each tick,
+                    # so updating it is enough to reschedule the collectors.
+                    weather_interval = config["weather_update_interval"]
+                    locations = config.get("locations")
+                if "weather_fetch" in affected:
+                    weather_stale = True
+                if "resilience" in affected:
+                    resilience.configure(config.get("resilience"))
+                if "schedule" in affected:
+                    schedule = ScheduleProvider(config.get("schedule"), SCHEDULE)
+                if "logo" in affected:
+                    logo_path = config["logo_path"]
+                    logo = load_logo(logo_path)
+                    state.weather_image = load_weather_icon(state.weather_category) or logo
+
+                if affected:
+                    # Redraw on the next pass through the normal partial refresh
+                    # path; the panel itself is never re-initialised.
+                    last_minute = ""
 
     except KeyboardInterrupt:
         print("\n[INFO] Ctrl+C detected, exiting gracefully.")
 
     finally:
         print("[INFO] Shutting down e-Paper...")
-        epd.sleep()
+        if watcher is not None:
+            watcher.close()
+        if injection_server is not None:
+            injection_server.close()
+            overlays.close()
+        profiler.close()
+        if state.stats_history is not None:
+            state.stats_history.save()
+        for_each_panel(executor, panels, "shutdown")
+        if executor is not None:
+            executor.shutdown()
+        if simulation is not None:
+            simulation.report(panels)
 
 if __name__ == "__main__":
     main()
-
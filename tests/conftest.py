@@ -0,0 +1,10 @@
+"""Make the repository modules and the epd driver importable from the tests."""
+
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+for path in (ROOT / "epd", ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
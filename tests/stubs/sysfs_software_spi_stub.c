@@ -0,0 +1,49 @@
+/*
+ * Recording stand-in for Waveshare's sysfs_software_spi.so, used by
+ * tests/test_jetson_spi.py. It exports the vendor library's per-byte entry
+ * points (and no bulk one) and keeps every transferred byte in memory instead
+ * of toggling GPIOs.
+ *
+ *     gcc -shared -fPIC -O2 -o sysfs_software_spi.so sysfs_software_spi_stub.c
+ */
+
+#include <stdint.h>
+
+#define STUB_CAPACITY (1u << 20)
+
+static uint8_t recorded[STUB_CAPACITY];
+static uint32_t recorded_len;
+static uint32_t begun;
+
+void SYSFS_software_spi_begin(void)
+{
+    begun++;
+}
+
+void SYSFS_software_spi_end(void)
+{
+    begun--;
+}
+
+uint8_t SYSFS_software_spi_transfer(uint8_t value)
+{
+    if (recorded_len < STUB_CAPACITY) {
+        recorded[recorded_len++] = value;
+    }
+    return 0;
+}
+
+void stub_reset(void)
+{
+    recorded_len = 0;
+}
+
+uint32_t stub_length(void)
+{
+    return recorded_len;
+}
+
+const uint8_t *stub_data(void)
+{
+    return recorded;
+}
@@ -0,0 +1,47 @@
+"""Compiled bitmap fonts must lay out and render exactly like TrueType."""
+
+import warnings
+
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+from modules.fonts import BitmapFont, compile_bitmap_font, find_font
+
+TEXTS = ["2026/10/19 12:34", "Monday", "-3°C", "Sunny 21°", "gjy", "- -", "  ", "Tuesday  18:00"]
+
+
+@pytest.fixture(scope="module")
+def ttf_path():
+    try:
+        return find_font("DejaVuSansMono")
+    except FileNotFoundError:
+        pytest.skip("DejaVuSansMono is not installed")
+
+
+@pytest.mark.parametrize("size", [18, 32, 40])
+def test_bitmap_font_matches_truetype(ttf_path, tmp_path, size):
+    truetype = ImageFont.truetype(ttf_path, size)
+    bitmap = BitmapFont(compile_bitmap_font(ttf_path, size, str(tmp_path)))
+
+    for text in TEXTS:
+        assert bitmap.getbbox(text) == truetype.getbbox(text), text
+        assert bitmap.getlength(text) == truetype.getlength(text), text
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            # ImageDraw.textsize is what the widgets centre text with.
+            assert ImageDraw.Draw(Image.new("1", (1, 1))).textsize(text, font=bitmap) == truetype.getsize(text), text
+
+        images = []
+        for font in (truetype, bitmap):
+            image = Image.new("1", (size * len(text), size * 2), 255)
+            ImageDraw.Draw(image).text((3, 5), text, font=font, fill=0)
+            images.append(image)
+        assert images[0].tobytes() == images[1].tobytes(), text
+
+
+def test_cache_is_reused(ttf_path, tmp_path):
+    first = compile_bitmap_font(ttf_path, 18, str(tmp_path))
+    stamps = {path.name: path.stat().st_mtime_ns for path in tmp_path.iterdir()}
+    assert compile_bitmap_font(ttf_path, 18, str(tmp_path)) == first
+    assert {path.name: path.stat().st_mtime_ns for path in tmp_path.iterdir()} == stamps
+    assert sorted(stamps) == ["DejaVuSansMono-18-v2.json", "DejaVuSansMono-18-v2.pbm", "DejaVuSansMono-18-v2.pil"]
@@ -0,0 +1,52 @@
+"""frame_replay --at picks the right frame even when the clock stepped back."""
+
+import importlib.util
+import pathlib
+import sys
+from datetime import datetime
+
+import pytest
+from PIL import Image
+
+from modules.frame_log import FrameLog
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+WIDTH, HEIGHT = 16, 2
+
+
+@pytest.fixture
+def frame_replay():
+    spec = importlib.util.spec_from_file_location("frame_replay", ROOT / "tools" / "frame_replay.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _frame(value):
+    return bytes([value]) * ((WIDTH + 7) // 8 * HEIGHT)
+
+
+@pytest.mark.parametrize(
+    "at, expected",
+    [
+        (1_000_160, 0x03),  # after the step back, 150 is the latest at or before 160
+        (1_000_210, 0x02),
+        (1_000_140, 0x01),
+        (1_000_400, 0x04),
+    ],
+)
+def test_at_with_out_of_order_timestamps(frame_replay, tmp_path, monkeypatch, capsys, at, expected):
+    log = FrameLog(WIDTH, HEIGHT, {"directory": str(tmp_path / "frames")})
+    # The clock stepped back between the second and third frame.
+    for value, timestamp in ((0x01, 1_000_100), (0x02, 1_000_200), (0x03, 1_000_150), (0x04, 1_000_300)):
+        log.append(_frame(value), timestamp)
+    log.close()
+
+    output = tmp_path / "frame.png"
+    when = datetime.fromtimestamp(at).isoformat()
+    monkeypatch.setattr(sys, "argv", ["frame_replay.py", str(tmp_path / "frames"), "--at", when, "--output", str(output)])
+    frame_replay.main()
+
+    image = Image.open(output)
+    # PNG pixels: 0 = black; packed bits: 1 = black.
+    assert image.tobytes() == bytes(255 - expected for _ in range(len(_frame(0))))
@@ -0,0 +1,106 @@
+"""The GPIO character-device backend issues the uAPI v2 ioctls linux/gpio.h expects."""
+
+import fcntl
+import os
+import types
+
+import pytest
+
+import epdconfig
+
+
+class FakeChip:
+    """Stands in for ``fcntl.ioctl`` on a gpiochip and its line requests."""
+
+    def __init__(self):
+        self.requests = []  # (offsets, consumer, flags) per GET_LINE
+        self.levels = {}  # line request fd -> {offset: level}
+        self.writes = []  # (fd, bits, mask) per SET_VALUES
+        self._offsets = {}
+
+    def ioctl(self, fd, request, arg):
+        if request == epdconfig.GPIO_V2_GET_LINE_IOCTL:
+            offsets = list(arg.offsets[:arg.num_lines])
+            self.requests.append((offsets, arg.consumer, arg.config.flags))
+            arg.fd = os.open(os.devnull, os.O_RDONLY)
+            self._offsets[arg.fd] = offsets
+            self.levels[arg.fd] = dict.fromkeys(offsets, 0)
+        elif request == epdconfig.GPIO_V2_LINE_SET_VALUES_IOCTL:
+            self.writes.append((fd, arg.bits, arg.mask))
+            for index, offset in enumerate(self._offsets[fd]):
+                if arg.mask & (1 << index):
+                    self.levels[fd][offset] = 1 if arg.bits & (1 << index) else 0
+        elif request == epdconfig.GPIO_V2_LINE_GET_VALUES_IOCTL:
+            arg.bits = sum(
+                1 << index
+                for index, offset in enumerate(self._offsets[fd])
+                if arg.mask & (1 << index) and self.levels[fd][offset]
+            )
+        else:
+            raise AssertionError(f"unexpected ioctl {request:#x}")
+        return 0
+
+
+@pytest.fixture
+def chip(monkeypatch, tmp_path):
+    fake = FakeChip()
+    monkeypatch.setattr(fcntl, "ioctl", fake.ioctl)
+    path = tmp_path / "gpiochip0"
+    path.touch()
+    fake.path = str(path)
+    return fake
+
+
+def test_ioctl_numbers_match_linux_headers():
+    # _IOWR(0xB4, n, struct), sizes from linux/gpio.h.
+    assert epdconfig.GPIO_V2_GET_LINE_IOCTL == 0xC250B407
+    assert epdconfig.GPIO_V2_LINE_GET_VALUES_IOCTL == 0xC010B40E
+    assert epdconfig.GPIO_V2_LINE_SET_VALUES_IOCTL == 0xC010B40F
+
+
+def test_gpio_lines_request_and_values(chip):
+    lines = epdconfig.GpioLines(chip.path, [17, 25, 18], epdconfig.GPIO_V2_LINE_FLAG_OUTPUT)
+    try:
+        assert chip.requests == [([17, 25, 18], b"paperdash", epdconfig.GPIO_V2_LINE_FLAG_OUTPUT)]
+        assert lines.masks == {17: 0b001, 25: 0b010, 18: 0b100}
+
+        lines.write(25, 1)
+        assert chip.writes[-1] == (lines.fd, 0b010, 0b010)
+        lines.write(25, 0)
+        assert chip.writes[-1] == (lines.fd, 0, 0b010)
+
+        lines.write_many({17: 1, 18: 1, 25: 0})
+        assert chip.writes[-1] == (lines.fd, 0b101, 0b111)
+        assert [lines.read(offset) for offset in (17, 25, 18)] == [1, 0, 1]
+    finally:
+        lines.close()
+    assert lines.fd == -1
+
+
+def test_raspberry_pi_gpiochip_backend(chip, monkeypatch):
+    spi = types.SimpleNamespace(open=lambda bus, device: None, close=lambda: None)
+    monkeypatch.setitem(epdconfig.sys.modules, "spidev", types.SimpleNamespace(SpiDev=lambda: spi))
+
+    backend = epdconfig.RaspberryPiGpiochip(gpio_chip=chip.path, dc_pin=22, busy_pin=23)
+    outputs, inputs = chip.requests
+    assert outputs == ([17, 22, 18], b"paperdash", epdconfig.GPIO_V2_LINE_FLAG_OUTPUT)
+    assert inputs == (
+        [23],
+        b"paperdash",
+        epdconfig.GPIO_V2_LINE_FLAG_INPUT | epdconfig.GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN,
+    )
+
+    backend.digital_write(22, 1)
+    assert chip.writes[-1] == (backend.gpio_out.fd, 0b010, 0b010)
+    assert backend.digital_read(22) == 1
+    backend.digital_write(8, 1)  # CS belongs to spidev; no ioctl
+    assert len(chip.writes) == 1
+
+    assert backend.digital_read(23) == 0
+    chip.levels[backend.gpio_in.fd][23] = 1
+    assert backend.digital_read(23) == 1
+
+    out_fd = backend.gpio_out.fd
+    backend.module_exit(cleanup=True)
+    assert chip.writes[-1] == (out_fd, 0, 0b111)  # every output low in one ioctl
+    assert backend.gpio_out.fd == backend.gpio_in.fd == -1
@@ -0,0 +1,74 @@
+"""The overlay socket validates requests before reading their payload."""
+
+import socket
+
+import pytest
+from PIL import Image
+
+from modules.injection import HEADER, MAGIC, PUT, VERSION, InjectionServer, OverlayStore, send_overlay
+
+PANELS = {"main": (800, 480)}
+
+
+@pytest.fixture
+def server(tmp_path):
+    store = OverlayStore(PANELS)
+    server = InjectionServer(str(tmp_path / "overlay.sock"), store)
+    yield server
+    server.close()
+    store.close()
+
+
+def _header(width, height, x=0, y=0, key=b"alert", panel=b"", shm=b""):
+    return HEADER.pack(MAGIC, VERSION, PUT, 0, 0, x, y, width, height, 0, key, panel, shm)
+
+
+def _connect(server):
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(5)
+    connection.connect(server.path)
+    return connection
+
+
+def test_overlay_round_trip(server):
+    send_overlay(server.path, "alert", image=Image.new("1", (16, 8), 0), position=(8, 8), panel="main")
+    assert server.store.pending()
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        _header(65535, 65535),  # would be a 537 MB payload
+        _header(16, 16, x=792),  # past the right edge
+        _header(16, 16, panel=b"side"),  # unknown panel
+    ],
+)
+def test_out_of_range_socket_payload_drops_connection(server, header):
+    with _connect(server) as connection:
+        connection.sendall(header)
+        reply = connection.makefile("rb").readline()
+        assert reply.startswith(b"ERR ")
+        # The unread payload would desynchronise the stream, so the server hangs up.
+        assert connection.recv(1) == b""
+    assert not server.store.pending()
+
+
+def test_out_of_range_shared_memory_keeps_connection(server):
+    with _connect(server) as connection:
+        replies = connection.makefile("rb")
+        # Rejected before the (nonexistent) block is attached; no payload follows.
+        connection.sendall(_header(65535, 65535, shm=b"psm_missing"))
+        assert replies.readline().startswith(b"ERR box")
+        connection.sendall(_header(8, 8))
+        connection.sendall(bytes(8))
+        assert replies.readline() == b"OK\n"
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"key": "k" * 17}, {"key": "alert", "panel": "p" * 17}, {"key": "alert", "shm": "s" * 33, "size": (8, 8)}],
+)
+def test_send_overlay_rejects_long_names(server, options):
+    with pytest.raises(ValueError):
+        send_overlay(server.path, remove=True, **options)
+    assert not server.store.pending()
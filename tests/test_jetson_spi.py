@@ -0,0 +1,134 @@
+"""JetsonNano sends the same bytes through every software SPI path.
+
+The per-byte and bulk modes run against tests/stubs/sysfs_software_spi_stub.c,
+built with the system compiler; the Python fallback is decoded from the MOSI
+level at each SCLK rising edge.
+"""
+
+import ctypes
+import pathlib
+import shutil
+import subprocess
+import sys
+import types
+
+import pytest
+
+import epdconfig
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+STUB_SOURCE = ROOT / "tests" / "stubs" / "sysfs_software_spi_stub.c"
+BULK_SOURCE = ROOT / "epd" / "sysfs_software_spi_bulk.c"
+
+SINGLE = [0x12, 0x00, 0xFF, 0x80]
+PAYLOAD = bytes(range(256)) * 8
+
+
+class FakeGPIO(types.ModuleType):
+    """Jetson.GPIO stand-in that decodes bit-banged SPI from MOSI and SCLK."""
+
+    BCM = "BCM"
+    OUT = "OUT"
+    IN = "IN"
+
+    def __init__(self):
+        super().__init__("Jetson.GPIO")
+        self.levels = {}
+        self.received = bytearray()
+        self._byte = self._bits = 0
+
+    def setmode(self, mode):
+        pass
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, pin, direction, initial=0):
+        self.levels[pin] = initial
+
+    def cleanup(self, pins=None):
+        pass
+
+    def input(self, pin):
+        return 1
+
+    def output(self, pin, value):
+        rising = pin == epdconfig.JetsonNano.SCLK_PIN and value and not self.levels.get(pin)
+        self.levels[pin] = value
+        if rising:
+            self._byte = (self._byte << 1) | self.levels[epdconfig.JetsonNano.MOSI_PIN]
+            self._bits += 1
+            if self._bits == 8:
+                self.received.append(self._byte)
+                self._byte = self._bits = 0
+
+
+@pytest.fixture
+def gpio(monkeypatch):
+    fake = FakeGPIO()
+    package = types.ModuleType("Jetson")
+    package.GPIO = fake
+    monkeypatch.setitem(sys.modules, "Jetson", package)
+    monkeypatch.setitem(sys.modules, "Jetson.GPIO", fake)
+    return fake
+
+
+@pytest.fixture(scope="module")
+def libraries(tmp_path_factory):
+    compiler = shutil.which("gcc") or shutil.which("cc")
+    if compiler is None:
+        pytest.skip("no C compiler to build the SPI stub")
+    stub_dir = tmp_path_factory.mktemp("stub")
+    bulk_dir = tmp_path_factory.mktemp("bulk")
+    for source, target in (
+        (STUB_SOURCE, stub_dir / "sysfs_software_spi.so"),
+        (BULK_SOURCE, bulk_dir / "sysfs_software_spi_bulk.so"),
+    ):
+        subprocess.run([compiler, "-shared", "-fPIC", "-O2", "-o", str(target), str(source)], check=True)
+    return stub_dir, bulk_dir
+
+
+def _send(backend):
+    backend.module_init()
+    for value in SINGLE:
+        backend.spi_writebyte([value])
+    backend.spi_writebyte2(bytearray(PAYLOAD))  # zero-copy path
+    backend.spi_writebyte2(PAYLOAD)
+    backend.module_exit()
+
+
+def _recorded(backend):
+    stub = backend.SPI
+    stub.stub_data.restype = ctypes.POINTER(ctypes.c_uint8)
+    return ctypes.string_at(stub.stub_data(), stub.stub_length())
+
+
+EXPECTED = bytes(SINGLE) + PAYLOAD * 2
+
+
+def test_per_byte_library(gpio, libraries, monkeypatch):
+    stub_dir, _ = libraries
+    monkeypatch.setattr(epdconfig.JetsonNano, "LIBRARY_DIRS", [str(stub_dir)])
+    backend = epdconfig.JetsonNano()
+    assert backend._transfer_n is None
+    backend.SPI.stub_reset()
+    _send(backend)
+    assert _recorded(backend) == EXPECTED
+
+
+def test_bulk_shim(gpio, libraries, monkeypatch):
+    stub_dir, bulk_dir = libraries
+    monkeypatch.setattr(epdconfig.JetsonNano, "LIBRARY_DIRS", [str(stub_dir), str(bulk_dir)])
+    backend = epdconfig.JetsonNano()
+    assert backend._transfer_n is not None
+    backend.SPI.stub_reset()
+    _send(backend)
+    assert _recorded(backend) == EXPECTED
+
+
+def test_python_fallback(gpio, tmp_path, monkeypatch):
+    monkeypatch.setattr(epdconfig.JetsonNano, "LIBRARY_DIRS", [str(tmp_path)])
+    backend = epdconfig.JetsonNano()
+    assert isinstance(backend.SPI, epdconfig._PythonSoftwareSPI)
+    _send(backend)
+    assert bytes(gpio.received) == EXPECTED
@@ -0,0 +1,71 @@
+"""Steady-state partial refreshes must not grow the heap or copy whole frames."""
+
+import gc
+import tracemalloc
+from datetime import datetime, timedelta
+
+from PIL import Image, ImageDraw
+
+import epd7in5_V2
+import epdconfig
+from modules.frame_log import FrameLog
+from modules.refresh_policy import RefreshPolicy
+
+FRAMES = 200
+WARMUP = 20
+# Caches and segment rotation account for a few KiB; a leaked frame is 48 KB.
+MAX_GROWTH = 16 * 1024
+
+
+def test_partial_refresh_loop_does_not_grow(tmp_path):
+    epd = epd7in5_V2.EPD(epdconfig.Simulated())
+    policy = RefreshPolicy.from_epd(epd)
+    log = FrameLog(epd.width, epd.height, {"directory": str(tmp_path)})
+    image = Image.new("1", (epd.width, epd.height), 255)
+    draw = ImageDraw.Draw(image)
+    buffer = bytearray(epd.frame_bytes)
+    start = datetime(2025, 6, 2)
+    # Largest transient allocation per stage after warm-up.
+    peaks = {"policy": 0, "display": 0}
+
+    def measure(stage, call, *args):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = call(*args)
+        peaks[stage] = max(peaks[stage], tracemalloc.get_traced_memory()[1] - current)
+        return result
+
+    def frame(index):
+        now = start + timedelta(minutes=index)
+        draw.rectangle((10, 10, 200, 40), fill=255)
+        draw.text((10, 10), now.strftime("%H:%M"), fill=0)
+        epd.getbuffer(image, buffer)
+
+        mode = measure("policy", policy.choose, buffer, now)
+        measure("display", epd.display_Partial, buffer, 0, 0, epd.width, epd.height)
+        measure("policy", policy.record, mode, buffer)
+
+        log.append(buffer, now.timestamp())
+
+    tracemalloc.start()
+    try:
+        for index in range(WARMUP):
+            frame(index)
+        peaks.update(dict.fromkeys(peaks, 0))
+        gc.collect()
+        baseline, _ = tracemalloc.get_traced_memory()
+        for index in range(WARMUP, WARMUP + FRAMES):
+            frame(index)
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        measure("display", epd.display, buffer)
+    finally:
+        tracemalloc.stop()
+        log.close()
+
+    assert current - baseline < MAX_GROWTH
+    # Only the band holding the clock is diffed; the last frame is never copied.
+    assert peaks["policy"] < epd.frame_bytes // 2
+    # The driver inverts into its transmit buffer in small chunks.
+    assert peaks["display"] < epd.frame_bytes // 4
+    assert policy.displayed == buffer
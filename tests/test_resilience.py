@@ -0,0 +1,80 @@
+"""Circuit breaker state transitions and backoff."""
+
+import pytest
+
+from modules import resilience
+from modules.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+SETTINGS = {"failure_threshold": 3, "base_delay": 30, "max_delay": 1800, "jitter": 0.2}
+
+
+@pytest.fixture
+def jitter(monkeypatch):
+    """Patch random.uniform; set ``jitter.value`` to the fraction it returns."""
+
+    class Jitter:
+        value = 0.0
+
+    def uniform(low, high):
+        assert (low, high) == (-SETTINGS["jitter"], SETTINGS["jitter"])
+        return Jitter.value
+
+    monkeypatch.setattr(resilience.random, "uniform", uniform)
+    return Jitter
+
+
+def trip(breaker, now):
+    assert breaker.allow(now)
+    breaker.record_failure(now)
+    return breaker.retry_at - now
+
+
+def test_opens_after_threshold(jitter):
+    breaker = CircuitBreaker("api.example", SETTINGS)
+    for _ in range(SETTINGS["failure_threshold"] - 1):
+        breaker.record_failure(now=0)
+        assert breaker.state == CLOSED
+        assert breaker.allow(now=0)
+    breaker.record_failure(now=0)
+    assert breaker.state == OPEN
+    assert breaker.retry_at == 30
+    assert not breaker.allow(now=29.9)
+
+
+def test_half_open_probe_then_close(jitter):
+    breaker = CircuitBreaker("api.example", {**SETTINGS, "failure_threshold": 1})
+    breaker.record_failure(now=0)
+    assert breaker.allow(now=30)
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow(now=30)  # only one probe in flight
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow(now=30)
+
+
+def test_failed_probe_doubles_delay_up_to_cap(jitter):
+    breaker = CircuitBreaker("api.example", {**SETTINGS, "failure_threshold": 1})
+    now, delays = 0.0, []
+    for _ in range(8):
+        delay = trip(breaker, now)
+        assert breaker.state == OPEN
+        delays.append(delay)
+        now += delay
+    assert delays == [30, 60, 120, 240, 480, 960, 1800, 1800]
+
+
+@pytest.mark.parametrize("fraction", [-0.2, 0.2])
+def test_jitter_never_exceeds_max_delay(jitter, fraction):
+    jitter.value = fraction
+    breaker = CircuitBreaker("api.example", {**SETTINGS, "failure_threshold": 1})
+    now, delays = 0.0, []
+    for _ in range(8):
+        delay = trip(breaker, now)
+        delays.append(delay)
+        now += delay
+    assert max(delays) <= SETTINGS["max_delay"]
+    assert delays[0] == pytest.approx(30 * (1 + fraction))
+    # 30 * 2**7 is past the cap whatever the jitter; 1.2 * 30 * 2**6 would be 2304 s.
+    assert delays[-1] == SETTINGS["max_delay"]
+    assert delays[-2] == (SETTINGS["max_delay"] if fraction > 0 else pytest.approx(1536))
@@ -0,0 +1,51 @@
+"""Recurrence rules in ICS schedules expand to the right dates."""
+
+import pathlib
+from datetime import date, timedelta
+
+import pytest
+
+from modules.schedule import load_ics
+
+FIXTURE = pathlib.Path(__file__).resolve().parent / "fixtures" / "recurring.ics"
+
+
+def occurrences(week_start):
+    return sorted(
+        (str(week_start + timedelta(days=entry.weekday)), entry.label) for entry in load_ics(str(FIXTURE), week_start)
+    )
+
+
+def dates_of(label, weeks):
+    start = date(2025, 5, 26)
+    return [
+        day
+        for week in range(weeks)
+        for day, name in occurrences(start + timedelta(weeks=week))
+        if name == label
+    ]
+
+
+def test_weekly_interval_skips_alternate_weeks():
+    assert dates_of("Paper", 5) == ["2025-06-02", "2025-06-05", "2025-06-16", "2025-06-19"]
+
+
+def test_weekly_count_ends_the_series():
+    assert dates_of("Course", 6) == ["2025-06-03", "2025-06-10", "2025-06-17"]
+
+
+def test_daily_interval_with_count_and_exdate():
+    # Six occurrences every third day; the excluded 10 June still counts.
+    assert dates_of("Water", 6) == ["2025-06-01", "2025-06-04", "2025-06-07", "2025-06-13", "2025-06-16"]
+
+
+def test_monthly_and_yearly_repeat():
+    assert dates_of("Rent", 9) == ["2025-06-15", "2025-07-15"]
+    assert dates_of("Report", 10) == ["2025-05-31", "2025-06-30", "2025-07-31"]
+    assert occurrences(date(2025, 6, 2)).count(("2025-06-04", "Jubilee")) == 1
+    assert ("2024-06-04", "Jubilee") not in occurrences(date(2024, 6, 3))
+
+
+def test_unsupported_rule_is_skipped(capsys):
+    assert "Meeting" not in {label for _day, label in occurrences(date(2025, 6, 2))}
+    assert "unsupported RRULE (BYDAY)" in capsys.readouterr().out
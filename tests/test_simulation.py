@@ -0,0 +1,24 @@
+"""The simulation must run without panel hardware, however it is invoked."""
+
+import pathlib
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+@pytest.mark.parametrize("argv", [["--simulate", "0.1"], ["--simulate=0.1"]])
+def test_simulation_runs_without_hardware(monkeypatch, capsys, argv):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.delenv("EPD_BACKEND", raising=False)
+    import epdconfig
+    import paperdash
+
+    paperdash.main(argv + ["--start", "2025-06-02T00:00"])
+
+    output = capsys.readouterr().out
+    assert "[INFO] Simulated 0.1 h" in output
+    assert "default: 7 frames" in output
+    assert "MiB after the first cycle" in output
+    # The default (hardware) backend was never created.
+    assert epdconfig._implementation is None
@@ -0,0 +1,136 @@
+"""Batched Open-Meteo parsing against a local mock server."""
+
+import json
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from modules import resilience, weather
+
+SINGLE = {"current": {"temperature_2m": 21.43, "relative_humidity_2m": 70, "weathercode": 3}}
+MULTI = [
+    {"current": {"temperature_2m": 21.43, "relative_humidity_2m": 70, "weathercode": 3}},
+    {"current": {"temperature_2m": 18.0, "relative_humidity_2m": 91, "weathercode": 63}},
+    {"current": {"temperature_2m": -2.5, "relative_humidity_2m": 55, "weathercode": 71}},
+]
+LOCATIONS = [
+    {"name": "home", "lat": 25.05, "lon": 121.65},
+    {"name": "office", "lat": 25.03, "lon": 121.56},
+    {"name": "cabin", "lat": 24.1, "lon": 121.3},
+]
+
+
+class _MockOpenMeteo(BaseHTTPRequestHandler):
+    status = 200
+    body = None
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append(self.path)
+        payload = json.dumps(self.body).encode("utf-8")
+        self.send_response(self.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _urllib_get_json(url, timeout=None, **kwargs):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.load(response)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    handler = type("Handler", (_MockOpenMeteo,), {"requests": [], "status": 200, "body": None})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setattr(weather, "API_URL", f"http://127.0.0.1:{httpd.server_port}/v1/forecast")
+    monkeypatch.setattr(weather, "_last_known", {})
+    monkeypatch.setattr(resilience, "_BREAKERS", {})
+    resilience.set_transport(_urllib_get_json)
+    # Keep the breaker closed between requests so every test hits the server.
+    resilience.configure({"failure_threshold": 100})
+    yield handler
+    resilience.set_transport(None)
+    resilience.configure(None)
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _query(path):
+    return parse_qs(urlsplit(path).query)
+
+
+def test_single_location_object(server):
+    server.body = SINGLE
+
+    assert weather.get_weather_summary() == ("21.4°C | RH 70%", "cloudy")
+    query = _query(server.requests[0])
+    assert query["latitude"] == [str(weather.LAT)]
+    assert query["longitude"] == [str(weather.LON)]
+
+
+def test_multiple_locations_in_one_request(server):
+    server.body = MULTI
+
+    summaries = weather.get_weather_summaries(LOCATIONS)
+
+    assert len(server.requests) == 1
+    query = _query(server.requests[0])
+    assert query["latitude"] == ["25.05,25.03,24.1"]
+    assert query["longitude"] == ["121.65,121.56,121.3"]
+    assert list(summaries) == ["home", "office", "cabin"]
+    assert summaries["home"] == ("21.4°C | RH 70%", "cloudy")
+    assert summaries["office"] == ("18.0°C | RH 91%", "rain")
+    assert summaries["cabin"] == ("-2.5°C | RH 55%", "snow")
+
+
+def test_coordinate_pairs_get_generated_names(server):
+    server.body = MULTI[:2]
+
+    summaries = weather.get_weather_summaries([(1.0, 2.0), (3.0, 4.0)])
+
+    assert list(summaries) == ["location0", "location1"]
+    assert _query(server.requests[0])["latitude"] == ["1.0,3.0"]
+
+
+def test_incomplete_entry_keeps_last_known(server):
+    server.body = MULTI
+    weather.get_weather_summaries(LOCATIONS)
+
+    server.body = [MULTI[0], {"current": {"temperature_2m": 30.0}}, MULTI[2]]
+    summaries = weather.get_weather_summaries(LOCATIONS)
+
+    assert summaries["office"] == ("18.0°C | RH 91%", "rain")
+
+
+def test_server_error_serves_last_known_and_fallback(server):
+    server.body = MULTI[:2]
+    weather.get_weather_summaries(LOCATIONS[:2])
+
+    server.status, server.body = 500, {"error": True}
+    summaries = weather.get_weather_summaries(LOCATIONS)
+
+    assert summaries["home"] == ("21.4°C | RH 70%", "cloudy")
+    assert summaries["office"] == ("18.0°C | RH 91%", "rain")
+    assert summaries["cabin"] == (weather.FALLBACK_SUMMARY, "unknown")
+
+
+@pytest.mark.parametrize("code", [55, 73, 81, 95])
+def test_unmapped_weather_code_is_still_a_success(server, code):
+    server.body = MULTI[:1]
+    weather.get_weather_summaries(LOCATIONS[:1])
+
+    server.body = [{"current": {"temperature_2m": 12.0, "relative_humidity_2m": 80, "weathercode": code}}]
+    summaries = weather.get_weather_summaries(LOCATIONS[:1])
+
+    assert summaries["home"] == ("12.0°C | RH 80%", "unknown")
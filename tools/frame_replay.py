@@ -0,0 +1,103 @@
+"""Inspect the PaperDash frame history log and reconstruct frames as PNG.
+
+Usage examples
+--------------
+List every frame recorded in the log directory::
+
+    python tools/frame_replay.py cache/frames --list
+
+Export the frame that was on screen at a given time::
+
+    python tools/frame_replay.py cache/frames --at 2025-06-01T08:30 --output frame.png
+
+Export the most recent frame (negative indexes count from the end)::
+
+    python tools/frame_replay.py cache/frames --index -1 --output latest.png
+
+The script requires the Pillow package to be installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+from datetime import datetime
+from typing import List, Tuple
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from modules.frame_log import iter_records, list_segments, read_dimensions, reconstruct  # noqa: E402
+
+# Packed frames use 1 = black; PIL's mode "1" uses 1 = white.
+_INVERT = bytes(255 - value for value in range(256))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay frames from the PaperDash frame log.")
+    parser.add_argument("directory", type=pathlib.Path, help="Frame log directory (frame_log.directory)")
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument("--list", action="store_true", help="List recorded frames")
+    selection.add_argument("--index", type=int, help="Global frame index across all segments")
+    selection.add_argument("--at", type=datetime.fromisoformat, help="Show the frame on screen at this local time")
+    parser.add_argument("--output", type=pathlib.Path, default=pathlib.Path("frame.png"), help="PNG file to write")
+    return parser.parse_args()
+
+
+def collect(directory: pathlib.Path) -> List[Tuple[str, int, bytes, float, int]]:
+    """Return ``(segment, index, kind, timestamp, size)`` for every record."""
+
+    frames = []
+    for segment in list_segments(str(directory)):
+        for index, (kind, timestamp, _offset, length) in enumerate(iter_records(segment)):
+            frames.append((segment, index, kind, timestamp, length))
+    return frames
+
+
+def export_png(segment: str, index: int, output: pathlib.Path) -> float:
+    from PIL import Image
+
+    width, height = read_dimensions(segment)
+    frame, timestamp = reconstruct(segment, index)
+    image = Image.frombytes("1", (width, height), frame.translate(_INVERT))
+    image.save(output, format="PNG")
+    return timestamp
+
+
+def main() -> None:
+    args = parse_args()
+    frames = collect(args.directory)
+    if not frames:
+        raise SystemExit(f"No frames found in {args.directory}")
+
+    if args.list:
+        for number, (segment, _index, kind, timestamp, length) in enumerate(frames):
+            when = datetime.fromtimestamp(timestamp).isoformat(sep=" ", timespec="seconds")
+            print(f"{number:6d}  {when}  {kind.decode()}  {length:7d} B  {pathlib.Path(segment).name}")
+        return
+
+    if args.at is not None:
+        # Timestamps are wall-clock and can go backwards (clock steps, NTP),
+        # so scan for the latest one at or before the requested time; on a tie
+        # the frame logged last wins.
+        at = args.at.timestamp()
+        candidates = [
+            (timestamp, number) for number, (_s, _i, _k, timestamp, _l) in enumerate(frames) if timestamp <= at
+        ]
+        if not candidates:
+            raise SystemExit("No frame was recorded before that time.")
+        number = max(candidates)[1]
+    else:
+        number = args.index
+        if not -len(frames) <= number < len(frames):
+            raise SystemExit(f"Index out of range (log has {len(frames)} frames).")
+
+    segment, index = frames[number][:2]
+    timestamp = export_png(segment, index, args.output)
+    when = datetime.fromtimestamp(timestamp).isoformat(sep=" ", timespec="seconds")
+    print(f"[INFO] Wrote frame from {when} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compare DC-line toggle throughput of the gpiozero and gpiochip GPIO backends.
+
+Usage examples
+--------------
+Toggle the DC line 20,000 times with each backend::
+
+    python tools/gpio_benchmark.py
+
+Use a different GPIO chip (e.g. /dev/gpiochip4 on a Raspberry Pi 5 with older kernels)::
+
+    python tools/gpio_benchmark.py --chip /dev/gpiochip4 --toggles 50000
+
+Each toggle is one ``digital_write`` call, the same path ``send_command`` and
+``send_data`` take for every byte sent to the panel. Run it on the device,
+with PaperDash stopped; the panel content does not change.
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / "epd"))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark GPIO toggle throughput per epdconfig backend.")
+    parser.add_argument("--toggles", type=int, default=20000, help="DC line writes per backend")
+    parser.add_argument("--chip", default="/dev/gpiochip0", help="GPIO character device for the gpiochip backend")
+    args = parser.parse_args()
+    if args.toggles <= 0:
+        parser.error("Toggles must be a positive integer.")
+    return args
+
+
+def measure(backend, toggles: int) -> float:
+    """Return DC line writes per second."""
+
+    write = backend.digital_write
+    pin = backend.DC_PIN
+    started = time.perf_counter()
+    for index in range(toggles):
+        write(pin, index & 1)
+    elapsed = time.perf_counter() - started
+    write(pin, 0)
+    return toggles / elapsed
+
+
+def main() -> None:
+    args = parse_args()
+
+    import epdconfig
+
+    results = []
+    # The auto-detected backend already holds the panel pins; measure it first
+    # and release them before another backend requests the same lines.
+    default = epdconfig.implementation
+    if isinstance(default, epdconfig.RaspberryPi):
+        results.append((type(default).__name__, measure(default, args.toggles)))
+        default.module_exit(cleanup=True)
+
+    candidates = (
+        (epdconfig.RaspberryPi, {"gpio": "gpiozero"}),
+        (epdconfig.RaspberryPiGpiochip, {"gpio": "gpiochip", "gpio_chip": args.chip}),
+    )
+    for backend_class, kwargs in candidates:
+        if type(default) is backend_class:
+            continue
+        try:
+            backend = epdconfig.create(**kwargs)
+        except Exception as exc:
+            print(f"[WARN] {backend_class.__name__} unavailable: {exc}")
+            continue
+        try:
+            results.append((backend_class.__name__, measure(backend, args.toggles)))
+        finally:
+            backend.module_exit(cleanup=True)
+
+    if not results:
+        raise SystemExit("No GPIO backend could be opened.")
+
+    baseline = results[0][1]
+    print(f"{'backend':<22} {'writes/s':>10} {'us/write':>9} {'speedup':>8}")
+    for name, rate in results:
+        print(f"{name:<22} {rate:>10.0f} {1e6 / rate:>9.2f} {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
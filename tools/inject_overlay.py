@@ -0,0 +1,88 @@
+"""Push an image onto a running PaperDash as an overlay, or remove one.
+
+Usage examples
+--------------
+Show an alert in the top-left corner for five minutes, above other overlays::
+
+    python tools/inject_overlay.py alert.png --id alert --at 10 10 --priority 10 --ttl 300
+
+Draw only the black pixels of a badge over the dashboard on the "left" panel::
+
+    python tools/inject_overlay.py badge.png --id badge --panel left --transparent
+
+Send the pixels through shared memory instead of the socket::
+
+    python tools/inject_overlay.py alert.png --id alert --shm
+
+Remove it again::
+
+    python tools/inject_overlay.py --id alert --remove
+
+Requires ``"injection": {}`` in the config. Images are converted to 1-bit and
+positioned in the panel's mounted orientation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+from multiprocessing import shared_memory
+
+from PIL import Image
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from modules.injection import DEFAULT_INJECTION, pack_image, send_overlay  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Inject an overlay into a running PaperDash.")
+    parser.add_argument("image", nargs="?", help="image file to show (omit with --remove)")
+    parser.add_argument("--id", required=True, help="overlay id; sending the same id replaces it")
+    parser.add_argument("--at", nargs=2, type=int, default=(0, 0), metavar=("X", "Y"), help="top-left corner")
+    parser.add_argument("--priority", type=int, default=0, help="higher priorities are drawn on top")
+    parser.add_argument("--ttl", type=float, default=0, help="seconds until the overlay expires (0 = never)")
+    parser.add_argument("--panel", default="", help="panel name (default: every panel)")
+    parser.add_argument("--transparent", action="store_true", help="draw only the black pixels")
+    parser.add_argument("--shm", action="store_true", help="pass the pixels through shared memory")
+    parser.add_argument("--remove", action="store_true", help="remove the overlay instead")
+    parser.add_argument("--socket", default=str(ROOT / DEFAULT_INJECTION["socket"]), help="injection socket path")
+    args = parser.parse_args()
+    if not args.remove and not args.image:
+        parser.error("An image is required unless --remove is given.")
+    for option, value in (("--id", args.id), ("--panel", args.panel)):
+        if len(value.encode("utf-8")) > 16:
+            parser.error(f"{option} must be at most 16 bytes.")
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    options = dict(
+        key=args.id, position=tuple(args.at), priority=args.priority, ttl=args.ttl,
+        panel=args.panel, transparent=args.transparent,
+    )
+    if args.remove:
+        send_overlay(args.socket, remove=True, **options)
+        return
+
+    image = Image.open(args.image).convert("1")
+    if not args.shm:
+        send_overlay(args.socket, image=image, **options)
+        return
+
+    packed = pack_image(image)
+    block = shared_memory.SharedMemory(create=True, size=len(packed))
+    try:
+        block.buf[:len(packed)] = packed
+        # The reply only comes back once the server has unpacked the block.
+        send_overlay(args.socket, shm=block.name, size=image.size, **options)
+    finally:
+        block.close()
+        block.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -14,23 +14,49 @@ Specify only one dimension to preserve the aspect ratio::
 
     python tools/png_to_bmp.py input.png output.bmp --width 800
 
+Convert every PNG in a folder (and a glob) to panel-ready 1-bit icons in
+parallel, skipping sources whose content and options are unchanged::
+
+    python tools/png_to_bmp.py --batch icons/ extra/*.png --out-dir assets/pickup_icons
+
 The script requires the Pillow package to be installed.
 """
 
 from __future__ import annotations
 
 import argparse
+import glob
+import hashlib
+import json
+import os
 import pathlib
-from typing import Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Tuple
 
 from PIL import Image
 
+# Matches ICON_SIZE in paperdash.py so batch output needs no runtime resize.
+ICON_SIZE = (64, 64)
+
+DITHER_MODES = {
+    "floyd-steinberg": Image.FLOYDSTEINBERG,
+    "none": Image.NONE,
+    "threshold": None,
+}
+
+MANIFEST_NAME = ".png_to_bmp.json"
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Convert a PNG image to BMP with optional resizing."
     )
-    parser.add_argument("input", type=pathlib.Path, help="Path to the source PNG file")
+    parser.add_argument(
+        "input",
+        type=pathlib.Path,
+        nargs="?",
+        help="Path to the source PNG file",
+    )
     parser.add_argument(
         "output",
         type=pathlib.Path,
@@ -49,8 +75,62 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Target height in pixels. If only width or height is provided, the other dimension is scaled proportionally.",
     )
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="SOURCE",
+        default=None,
+        help="Convert PNG files from directories or glob patterns to 1-bit BMPs in parallel.",
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=pathlib.Path,
+        default=None,
+        help="Destination folder for batch output (defaults to next to each source).",
+    )
+    parser.add_argument(
+        "--dither",
+        choices=sorted(DITHER_MODES),
+        default="floyd-steinberg",
+        help="Dithering used for 1-bit batch output.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=int,
+        default=128,
+        help="Grey level (0-255) treated as white when --dither threshold is used.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for batch mode (defaults to the CPU count).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reconvert every batch source even if its content hash is unchanged.",
+    )
     args = parser.parse_args()
 
+    if args.width is not None and args.width <= 0:
+        parser.error("Width must be a positive integer.")
+
+    if args.height is not None and args.height <= 0:
+        parser.error("Height must be a positive integer.")
+
+    if args.batch is not None:
+        if args.input is not None:
+            parser.error("Positional input/output cannot be combined with --batch.")
+        if not 0 <= args.threshold <= 255:
+            parser.error("Threshold must be between 0 and 255.")
+        if args.jobs is not None and args.jobs <= 0:
+            parser.error("Jobs must be a positive integer.")
+        return args
+
+    if args.input is None:
+        parser.error("An input PNG file or --batch sources are required.")
+
     if args.output is None:
         args.output = args.input.with_suffix(".bmp")
 
@@ -60,12 +140,6 @@ def parse_args() -> argparse.Namespace:
     if args.output.suffix.lower() != ".bmp":
         parser.error("Output file must have a .bmp extension.")
 
-    if args.width is not None and args.width <= 0:
-        parser.error("Width must be a positive integer.")
-
-    if args.height is not None and args.height <= 0:
-        parser.error("Height must be a positive integer.")
-
     return args
 
 
@@ -105,8 +179,177 @@ def convert_png_to_bmp(
         image.save(output_path, format="BMP")
 
 
+def convert_png_to_1bit_bmp(
+    input_path: pathlib.Path,
+    output_path: pathlib.Path,
+    size: Tuple[int, int],
+    dither: str,
+    threshold: int,
+) -> None:
+    """Write a panel-ready 1-bit BMP so paperdash.py can paste it untouched."""
+
+    with Image.open(input_path) as image:
+        if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+            # Transparent areas become white paper instead of black ink.
+            rgba = image.convert("RGBA")
+            flattened = Image.new("RGBA", rgba.size, (255, 255, 255, 255))
+            flattened.alpha_composite(rgba)
+            image = flattened
+
+        grey = image.convert("L")
+        if grey.size != size:
+            grey = grey.resize(size, Image.LANCZOS)
+
+        if dither == "threshold":
+            mono = grey.point(lambda value: 255 if value >= threshold else 0, "1")
+        else:
+            mono = grey.convert("1", dither=DITHER_MODES[dither])
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        mono.save(tmp_path, format="BMP")
+        os.replace(tmp_path, output_path)
+
+
+def _batch_worker(job: Tuple[str, str, Tuple[int, int], str, int]) -> str:
+    input_path, output_path, size, dither, threshold = job
+    convert_png_to_1bit_bmp(
+        pathlib.Path(input_path), pathlib.Path(output_path), size, dither, threshold
+    )
+    return input_path
+
+
+def expand_sources(sources: Iterable[str]) -> List[pathlib.Path]:
+    """Resolve directories and glob patterns to a sorted, de-duplicated PNG list."""
+
+    found: Dict[str, pathlib.Path] = {}
+    for source in sources:
+        path = pathlib.Path(source)
+        if path.is_dir():
+            candidates = list(path.iterdir())
+        elif glob.has_magic(source):
+            candidates = [pathlib.Path(match) for match in glob.glob(source, recursive=True)]
+        else:
+            candidates = [path]
+
+        for candidate in candidates:
+            if candidate.is_file() and candidate.suffix.lower() == ".png":
+                found[str(candidate.resolve())] = candidate
+
+    return [found[key] for key in sorted(found)]
+
+
+def _content_digest(path: pathlib.Path, options: str) -> str:
+    digest = hashlib.sha256(options.encode("utf-8"))
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_manifest(path: pathlib.Path) -> Dict[str, str]:
+    try:
+        with open(path, "r", encoding="utf-8") as manifest_file:
+            data = json.load(manifest_file)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(path: pathlib.Path, manifest: Dict[str, str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def batch_convert(
+    sources: Iterable[str],
+    out_dir: pathlib.Path | None,
+    size: Tuple[int, int],
+    dither: str,
+    threshold: int,
+    jobs: int | None = None,
+    force: bool = False,
+) -> Tuple[int, int]:
+    """Convert PNG sources in parallel and return (converted, skipped) counts.
+
+    A manifest beside each output records a hash of the source bytes and the
+    conversion options per source path, so unchanged icons are skipped without
+    decoding. Sources that would write the same output file are reported and
+    only the first is converted.
+    """
+
+    options = json.dumps(
+        {"size": list(size), "dither": dither, "threshold": threshold}, sort_keys=True
+    )
+    manifests: Dict[pathlib.Path, Dict[str, str]] = {}
+    pending: List[Tuple[str, str, Tuple[int, int], str, int]] = []
+    digests: Dict[str, Tuple[pathlib.Path, str, str]] = {}
+    outputs: Dict[pathlib.Path, pathlib.Path] = {}
+    skipped = 0
+
+    for input_path in expand_sources(sources):
+        target_dir = out_dir if out_dir is not None else input_path.parent
+        output_path = target_dir / input_path.with_suffix(".bmp").name
+        claimed = outputs.setdefault(output_path.resolve(), input_path)
+        if claimed != input_path:
+            print(f"[WARN] Skipping {input_path}: {claimed} already writes {output_path}")
+            continue
+        manifest_path = target_dir / MANIFEST_NAME
+        manifest = manifests.setdefault(manifest_path, _load_manifest(manifest_path))
+
+        # Keyed by source path (relative to the manifest, so the tree can be
+        # moved), so same-named icons from different folders never share an entry.
+        source_key = os.path.relpath(input_path.resolve(), target_dir.resolve())
+        digest = _content_digest(input_path, options)
+        if not force and output_path.exists() and manifest.get(source_key) == digest:
+            skipped += 1
+            continue
+
+        pending.append((str(input_path), str(output_path), size, dither, threshold))
+        digests[str(input_path)] = (manifest_path, source_key, digest)
+
+    converted = 0
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_batch_worker, job) for job in pending]
+            for future in futures:
+                try:
+                    input_path = future.result()
+                except Exception as exc:
+                    print(f"[WARN] Conversion failed: {exc}")
+                    continue
+                manifest_path, source_key, digest = digests[input_path]
+                manifests[manifest_path][source_key] = digest
+                converted += 1
+
+    for manifest_path, manifest in manifests.items():
+        _save_manifest(manifest_path, manifest)
+
+    return converted, skipped
+
+
 def main() -> None:
     args = parse_args()
+    if args.batch is not None:
+        size = (
+            args.width if args.width is not None else ICON_SIZE[0],
+            args.height if args.height is not None else ICON_SIZE[1],
+        )
+        converted, skipped = batch_convert(
+            args.batch,
+            args.out_dir,
+            size,
+            args.dither,
+            args.threshold,
+            jobs=args.jobs,
+            force=args.force,
+        )
+        print(f"[INFO] Converted {converted} file(s), skipped {skipped} unchanged.")
+        return
+
     convert_png_to_bmp(args.input, args.output, args.width, args.height)
 
 
@@ -0,0 +1,186 @@
+"""Benchmark SPI clock and chunk settings for the e-Paper panel and pick the fastest.
+
+Usage examples
+--------------
+Measure the default speed/chunk grid and print the best setting::
+
+    python tools/spi_autotune.py
+
+Try specific speeds (Hz) and chunk sizes, then store the winner in the config::
+
+    python tools/spi_autotune.py --speeds 4000000 8000000 16000000 --chunks 4096 --write-config
+
+Each setting streams full frames into the controller's image RAM (command
+0x13) without triggering a refresh, so the panel content does not change.
+With ``--verify`` the controller revision (command 0x70) is read back after
+every setting and compared against a low-speed baseline; this needs wiring
+that exposes the panel's data-out line, and is skipped automatically when the
+baseline reads as all 0x00 or 0xFF. ``--write-config`` requires a verified
+run: without readback every setting that does not raise looks "ok", so the
+winner would simply be the highest clock tried.
+
+Run it on the device, with PaperDash stopped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import sys
+import time
+from typing import List, Optional, Tuple
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / "epd"))
+
+DEFAULT_SPEEDS = [2000000, 4000000, 8000000, 10000000, 16000000, 20000000, 32000000]
+CONFIG_PATH = ROOT / "assets" / "config.json"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measure SPI throughput to the e-Paper panel and pick the fastest stable setting."
+    )
+    parser.add_argument("--speeds", type=int, nargs="+", default=DEFAULT_SPEEDS, help="SPI clocks to try in Hz")
+    parser.add_argument(
+        "--chunks",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Transfer chunk sizes in bytes (defaults to the spidev bufsiz and a few smaller values)",
+    )
+    parser.add_argument("--frames", type=int, default=5, help="Full-frame transfers per setting")
+    parser.add_argument("--verify", action="store_true", help="Read back the controller revision after each setting")
+    parser.add_argument("--write-config", action="store_true", help="Store the winning setting under \"spi\" in config.json")
+    args = parser.parse_args()
+
+    if args.frames <= 0:
+        parser.error("Frames must be a positive integer.")
+    if any(speed <= 0 for speed in args.speeds):
+        parser.error("Speeds must be positive.")
+    if args.chunks is not None and any(chunk <= 0 for chunk in args.chunks):
+        parser.error("Chunk sizes must be positive.")
+    if args.write_config and not args.verify:
+        parser.error("--write-config requires --verify; unverified settings are not stored.")
+    return args
+
+
+def read_revision(epd) -> Optional[bytes]:
+    backend = epd.epdconfig
+    if not hasattr(backend, "spi_readbytes"):
+        return None
+    epd.send_command(0x70)
+    backend.digital_write(epd.dc_pin, 1)
+    return bytes(backend.spi_readbytes(3))
+
+
+def measure(epd, frame: bytes, frames: int) -> float:
+    """Return the mean seconds per full-frame transfer."""
+
+    epd.send_command(0x13)
+    epd.send_data2(frame)  # warm-up, also surfaces chunk size errors early
+
+    started = time.perf_counter()
+    for _ in range(frames):
+        epd.send_command(0x13)
+        epd.send_data2(frame)
+    return (time.perf_counter() - started) / frames
+
+
+def autotune(
+    epd, speeds: List[int], chunks: List[int], frames: int, verify: bool
+) -> Tuple[Optional[Tuple[int, int, float]], bool]:
+    """Return the fastest ``(speed, chunk, seconds)`` and whether it was verified."""
+
+    backend = epd.epdconfig
+    frame = bytes(((epd.width + 7) // 8) * epd.height)
+
+    baseline = None
+    if verify:
+        backend.configure_spi(speed_hz=min(speeds))
+        baseline = read_revision(epd)
+        if baseline is None or baseline in (b"\x00" * 3, b"\xff" * 3):
+            print("[INFO] Readback not available on this wiring; skipping verification.")
+            baseline = None
+        else:
+            print(f"[INFO] Baseline revision: {baseline.hex()}")
+
+    best: Optional[Tuple[int, int, float]] = None
+    print(f"{'speed_hz':>10} {'chunk':>7} {'ms/frame':>9} {'kB/s':>8}  status")
+    for speed in sorted(speeds):
+        for chunk in chunks:
+            backend.configure_spi(speed_hz=speed, chunk_size=chunk)
+            try:
+                seconds = measure(epd, frame, frames)
+            except Exception as exc:
+                print(f"{speed:>10} {chunk:>7} {'-':>9} {'-':>8}  failed: {exc}")
+                continue
+
+            status = "ok"
+            if baseline is not None and read_revision(epd) != baseline:
+                status = "readback mismatch"
+
+            rate = len(frame) / seconds / 1024
+            print(f"{speed:>10} {chunk:>7} {seconds * 1000:>9.1f} {rate:>8.0f}  {status}")
+            if status == "ok" and (best is None or seconds < best[2]):
+                best = (speed, chunk, seconds)
+    return best, baseline is not None
+
+
+def write_config(speed: int, chunk: int) -> None:
+    try:
+        with open(CONFIG_PATH, "r", encoding="utf-8") as config_file:
+            config = json.load(config_file)
+    except FileNotFoundError:
+        config = {}
+    except (OSError, ValueError) as exc:
+        # Never replace a config we could not read; the user would lose it.
+        raise SystemExit(f"Not updating {CONFIG_PATH}: {exc}")
+    if not isinstance(config, dict):
+        raise SystemExit(f"Not updating {CONFIG_PATH}: the root is not an object.")
+    config["spi"] = {"speed_hz": speed, "chunk_size": chunk}
+    with open(CONFIG_PATH, "w", encoding="utf-8") as config_file:
+        json.dump(config, config_file, indent=2)
+        config_file.write("\n")
+
+
+def main() -> None:
+    args = parse_args()
+
+    import epdconfig
+    from epd7in5_V2 import EPD
+
+    epd = EPD()
+    backend = epd.epdconfig
+    chunks = args.chunks
+    if chunks is None:
+        bufsiz = epdconfig.spidev_bufsiz()
+        chunks = sorted({bufsiz, min(bufsiz, 2048), min(bufsiz, 1024)}, reverse=True)
+
+    if backend.module_init() != 0:
+        raise SystemExit("Failed to initialise the SPI/GPIO module.")
+    try:
+        # Wake the controller from deep sleep (or whatever state it was left
+        # in) so the RAM writes and the revision readback mean something.
+        epd.reset()
+        best, verified = autotune(epd, args.speeds, chunks, args.frames, args.verify)
+    finally:
+        backend.module_exit()
+
+    if best is None:
+        raise SystemExit("No setting completed successfully.")
+
+    speed, chunk, seconds = best
+    label = "Fastest stable setting" if verified else "Fastest setting (unverified)"
+    print(f"[INFO] {label}: {speed} Hz, chunk {chunk} bytes ({seconds * 1000:.1f} ms/frame)")
+    print(json.dumps({"spi": {"speed_hz": speed, "chunk_size": chunk}}))
+    if args.write_config:
+        if not verified:
+            raise SystemExit("Readback was not available, so the result is unverified; config.json was not changed.")
+        write_config(speed, chunk)
+        print(f"[INFO] Updated {CONFIG_PATH}")
+
+
+if __name__ == "__main__":
+    main()